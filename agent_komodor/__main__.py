@@ -10,10 +10,14 @@ from dotenv import load_dotenv
 
 from agent_komodor.protocol_bindings.a2a_server.agent import KomodorAgent # type: ignore[import-untyped]
 from agent_komodor.protocol_bindings.a2a_server.agent_executor import KomodorAgentExecutor # type: ignore[import-untyped]
+from agent_komodor.protocol_bindings.a2a_server.startup import AgentStartup
+from agent_komodor.metrics import add_metrics_route
+from agent_komodor.sqlite_store import task_store_from_env
+from agent_komodor.tracing import configure_tracing
 
 from a2a.server.apps import A2AStarletteApplication
 from a2a.server.request_handlers import DefaultRequestHandler
-from a2a.server.tasks import InMemoryPushNotifier, InMemoryTaskStore
+from a2a.server.tasks import InMemoryPushNotifier
 from a2a.types import (
     AgentCapabilities,
     AgentCard,
@@ -33,17 +37,22 @@ def main(host: str, port: int):
         print('GOOGLE_API_KEY environment variable not set.')
         sys.exit(1)
 
+    configure_tracing()
     client = httpx.AsyncClient()
+    agent_executor = KomodorAgentExecutor()
+    # Load tools and build the graph once the server is up, reporting readiness at /readyz
+    startup = AgentStartup(agent_executor.agent)
     request_handler = DefaultRequestHandler(
-        agent_executor=KomodorAgentExecutor(),
-        task_store=InMemoryTaskStore(),
+        agent_executor=agent_executor,
+        task_store=task_store_from_env(),
         push_notifier=InMemoryPushNotifier(client),
     )
 
     server = A2AStarletteApplication(
         agent_card=get_agent_card(host, port), http_handler=request_handler
     )
-    app = server.build()
+    app = server.build(routes=startup.routes, lifespan=startup.lifespan)
+    add_metrics_route(app)
 
     # Add CORSMiddleware to allow requests from any origin (disables CORS restrictions)
     app.add_middleware(
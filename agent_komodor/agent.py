@@ -2,20 +2,27 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import asyncio
+import atexit
+import functools
 import importlib.util
 import logging
 import os
+import threading
+import uuid
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 
 from langchain_core.runnables import RunnableConfig
-from langchain_mcp_adapters.client import MultiServerMCPClient
+from langchain_core.tools import BaseTool
+from langchain_mcp_adapters.sessions import StdioConnection
 from langgraph.prebuilt import create_react_agent
 from typing import Literal
-from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph.state import CompiledStateGraph
 from pydantic import BaseModel
 
 
+from agent_komodor.checkpoint import checkpointer_from_env
+from agent_komodor.mcp_pool import MCPSessionPool, load_tool_manifest
 from agent_komodor.state import AgentState, Message, MsgType, OutputState
 from cnoe_agent_utils import LLMFactory
 
@@ -27,20 +34,27 @@ if not spec or not spec.origin:
     raise ImportError("Cannot find agent_komodor.protocol_bindings.mcp_server.mcp_komodor.server module")
 
 server_path = str(Path(spec.origin).resolve())
+tool_manifest_path = Path(server_path).with_name("tool_manifest.json")
 
-async def create_agent(prompt=None, response_format=None):
-  memory = MemorySaver()
+KOMODOR_AGENT_PROMPT = (
+  "You are a helpful assistant that can interact with Komodor. "
+  "You can use the Komodor API to get information about applications, clusters, and projects. "
+  "You can also perform actions like syncing applications or rolling back to previous versions."
+)
 
-  # Find installed path of the komodor_mcp sub-module
-  spec = importlib.util.find_spec("agent_komodor.protocol_bindings.mcp_server.mcp_komodor.server")
-  if not spec or not spec.origin:
-      raise ImportError("Cannot find agent_komodor.protocol_bindings.mcp_server.server module")
+# Warm MCP server sessions shared by every invocation in this process
+_mcp_pool: Optional[MCPSessionPool] = None
+_mcp_pool_lock = threading.Lock()
 
-  server_path = str(Path(spec.origin).resolve())
+# Checkpointer shared by every cached agent so conversation memory outlives a single invocation
+memory = checkpointer_from_env()
 
+# Compiled ReAct agents keyed by (prompt, response_format, tool-set fingerprint)
+_agent_cache: Dict[tuple, CompiledStateGraph] = {}
+_agent_cache_lock = threading.Lock()
 
-  logger.info(f"Launching Komodor LangGraph Agent with MCP server adapter at: {server_path}")
 
+def _komodor_mcp_connection() -> StdioConnection:
   komodor_token = os.getenv("KOMODOR_TOKEN")
   if not komodor_token:
     raise ValueError("KOMODOR_TOKEN must be set as an environment variable.")
@@ -49,36 +63,95 @@ async def create_agent(prompt=None, response_format=None):
   if not komodor_api_url:
     raise ValueError("KOMODOR_API_URL must be set as an environment variable.")
 
-  agent = None
-  async with MultiServerMCPClient(
-    {
-      "komodor": {
-        "command": "uv",
-        "args": ["run", server_path],
-        "env": {
-          "KOMODOR_TOKEN": komodor_token,
-          "KOMODOR_API_URL": komodor_api_url,
-          "KOMODOR_VERIFY_SSL": "false"
-        },
-        "transport": "stdio",
-      }
-    }
-  ) as client:
-    if prompt is None and response_format is None:
-      agent = create_react_agent(
-      LLMFactory().get_llm(),
-      tools=await client.get_tools(),
-      checkpointer=memory
-      )
-    else:
-      agent = create_react_agent(
-      LLMFactory().get_llm(),
-      tools=await client.get_tools(),
-      checkpointer=memory,
-      prompt=prompt,
-      response_format=response_format
+  return {
+    "command": "uv",
+    "args": ["run", server_path],
+    "env": {
+      "KOMODOR_TOKEN": komodor_token,
+      "KOMODOR_API_URL": komodor_api_url,
+      "KOMODOR_VERIFY_SSL": "false"
+    },
+    "transport": "stdio",
+  }
+
+
+def get_mcp_pool() -> MCPSessionPool:
+  """Return the process-wide pool of Komodor MCP server sessions, creating it on first use."""
+  global _mcp_pool
+  with _mcp_pool_lock:
+    if _mcp_pool is None:
+      logger.info(f"Creating Komodor MCP session pool for server at: {server_path}")
+      _mcp_pool = MCPSessionPool(
+        _komodor_mcp_connection(),
+        size=int(os.getenv("KOMODOR_MCP_POOL_SIZE", "1")),
+        health_check_interval=float(os.getenv("KOMODOR_MCP_HEALTH_CHECK_INTERVAL", "10")),
+        health_check_timeout=float(os.getenv("KOMODOR_MCP_HEALTH_CHECK_TIMEOUT", "5")),
+        start_timeout=float(os.getenv("KOMODOR_MCP_START_TIMEOUT", "60")),
+        tools=load_tool_manifest(tool_manifest_path),
       )
-  return agent
+      _mcp_pool.add_tools_changed_listener(invalidate_agent_cache)
+      atexit.register(_mcp_pool.close)
+    return _mcp_pool
+
+
+@functools.lru_cache(maxsize=1)
+def _get_llm():
+  """Return the chat model client, created once per process."""
+  return LLMFactory().get_llm()
+
+
+def _cache_key_part(value: Any) -> Any:
+  try:
+    hash(value)
+    return value
+  except TypeError:
+    return repr(value)
+
+
+def _get_or_create_react_agent(prompt, response_format, tools: List[BaseTool], tools_fingerprint: Optional[str]) -> CompiledStateGraph:
+  key = (_cache_key_part(prompt), _cache_key_part(response_format), tools_fingerprint or tuple(t.name for t in tools))
+  with _agent_cache_lock:
+    agent = _agent_cache.get(key)
+    if agent is None:
+      logger.info(f"Compiling ReAct agent with {len(tools)} tools")
+      kwargs = {}
+      if prompt is not None:
+        kwargs["prompt"] = prompt
+      if response_format is not None:
+        kwargs["response_format"] = response_format
+      agent = create_react_agent(_get_llm(), tools=tools, checkpointer=memory, **kwargs)
+      _agent_cache[key] = agent
+    return agent
+
+
+async def get_react_agent(prompt=None, response_format=None) -> CompiledStateGraph:
+  """
+  Return a compiled ReAct agent over the Komodor MCP tools.
+
+  The model client, tool list and compiled graph are built once and memoized per
+  (prompt, response_format, tool set), so repeated invocations only pay for the
+  LLM round trips. Call ``invalidate_agent_cache`` to rebuild them.
+  """
+  pool = get_mcp_pool()
+  tools = await pool.get_tools()
+  return _get_or_create_react_agent(prompt, response_format, tools, pool.tools_fingerprint)
+
+
+def invalidate_agent_cache() -> None:
+  """
+  Drop memoized agents and the model client.
+
+  Called automatically when a respawned MCP server reports a different tool
+  list; call it explicitly (together with ``MCPSessionPool.invalidate_tools``)
+  to force tools to be listed again.
+  """
+  with _agent_cache_lock:
+    _agent_cache.clear()
+  _get_llm.cache_clear()
+
+
+async def create_agent(prompt=None, response_format=None):
+  return await get_react_agent(prompt, response_format)
 
 class ResponseFormat(BaseModel):
     """Respond to the user in this format."""
@@ -87,54 +160,13 @@ class ResponseFormat(BaseModel):
     message: str
 
 def create_agent_sync(prompt, response_format):
-  # return asyncio.run(create_agent(prompt, response_format))
-  memory = MemorySaver()
-  komodor_token = os.getenv("KOMODOR_TOKEN")
-  if not komodor_token:
-      raise ValueError("KOMODOR_TOKEN must be set as an environment variable.")
-
-  komodor_api_url = os.getenv("KOMODOR_API_URL")
-  if not komodor_api_url:
-      raise ValueError("KOMODOR_API_URL must be set as an environment variable.")
-
-  client = MultiServerMCPClient(
-      {
-          "komodor": {
-              "command": "uv",
-              "args": ["run", server_path],
-              "env": {
-                  "KOMODOR_TOKEN": komodor_token,
-                  "KOMODOR_API_URL": komodor_api_url,
-                  "KOMODOR_VERIFY_SSL": "false"
-              },
-              "transport": "stdio",
-          }
-      }
-  )
-  tools = client.get_tools()
-
-  model = LLMFactory().get_llm()
-  # model = ChatGoogleGenerativeAI(model='gemini-2.0-flash')
-  return create_react_agent(
-    model,
-    tools=tools,
-    checkpointer=memory,
-    prompt=prompt,
-    response_format=(response_format, ResponseFormat),
-  )
+  pool = get_mcp_pool()
+  tools = pool.get_tools_sync()
+  return _get_or_create_react_agent(prompt, (response_format, ResponseFormat), tools, pool.tools_fingerprint)
 
 
 # Setup the Komodor MCP Client and create React Agent
 async def _async_komodor_agent(state: AgentState, config: RunnableConfig) -> Dict[str, Any]:
-    komodor_token = os.getenv("KOMODOR_TOKEN")
-    if not komodor_token:
-      raise ValueError("KOMODOR_TOKEN must be set as an environment variable.")
-
-    komodor_api_url = os.getenv("KOMODOR_API_URL")
-    model = LLMFactory().get_llm()
-
-    if not komodor_api_url:
-      raise ValueError("KOMODOR_API_URL must be set as an environment variable.")
     args = config.get("configurable", {})
     logger.debug(f"enter --- state: {state.model_dump_json()}, config: {args}")
 
@@ -154,39 +186,14 @@ async def _async_komodor_agent(state: AgentState, config: RunnableConfig) -> Dic
         if human_message is not None:
             human_message = human_message.content
 
-    logger.info(f"Launching MCP server at: {server_path}")
-
-    client = MultiServerMCPClient(
-        {
-            "komodor": {
-                "command": "uv",
-                "args": ["run", server_path],
-                "env": {
-                    "KOMODOR_TOKEN": komodor_token,
-                    "KOMODOR_API_URL": komodor_api_url,
-                    "KOMODOR_VERIFY_SSL": "false"
-                },
-                "transport": "stdio",
-            }
-        }
-    )
-    tools = await client.get_tools()
-    memory = MemorySaver()
-    agent = create_react_agent(
-        model,
-        tools,
-        checkpointer=memory,
-        prompt=(
-            "You are a helpful assistant that can interact with Komodor. "
-            "You can use the Komodor API to get information about applications, clusters, and projects. "
-            "You can also perform actions like syncing applications or rolling back to previous versions."
-        )
-    )
+    agent = await get_react_agent(prompt=KOMODOR_AGENT_PROMPT)
     input_message = ''.join([m.content for m in messages])
     logger.info("*"*80)
     logger.info(f"Input message: {input_message}")
     logger.info("*"*80)
-    llm_result = await agent.ainvoke({"messages": input_message})
+    # Reuse the caller's thread for conversation memory, otherwise start a new one
+    thread_id = args.get("thread_id") or str(uuid.uuid4())
+    llm_result = await agent.ainvoke({"messages": input_message}, config={"configurable": {"thread_id": thread_id}})
 
     logger.info("LLM response received")
     logger.debug(f"LLM result: {llm_result}")
@@ -0,0 +1,215 @@
+# Copyright CNOE Contributors (https://cnoe.io)
+# SPDX-License-Identifier: Apache-2.0
+
+"""In-memory conversation checkpointer with bounded size."""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence, Set, Tuple
+
+from langchain_core.messages import ToolMessage
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import ChannelVersions, Checkpoint, CheckpointMetadata, CheckpointTuple
+from langgraph.checkpoint.memory import InMemorySaver
+
+logger = logging.getLogger(__name__)
+
+
+class BoundedMemorySaver(InMemorySaver):
+  """
+  An ``InMemorySaver`` that keeps a long-running process's memory bounded.
+
+  - At most ``max_threads`` conversations are kept; the least recently used
+    one is evicted when a new one starts.
+  - Conversations idle for longer than ``thread_ttl`` seconds are evicted.
+  - Only the newest ``max_checkpoints`` checkpoints of a conversation are kept,
+    together with the channel values and pending writes they reference.
+  - Tool messages longer than ``max_tool_message_chars`` are truncated in every
+    checkpoint but the newest one. The newest checkpoint, which the next turn
+    resumes from, is never altered.
+
+  A value of 0 disables the corresponding limit. An evicted conversation
+  starts over on its next message.
+  """
+
+  def __init__(
+    self,
+    max_threads: int = 1000,
+    thread_ttl: float = 86400,
+    max_checkpoints: int = 10,
+    max_tool_message_chars: int = 2000,
+    trim_channels: Sequence[str] = ("messages",),
+  ):
+    super().__init__()
+    self.max_threads = max_threads
+    self.thread_ttl = thread_ttl
+    self.max_checkpoints = max_checkpoints
+    self.max_tool_message_chars = max_tool_message_chars
+    self.trim_channels = tuple(trim_channels)
+
+    self._lock = threading.RLock()
+    # Thread IDs in least to most recently used order, with their last use time
+    self._last_used: "OrderedDict[str, float]" = OrderedDict()
+    # Blob keys whose messages were already trimmed
+    self._trimmed: Set[Tuple[str, str, str, Any]] = set()
+    self.evicted_threads = 0
+    self.pruned_checkpoints = 0
+    self.trimmed_messages = 0
+
+  def _touch(self, thread_id: str) -> None:
+    self._last_used[thread_id] = time.monotonic()
+    self._last_used.move_to_end(thread_id)
+
+  def _evict(self) -> None:
+    """Evict idle conversations, then the least recently used ones over the cap."""
+    now = time.monotonic()
+    while self._last_used:
+      thread_id, last_used = next(iter(self._last_used.items()))
+      idle = self.thread_ttl and now - last_used > self.thread_ttl
+      over = self.max_threads and len(self._last_used) > self.max_threads
+      if not (idle or over):
+        break
+      logger.debug(f"Evicting conversation {thread_id} ({'idle' if idle else 'over capacity'})")
+      self._delete_thread(thread_id)
+      self.evicted_threads += 1
+
+  def _delete_thread(self, thread_id: str) -> None:
+    super().delete_thread(thread_id)
+    self._last_used.pop(thread_id, None)
+    self._trimmed = {key for key in self._trimmed if key[0] != thread_id}
+
+  def _prune(self, thread_id: str, checkpoint_ns: str) -> None:
+    """Drop the oldest checkpoints of a namespace and whatever only they referenced."""
+    checkpoints = self.storage[thread_id][checkpoint_ns]
+    if not self.max_checkpoints or len(checkpoints) <= self.max_checkpoints:
+      return
+
+    # Checkpoint IDs sort in creation order
+    ordered = sorted(checkpoints)
+    for checkpoint_id in ordered[: -self.max_checkpoints]:
+      del checkpoints[checkpoint_id]
+      self.writes.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+      self.pruned_checkpoints += 1
+
+    referenced = set()
+    for saved in checkpoints.values():
+      for channel, version in self.serde.loads_typed(saved[0])["channel_versions"].items():
+        referenced.add((thread_id, checkpoint_ns, channel, version))
+    for key in [k for k in self.blobs if k[0] == thread_id and k[1] == checkpoint_ns and k not in referenced]:
+      del self.blobs[key]
+      self._trimmed.discard(key)
+
+  def _trim(self, thread_id: str, checkpoint_ns: str, current_versions: ChannelVersions) -> None:
+    """Truncate large tool messages in channel values the newest checkpoint no longer references."""
+    if not self.max_tool_message_chars:
+      return
+    for key in [k for k in self.blobs if k[0] == thread_id and k[1] == checkpoint_ns and k[2] in self.trim_channels]:
+      if key in self._trimmed or current_versions.get(key[2]) == key[3]:
+        continue
+      self._trimmed.add(key)
+      blob = self.blobs[key]
+      if blob[0] == "empty":
+        continue
+      value = self.serde.loads_typed(blob)
+      if not isinstance(value, list):
+        continue
+      trimmed = [self._trim_message(m) for m in value]
+      count = sum(1 for old, new in zip(value, trimmed) if old is not new)
+      if count:
+        self.blobs[key] = self.serde.dumps_typed(trimmed)
+        self.trimmed_messages += count
+
+  def _trim_message(self, message: Any) -> Any:
+    if not isinstance(message, ToolMessage) or not isinstance(message.content, str):
+      return message
+    content = message.content
+    if len(content) <= self.max_tool_message_chars:
+      return message
+    kept = content[: self.max_tool_message_chars]
+    return message.model_copy(update={"content": f"{kept}... [{len(content) - len(kept)} characters trimmed from memory]"})
+
+  def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+    with self._lock:
+      thread_id = config["configurable"]["thread_id"]
+      if thread_id in self._last_used:
+        self._touch(thread_id)
+      return super().get_tuple(config)
+
+  def put(
+    self,
+    config: RunnableConfig,
+    checkpoint: Checkpoint,
+    metadata: CheckpointMetadata,
+    new_versions: ChannelVersions,
+  ) -> RunnableConfig:
+    with self._lock:
+      saved = super().put(config, checkpoint, metadata, new_versions)
+      thread_id = saved["configurable"]["thread_id"]
+      checkpoint_ns = saved["configurable"]["checkpoint_ns"]
+      self._touch(thread_id)
+      self._prune(thread_id, checkpoint_ns)
+      self._trim(thread_id, checkpoint_ns, checkpoint["channel_versions"])
+      self._evict()
+      return saved
+
+  def put_writes(self, config: RunnableConfig, writes: Sequence[Tuple[str, Any]], task_id: str, task_path: str = "") -> None:
+    with self._lock:
+      super().put_writes(config, writes, task_id, task_path)
+
+  def delete_thread(self, thread_id: str) -> None:
+    with self._lock:
+      self._delete_thread(thread_id)
+
+  def stats(self) -> Dict[str, int]:
+    """Return the number of stored conversations, checkpoints and bytes, and eviction counters."""
+    with self._lock:
+      checkpoint_bytes = sum(
+        len(saved[0]) + len(saved[1])
+        for namespaces in self.storage.values()
+        for checkpoints in namespaces.values()
+        for saved in checkpoints.values()
+      )
+      blob_bytes = sum(len(blob[1]) for blob in self.blobs.values())
+      write_bytes = sum(len(w[2][1]) for writes in self.writes.values() for w in writes.values())
+      return {
+        "threads": len(self.storage),
+        "checkpoints": sum(len(c) for namespaces in self.storage.values() for c in namespaces.values()),
+        "blobs": len(self.blobs),
+        "bytes": checkpoint_bytes + blob_bytes + write_bytes,
+        "evicted_threads": self.evicted_threads,
+        "pruned_checkpoints": self.pruned_checkpoints,
+        "trimmed_messages": self.trimmed_messages,
+      }
+
+
+def memory_saver_from_env() -> BoundedMemorySaver:
+  """Create the conversation checkpointer with limits from the ``KOMODOR_AGENT_MEMORY_*`` environment variables."""
+  return BoundedMemorySaver(
+    max_threads=int(os.getenv("KOMODOR_AGENT_MEMORY_MAX_THREADS", "1000")),
+    thread_ttl=float(os.getenv("KOMODOR_AGENT_MEMORY_THREAD_TTL", "86400")),
+    max_checkpoints=int(os.getenv("KOMODOR_AGENT_MEMORY_MAX_CHECKPOINTS", "10")),
+    max_tool_message_chars=int(os.getenv("KOMODOR_AGENT_MEMORY_MAX_TOOL_MESSAGE_CHARS", "2000")),
+  )
+
+
+
+def checkpointer_from_env():
+  """
+  Return the conversation checkpointer selected by ``KOMODOR_AGENT_STORE``.
+
+  "sqlite" shares conversations between processes through the database at
+  ``KOMODOR_AGENT_SQLITE_PATH``; otherwise they are kept in memory with the
+  limits of ``memory_saver_from_env``.
+  """
+  from agent_komodor import sqlite_store
+
+  if sqlite_store.AGENT_STORE == "sqlite":
+    logger.info(f"Storing conversations in {sqlite_store.SQLITE_PATH}")
+    return sqlite_store.SqliteSaver(
+      sqlite_store.SQLITE_PATH,
+      max_checkpoints=int(os.getenv("KOMODOR_AGENT_MEMORY_MAX_CHECKPOINTS", "10")),
+    )
+  return memory_saver_from_env()
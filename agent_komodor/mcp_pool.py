@@ -0,0 +1,389 @@
+# Copyright CNOE Contributors (https://cnoe.io)
+# SPDX-License-Identifier: Apache-2.0
+
+"""Pool of long-lived MCP server sessions shared across agent invocations."""
+
+import asyncio
+import hashlib
+import itertools
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import anyio
+from langchain_core.tools import BaseTool
+from langchain_mcp_adapters.sessions import Connection, create_session
+from langchain_mcp_adapters.tools import convert_mcp_tool_to_langchain_tool
+from mcp import ClientSession
+from mcp.types import (
+  CallToolRequest,
+  CallToolRequestParams,
+  CallToolResult,
+  CancelledNotification,
+  CancelledNotificationParams,
+  ClientNotification,
+  ClientRequest,
+  RequestParams,
+  Tool as MCPTool,
+)
+
+from agent_komodor import tracing
+
+logger = logging.getLogger(__name__)
+
+# Errors raised by a session whose server process has gone away
+_BROKEN_SESSION_ERRORS = (anyio.ClosedResourceError, anyio.BrokenResourceError, anyio.EndOfStream)
+
+
+class MCPSessionUnavailableError(RuntimeError):
+  """Raised when no MCP server session becomes ready in time."""
+
+
+# Seconds to wait for a cancellation notification to be written to the server
+CANCEL_NOTIFICATION_TIMEOUT = 5.0
+
+# Manifest layout understood by load_tool_manifest, see mcp_komodor.registry
+TOOL_MANIFEST_VERSION = 1
+
+
+def load_tool_manifest(path: Path) -> Optional[List[MCPTool]]:
+  """
+  Read the tools an MCP server advertises from its prebuilt tool manifest.
+
+  Returns None if the manifest is missing, unreadable or has an unknown layout.
+  The manifest is only a cache: a pool seeded from it still compares it with the
+  live server's tool list when a session starts.
+  """
+  try:
+    with open(path) as f:
+      manifest = json.load(f)
+  except (OSError, ValueError) as e:
+    logger.info(f"No usable tool manifest at {path}: {e!r}")
+    return None
+  if manifest.get("version") != TOOL_MANIFEST_VERSION:
+    logger.info(f"Ignoring tool manifest {path} with version {manifest.get('version')}")
+    return None
+  return [
+    MCPTool(name=t["name"], description=t["description"], inputSchema=t["inputSchema"])
+    for t in manifest["tools"]
+  ]
+
+
+async def call_tool_with_meta(
+  session: ClientSession, name: str, arguments: Optional[Dict[str, Any]], meta: Optional[Dict[str, Any]] = None
+) -> CallToolResult:
+  """
+  Call a tool, sending ``meta`` (e.g. trace context) in the request's ``_meta`` field.
+
+  If the call is cancelled, the server is sent a cancellation notification so
+  it stops the tool and its in-flight Komodor API requests, instead of
+  finishing work nobody will read.
+  """
+  params = CallToolRequestParams(name=name, arguments=arguments, _meta=RequestParams.Meta(**meta) if meta else None)
+  # send_request takes the next id from this counter; ClientSession doesn't expose it otherwise
+  request_id = session._request_id
+  try:
+    return await session.send_request(ClientRequest(CallToolRequest(method="tools/call", params=params)), CallToolResult)
+  except asyncio.CancelledError:
+    await _notify_cancelled(session, request_id, f"tool call '{name}' cancelled by the client")
+    raise
+
+
+async def _notify_cancelled(session: ClientSession, request_id: int, reason: str) -> None:
+  notification = CancelledNotification(
+    method="notifications/cancelled", params=CancelledNotificationParams(requestId=request_id, reason=reason)
+  )
+  try:
+    await asyncio.wait_for(session.send_notification(ClientNotification(notification)), CANCEL_NOTIFICATION_TIMEOUT)
+  except Exception as e:
+    # The session may be closing or gone; the server then stops the call with it
+    logger.debug(f"Could not send cancellation for MCP request {request_id}: {e!r}")
+
+
+def _tools_fingerprint(tools: List[MCPTool]) -> str:
+  return hashlib.sha256(
+    json.dumps(
+      sorted([t.name, t.description, t.inputSchema] for t in tools),
+      sort_keys=True,
+      default=str,
+    ).encode()
+  ).hexdigest()
+
+
+class _PoolWorker:
+  """Keeps one MCP server process and session alive, respawning it when it dies."""
+
+  def __init__(self, pool: "MCPSessionPool", index: int):
+    self.pool = pool
+    self.index = index
+    self.session: Optional[ClientSession] = None
+    self.ready = asyncio.Event()
+    self.stopped = asyncio.Event()
+    self.spawns = 0
+    self.health_check_failures = 0
+    self._restart = asyncio.Event()
+    self.task = asyncio.create_task(self._run(), name=f"mcp-pool-worker-{index}")
+
+  def restart(self) -> None:
+    """Ask the worker to tear down its session and spawn a fresh server."""
+    self._restart.set()
+
+  async def _run(self) -> None:
+    while True:
+      try:
+        async with create_session(self.pool.connection) as session:
+          await session.initialize()
+          self.spawns += 1
+          await self.pool._record_tools(await session.list_tools())
+          self.session = session
+          self.stopped.clear()
+          self.ready.set()
+          logger.info(f"MCP session {self.index} ready (spawn #{self.spawns})")
+          await self._monitor(session)
+      except asyncio.CancelledError:
+        raise
+      except Exception as e:
+        logger.warning(f"MCP session {self.index} failed: {e!r}")
+      finally:
+        self.session = None
+        self.ready.clear()
+        self.stopped.set()
+        self._restart.clear()
+
+      logger.info(f"Respawning MCP session {self.index} in {self.pool.restart_delay}s")
+      await asyncio.sleep(self.pool.restart_delay)
+
+  async def _monitor(self, session: ClientSession) -> None:
+    """Ping the server periodically and return when it is unhealthy or a restart is requested."""
+    while True:
+      try:
+        await asyncio.wait_for(self._restart.wait(), timeout=self.pool.health_check_interval)
+        logger.info(f"Restart requested for MCP session {self.index}")
+        return
+      except asyncio.TimeoutError:
+        pass
+
+      try:
+        await asyncio.wait_for(session.send_ping(), timeout=self.pool.health_check_timeout)
+      except Exception as e:
+        self.health_check_failures += 1
+        logger.warning(f"Health check failed for MCP session {self.index}: {e!r}")
+        return
+
+
+class _PooledSession:
+  """Duck-typed stand-in for ClientSession that routes tool calls through the pool."""
+
+  def __init__(self, pool: "MCPSessionPool"):
+    self._pool = pool
+
+  async def call_tool(self, name: str, arguments: Optional[Dict[str, Any]] = None) -> CallToolResult:
+    with tracing.tool_call_span(name) as meta:
+      return await self._pool.call_tool(name, arguments, meta)
+
+
+class MCPSessionPool:
+  """
+  A fixed-size pool of warm MCP server sessions.
+
+  Each session is owned by a worker task that spawns the server, keeps the
+  session initialized, pings it every ``health_check_interval`` seconds and
+  respawns it if it crashes or stops answering. The pool runs on its own event
+  loop thread so it outlives the short-lived loops that agent invocations are
+  run on, and its public coroutines can be awaited from any event loop.
+
+  Tools returned by ``get_tools`` are bound to the pool rather than to a single
+  session, so they keep working across respawns. Passing ``tools`` (for example
+  from ``load_tool_manifest``) lets ``get_tools`` answer before any server has
+  started; if a live server reports a different list, it replaces the seeded one
+  and tools-changed listeners are notified.
+  """
+
+  def __init__(
+    self,
+    connection: Connection,
+    size: int = 1,
+    health_check_interval: float = 10.0,
+    health_check_timeout: float = 5.0,
+    start_timeout: float = 60.0,
+    restart_delay: float = 1.0,
+    tools: Optional[List[MCPTool]] = None,
+  ):
+    self.connection = connection
+    self.size = max(1, size)
+    self.health_check_interval = health_check_interval
+    self.health_check_timeout = health_check_timeout
+    self.start_timeout = start_timeout
+    self.restart_delay = restart_delay
+
+    self._loop: Optional[asyncio.AbstractEventLoop] = None
+    self._lock = threading.Lock()
+    self._workers: List[_PoolWorker] = []
+    self._round_robin = itertools.count()
+    self._listed_tools: Optional[List[MCPTool]] = tools
+    self._tools: Optional[List[BaseTool]] = None
+    self._tools_changed_listeners: List[Callable[[], None]] = []
+    self.tools_fingerprint: Optional[str] = _tools_fingerprint(tools) if tools is not None else None
+
+  def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+    with self._lock:
+      if self._loop is None:
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._loop.run_forever, name="mcp-session-pool", daemon=True).start()
+      return self._loop
+
+  async def _on_pool_loop(self, coro_fn, *args):
+    """Run ``coro_fn(*args)`` on the pool's event loop and await its result from the caller's loop."""
+    loop = self._ensure_loop()
+    if asyncio.get_running_loop() is loop:
+      return await coro_fn(*args)
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro_fn(*args), loop))
+
+  def _start_workers(self) -> None:
+    if not self._workers:
+      logger.info(f"Starting MCP session pool with {self.size} session(s)")
+      self._workers = [_PoolWorker(self, i) for i in range(self.size)]
+
+  async def _acquire(self) -> _PoolWorker:
+    """Return the next ready worker in round-robin order, waiting for one to become ready."""
+    self._start_workers()
+    for _ in range(self.size):
+      worker = self._workers[next(self._round_robin) % self.size]
+      if worker.ready.is_set():
+        return worker
+
+    waiters = [asyncio.ensure_future(w.ready.wait()) for w in self._workers]
+    try:
+      done, _ = await asyncio.wait(waiters, timeout=self.start_timeout, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+      for waiter in waiters:
+        waiter.cancel()
+    if not done:
+      raise MCPSessionUnavailableError(f"No MCP session became ready within {self.start_timeout}s")
+    return next(w for w in self._workers if w.ready.is_set())
+
+  async def _call_tool(self, name: str, arguments: Optional[Dict[str, Any]], meta: Optional[Dict[str, Any]]) -> CallToolResult:
+    for attempt in range(2):
+      worker = await self._acquire()
+      session = worker.session
+      call = asyncio.ensure_future(call_tool_with_meta(session, name, arguments, meta))
+      stopped = asyncio.ensure_future(worker.stopped.wait())
+      try:
+        await asyncio.wait({call, stopped}, return_when=asyncio.FIRST_COMPLETED)
+      except asyncio.CancelledError:
+        # The call tells the server to stop the tool as it is cancelled
+        call.cancel()
+        raise
+      finally:
+        stopped.cancel()
+
+      if not call.done():
+        # The server died while the call was in flight; it may have run, so don't retry
+        call.cancel()
+        raise MCPSessionUnavailableError(f"MCP session {worker.index} stopped while calling tool '{name}'")
+
+      try:
+        return call.result()
+      except _BROKEN_SESSION_ERRORS as e:
+        # The request never reached the server, so it is safe to retry on a fresh session
+        logger.warning(f"MCP session {worker.index} is broken ({e!r}), restarting it")
+        worker.restart()
+        if attempt:
+          raise MCPSessionUnavailableError(f"MCP session unavailable while calling tool '{name}'") from e
+        await worker.stopped.wait()
+
+  async def call_tool(
+    self, name: str, arguments: Optional[Dict[str, Any]] = None, meta: Optional[Dict[str, Any]] = None
+  ) -> CallToolResult:
+    """Call a tool on one of the pooled sessions, sending ``meta`` in the request's ``_meta`` field."""
+    return await self._on_pool_loop(self._call_tool, name, arguments, meta)
+
+  async def _record_tools(self, listed) -> None:
+    """Remember the tools a freshly spawned server reports and detect changes to the tool set."""
+    fingerprint = _tools_fingerprint(listed.tools)
+    if fingerprint == self.tools_fingerprint:
+      return
+
+    changed = self.tools_fingerprint is not None
+    self._listed_tools = listed.tools
+    self._tools = None
+    self.tools_fingerprint = fingerprint
+    if changed:
+      logger.info("MCP server tool list changed, invalidating cached tools")
+      for listener in list(self._tools_changed_listeners):
+        listener()
+
+  def add_tools_changed_listener(self, listener: Callable[[], None]) -> None:
+    """Register a callback invoked when a respawned server reports a different tool list."""
+    self._tools_changed_listeners.append(listener)
+
+  async def _get_tools(self) -> List[BaseTool]:
+    # Warm the sessions even when the tool list is already known from a manifest
+    self._start_workers()
+    if self._listed_tools is None:
+      worker = await self._acquire()
+      if self._listed_tools is None:
+        await self._record_tools(await worker.session.list_tools())
+    if self._tools is None:
+      proxy = _PooledSession(self)
+      self._tools = [convert_mcp_tool_to_langchain_tool(proxy, tool) for tool in self._listed_tools]
+      logger.info(f"Loaded {len(self._tools)} tools from MCP session pool")
+    return self._tools
+
+  async def _invalidate_tools(self) -> None:
+    self._listed_tools = None
+    self._tools = None
+    self.tools_fingerprint = None
+
+  async def invalidate_tools(self) -> None:
+    """Forget the cached tool list so the next ``get_tools`` lists it again."""
+    if self._loop is not None:
+      await self._on_pool_loop(self._invalidate_tools)
+
+  async def get_tools(self) -> List[BaseTool]:
+    """Return LangChain tools for the server's tools, listing them once per pool."""
+    return await self._on_pool_loop(self._get_tools)
+
+  def get_tools_sync(self) -> List[BaseTool]:
+    """Blocking variant of ``get_tools`` for synchronous callers."""
+    return asyncio.run_coroutine_threadsafe(self._get_tools(), self._ensure_loop()).result()
+
+  async def _aclose(self) -> None:
+    workers, self._workers = self._workers, []
+    for worker in workers:
+      worker.task.cancel()
+    await asyncio.gather(*(w.task for w in workers), return_exceptions=True)
+    self._listed_tools = None
+    self._tools = None
+    self.tools_fingerprint = None
+
+  def _stop_loop(self) -> None:
+    with self._lock:
+      loop, self._loop = self._loop, None
+    if loop is not None:
+      loop.call_soon_threadsafe(loop.stop)
+
+  async def aclose(self) -> None:
+    """Stop every worker, terminate the server processes and stop the pool's event loop."""
+    if self._loop is not None:
+      await self._on_pool_loop(self._aclose)
+      self._stop_loop()
+
+  def close(self) -> None:
+    """Blocking variant of ``aclose``, safe to call from atexit handlers."""
+    if self._loop is not None and self._loop.is_running():
+      asyncio.run_coroutine_threadsafe(self._aclose(), self._loop).result(timeout=10)
+      self._stop_loop()
+
+  def stats(self) -> Dict[str, Any]:
+    """Return the number of ready sessions and per-session spawn and health check counters."""
+    return {
+      "size": self.size,
+      "ready": sum(w.ready.is_set() for w in self._workers),
+      "sessions": [
+        {"index": w.index, "ready": w.ready.is_set(), "spawns": w.spawns, "health_check_failures": w.health_check_failures}
+        for w in self._workers
+      ],
+    }
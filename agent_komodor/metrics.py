@@ -0,0 +1,136 @@
+# Copyright CNOE Contributors (https://cnoe.io)
+# SPDX-License-Identifier: Apache-2.0
+
+"""Prometheus metrics for the agent's tool calls and task admission, served by the A2A app."""
+
+import logging
+import os
+import time
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import AsyncCallbackHandler
+
+logger = logging.getLogger(__name__)
+
+try:
+  import prometheus_client
+except ImportError:
+  prometheus_client = None
+
+METRICS_ENABLED = prometheus_client is not None and os.getenv("AGENT_METRICS_ENABLED", "true").lower() == "true"
+
+# Same estimate as the MCP server's projection layer
+CHARS_PER_TOKEN = 4
+
+if METRICS_ENABLED:
+  TOOL_DURATION = prometheus_client.Histogram(
+    "komodor_agent_tool_duration_seconds",
+    "Duration of tool calls made by the agent, including the MCP round trip",
+    ["tool", "status"],
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120),
+  )
+  TOOL_RESULT_TOKENS = prometheus_client.Histogram(
+    "komodor_agent_tool_result_tokens",
+    "Estimated tokens of tool results added to the model's context",
+    ["tool", "status"],
+    buckets=tuple(2**n for n in range(6, 19, 2)),
+  )
+  RUNNING_TASKS = prometheus_client.Gauge("komodor_agent_running_tasks", "A2A tasks being executed")
+  QUEUED_TASKS = prometheus_client.Gauge("komodor_agent_queued_tasks", "A2A tasks waiting for an execution slot")
+  QUEUE_WAIT = prometheus_client.Histogram(
+    "komodor_agent_queue_wait_seconds",
+    "Time A2A tasks waited for an execution slot",
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300),
+  )
+  REJECTED_TASKS = prometheus_client.Counter("komodor_agent_rejected_tasks", "A2A tasks not admitted", ["reason"])
+
+# Conversation memory gauges by stat, created by the first register_memory_stats call
+_MEMORY_GAUGES: Dict[str, Any] = {}
+
+
+class ToolMetricsCallback(AsyncCallbackHandler):
+  """Record the duration and result size of every tool call in a graph run."""
+
+  def __init__(self):
+    self._started: Dict[UUID, tuple[str, float]] = {}
+
+  async def on_tool_start(self, serialized: Dict[str, Any], input_str: str, *, run_id: UUID, **kwargs: Any) -> None:
+    self._started[run_id] = ((serialized or {}).get("name") or kwargs.get("name") or "unknown", time.monotonic())
+
+  async def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any) -> None:
+    content = getattr(output, "content", output)
+    status = "error" if getattr(output, "status", None) == "error" else "success"
+    self._observe(run_id, status, content)
+
+  async def on_tool_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+    self._observe(run_id, "exception", None)
+
+  def _observe(self, run_id: UUID, status: str, content: Optional[Any]) -> None:
+    started = self._started.pop(run_id, None)
+    if started is None or not METRICS_ENABLED:
+      return
+    tool, start = started
+    TOOL_DURATION.labels(tool, status).observe(time.monotonic() - start)
+    if content is not None:
+      TOOL_RESULT_TOKENS.labels(tool, status).observe(len(str(content)) / CHARS_PER_TOKEN)
+
+
+def register_memory_stats(saver) -> None:
+  """
+  Export the size of a conversation checkpointer as gauges, read when metrics are scraped.
+
+  The gauges are created once; registering another saver, e.g. when the agent
+  module is imported under a second name, points them at that saver.
+  """
+  if not METRICS_ENABLED:
+    return
+  for stat in ("threads", "checkpoints", "bytes"):
+    gauge = _MEMORY_GAUGES.get(stat)
+    if gauge is None:
+      gauge = prometheus_client.Gauge(f"komodor_agent_memory_{stat}", f"Conversation memory: stored {stat}")
+      _MEMORY_GAUGES[stat] = gauge
+    gauge.set_function(lambda stat=stat: saver.stats()[stat])
+
+
+def set_task_counts(running: int, queued: int) -> None:
+  """Record the number of running and waiting A2A tasks."""
+  if METRICS_ENABLED:
+    RUNNING_TASKS.set(running)
+    QUEUED_TASKS.set(queued)
+
+
+def observe_queue_wait(seconds: float) -> None:
+  """Record how long a task waited for an execution slot."""
+  if METRICS_ENABLED:
+    QUEUE_WAIT.observe(seconds)
+
+
+def count_rejected_task(reason: str) -> None:
+  """Count a task that was not admitted, e.g. because the queue was full."""
+  if METRICS_ENABLED:
+    REJECTED_TASKS.labels(reason).inc()
+
+
+def metrics_callbacks() -> list:
+  """Return the callbacks to pass in a graph run's config, or none if metrics are disabled."""
+  return [ToolMetricsCallback()] if METRICS_ENABLED else []
+
+
+def add_metrics_route(app) -> None:
+  """
+  Serve the metrics at /metrics on a Starlette app.
+
+  Does nothing if prometheus_client is not installed or AGENT_METRICS_ENABLED is false.
+  """
+  if not METRICS_ENABLED:
+    if prometheus_client is None:
+      logger.info("prometheus_client is not installed, /metrics is disabled")
+    return
+
+  from starlette.responses import Response
+
+  async def metrics(request) -> Response:
+    return Response(prometheus_client.generate_latest(), media_type=prometheus_client.CONTENT_TYPE_LATEST)
+
+  app.add_route("/metrics", metrics, methods=["GET"], include_in_schema=False)
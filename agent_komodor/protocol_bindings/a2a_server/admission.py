@@ -0,0 +1,174 @@
+# Copyright 2025 CNOE
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import contextlib
+import logging
+import os
+import time
+from collections import Counter, OrderedDict, deque
+from typing import AsyncIterator, Awaitable, Callable, Deque, Dict, Optional
+
+from agent_komodor import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionError(Exception):
+    """Raised when a task is not admitted: the queue is full or the wait timed out."""
+
+    def __init__(self, reason: str, message: str):
+        super().__init__(message)
+        self.reason = reason
+
+
+class AdmissionController:
+    """Bounds how many tasks run at once and queues the rest fairly.
+
+    At most ``max_concurrent`` tasks run at a time, and at most
+    ``max_per_context`` of them for one A2A context (client conversation).
+    Tasks over either limit wait in a per-context FIFO queue. Free slots go to
+    the waiting contexts in round-robin order, so one busy client can't starve
+    the others. A task is rejected when ``max_queued`` tasks are already
+    waiting, and fails if it waits longer than ``queue_timeout`` seconds.
+    A limit of 0 disables it.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 8,
+        max_per_context: int = 1,
+        max_queued: int = 100,
+        queue_timeout: float = 300,
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_per_context = max_per_context
+        self.max_queued = max_queued
+        self.queue_timeout = queue_timeout
+
+        self.running = 0
+        self.queued = 0
+        self._running_by_context: Counter = Counter()
+        # Contexts with waiting tasks, in the order they get the next free slot
+        self._queues: 'OrderedDict[str, Deque[asyncio.Future]]' = OrderedDict()
+        self.admitted = 0
+        self.rejected: Counter = Counter()
+
+    def _can_start(self, context_id: str) -> bool:
+        return (not self.max_concurrent or self.running < self.max_concurrent) and (
+            not self.max_per_context or self._running_by_context[context_id] < self.max_per_context
+        )
+
+    def _start(self, context_id: str) -> None:
+        self.running += 1
+        self._running_by_context[context_id] += 1
+        self.admitted += 1
+
+    def _release(self, context_id: str) -> None:
+        self.running -= 1
+        self._running_by_context[context_id] -= 1
+        if not self._running_by_context[context_id]:
+            del self._running_by_context[context_id]
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Start waiting tasks while there are free slots, one context at a time."""
+        while self._queues:
+            context_id = next((c for c in self._queues if self._can_start(c)), None)
+            if context_id is None:
+                break
+            queue = self._queues[context_id]
+            waiter = queue.popleft()
+            self.queued -= 1
+            if queue:
+                self._queues.move_to_end(context_id)
+            else:
+                del self._queues[context_id]
+            self._start(context_id)
+            waiter.set_result(None)
+        self._report()
+
+    def _remove(self, context_id: str, waiter: asyncio.Future) -> None:
+        queue = self._queues.get(context_id)
+        if queue is not None and waiter in queue:
+            queue.remove(waiter)
+            self.queued -= 1
+            if not queue:
+                del self._queues[context_id]
+
+    def _reject(self, reason: str, message: str) -> AdmissionError:
+        self.rejected[reason] += 1
+        metrics.count_rejected_task(reason)
+        logger.warning('Task rejected: %s', message)
+        return AdmissionError(reason, message)
+
+    def _report(self) -> None:
+        metrics.set_task_counts(running=self.running, queued=self.queued)
+
+    @contextlib.asynccontextmanager
+    async def slot(
+        self,
+        context_id: str,
+        on_queued: Optional[Callable[[int], Awaitable[None]]] = None,
+    ) -> AsyncIterator[None]:
+        """Hold a slot for the duration of the block, waiting in the queue if necessary.
+
+        Args:
+            context_id: A2A context the task belongs to
+            on_queued: Awaited with the number of waiting tasks if this one has to wait
+
+        Raises:
+            AdmissionError: If the queue is full or the wait times out
+        """
+        # Go straight in only if nobody is waiting, so queued tasks keep their turn
+        if not self._queues and self._can_start(context_id):
+            self._start(context_id)
+            self._report()
+        else:
+            if self.max_queued and self.queued >= self.max_queued:
+                raise self._reject('queue_full', f'{self.queued} tasks are already waiting')
+            waiter = asyncio.get_running_loop().create_future()
+            self._queues.setdefault(context_id, deque()).append(waiter)
+            self.queued += 1
+            self._dispatch()
+            start = time.monotonic()
+            try:
+                if not waiter.done() and on_queued is not None:
+                    await on_queued(self.queued)
+                await asyncio.wait_for(waiter, self.queue_timeout or None)
+            except BaseException as e:
+                if waiter.done() and not waiter.cancelled():
+                    # Admitted as the wait ended; hand the slot to the next task
+                    self._release(context_id)
+                else:
+                    self._remove(context_id, waiter)
+                    self._report()
+                if isinstance(e, asyncio.TimeoutError):
+                    raise self._reject('queue_timeout', f'no capacity within {self.queue_timeout}s') from None
+                raise
+            finally:
+                metrics.observe_queue_wait(time.monotonic() - start)
+
+        try:
+            yield
+        finally:
+            self._release(context_id)
+
+    def stats(self) -> Dict[str, int]:
+        """Return the number of running and waiting tasks, and admission counters."""
+        return {
+            'running': self.running,
+            'queued': self.queued,
+            'admitted': self.admitted,
+            **{f'rejected_{reason}': count for reason, count in self.rejected.items()},
+        }
+
+
+def admission_controller_from_env() -> AdmissionController:
+    """Create an admission controller with limits from the ``KOMODOR_AGENT_*`` environment variables."""
+    return AdmissionController(
+        max_concurrent=int(os.getenv('KOMODOR_AGENT_MAX_CONCURRENT_TASKS', '8')),
+        max_per_context=int(os.getenv('KOMODOR_AGENT_MAX_TASKS_PER_CONTEXT', '1')),
+        max_queued=int(os.getenv('KOMODOR_AGENT_MAX_QUEUED_TASKS', '100')),
+        queue_timeout=float(os.getenv('KOMODOR_AGENT_QUEUE_TIMEOUT', '300')),
+    )
@@ -4,11 +4,9 @@
 import logging
 
 from collections.abc import AsyncIterable
-from typing import Any, Literal, Dict
+from typing import Any, Literal
 
-from langchain_mcp_adapters.client import MultiServerMCPClient
-
-from langchain_core.messages import AIMessage, ToolMessage, HumanMessage
+from langchain_core.messages import AIMessage, AIMessageChunk, ToolMessage
 from langchain_core.runnables.config import (
     RunnableConfig,
 )
@@ -16,19 +14,17 @@ from langchain_core.runnables.config import (
 from cnoe_agent_utils import LLMFactory
 from pydantic import BaseModel
 
-from langgraph.checkpoint.memory import MemorySaver
 from langgraph.prebuilt import create_react_agent  # type: ignore
 
 
 import asyncio
 import os
+import time
 
-from agent_komodor.protocol_bindings.a2a_server.state import (
-    AgentState,
-    InputState,
-    Message,
-    MsgType,
-)
+from agent_komodor import tracing
+from agent_komodor.agent import get_mcp_pool
+from agent_komodor.checkpoint import checkpointer_from_env
+from agent_komodor.metrics import metrics_callbacks, register_memory_stats
 
 logger = logging.getLogger(__name__)
 
@@ -40,7 +36,53 @@ def debug_print(message: str, banner: bool = True):
         if banner:
             print("=" * 80)
 
-memory = MemorySaver()
+# Conversation memory keyed by A2A contextId, bounded so long-running servers don't grow without limit
+memory = checkpointer_from_env()
+register_memory_stats(memory)
+
+# Stream the model's answer token by token as it is generated, not only once it is complete
+STREAM_TOKENS = os.getenv('KOMODOR_AGENT_STREAM_TOKENS', 'true').lower() == 'true'
+# Seconds to collect tokens for before sending them, so every token isn't a separate A2A event
+STREAM_FLUSH_INTERVAL = 0.1
+
+class _AnswerChunks:
+    """
+    Collects the model's answer tokens into chunks.
+
+    The first chunk of each model message starts the answer over, since text a
+    model writes before calling a tool is not the final answer. Tokens are sent
+    at most every STREAM_FLUSH_INTERVAL seconds, and the first one of each
+    message right away.
+    """
+
+    def __init__(self):
+      self.message_id: str | None = None
+      self.pending = ''
+      self.append = False
+      self.last_flush = float('-inf')
+
+    def add(self, message_id: str | None, text: str) -> list[dict[str, Any]]:
+      events = []
+      if message_id != self.message_id:
+        events += self.flush()
+        self.message_id, self.append, self.last_flush = message_id, False, float('-inf')
+      self.pending += text
+      if time.monotonic() - self.last_flush >= STREAM_FLUSH_INTERVAL:
+        events += self.flush()
+      return events
+
+    def flush(self) -> list[dict[str, Any]]:
+      if not self.pending:
+        return []
+      event = {
+        'is_task_complete': False,
+        'require_user_input': False,
+        'is_answer_chunk': True,
+        'append': self.append,
+        'content': self.pending,
+      }
+      self.pending, self.append, self.last_flush = '', True, time.monotonic()
+      return [event]
 
 class ResponseFormat(BaseModel):
     """Respond to the user in this format."""
@@ -102,128 +144,116 @@ with Kubernetes operations. Do not attempt to answer unrelated questions or use
     )
 
     def __init__(self):
-      # Setup the komodor agent and load MCP tools
+      # Only create the model client here; tools are loaded and the graph built by startup()
       self.model = LLMFactory().get_llm()
       self.graph = None
-      async def _async_komodor_agent(state: AgentState, config: RunnableConfig) -> Dict[str, Any]:
-          args = config.get("configurable", {})
-
-          server_path = args.get("server_path", "./agent_komodor/protocol_bindings/mcp_server/mcp_komodor/server.py")
-          print(f"Launching MCP server at: {server_path}")
-
-          komodor_token = os.getenv("KOMODOR_TOKEN")
-          if not komodor_token:
-            raise ValueError("KOMODOR_TOKEN must be set as an environment variable.")
-
-          komodor_api_url = os.getenv("KOMODOR_API_URL")
-          if not komodor_api_url:
-            raise ValueError("KOMODOR_API_URL must be set as an environment variable.")
-          client = MultiServerMCPClient(
-              {
-                  "komodor": {
-                      "command": "uv",
-                      "args": ["run", "--project", os.path.dirname(server_path), server_path],
-                      "env": {
-                          "KOMODOR_TOKEN": os.getenv("KOMODOR_TOKEN"),
-                          "KOMODOR_API_URL": os.getenv("KOMODOR_API_URL"),
-                          "KOMODOR_VERIFY_SSL": "false"
-                      },
-                      "transport": "stdio",
-                  }
-              }
-          )
-          tools = await client.get_tools()
-          print('*'*80)
-          tools_docs = ["Available Tools and Parameters:"]
-          for tool in tools:
-            tools_docs.append(f"Tool: {tool.name}")
-            tools_docs.append(f"  Description: {tool.description}")
-            tools_docs.append("")
-          tools_docs = "\n".join(tools_docs)
-          print(tools_docs)
-          print('*'*80)
-          self.graph = create_react_agent(
-            self.model,
-            tools,
-            checkpointer=memory,
-            prompt=self.SYSTEM_INSTRUCTION,
-            response_format=(self.RESPONSE_FORMAT_INSTRUCTION, ResponseFormat),
-          )
-
-
-          # Provide a 'configurable' key such as 'thread_id' for the checkpointer
-          runnable_config = RunnableConfig(configurable={"thread_id": "test-thread"})
-          llm_result = await self.graph.ainvoke({"messages": HumanMessage(content="Summarize what you can do?")}, config=runnable_config)
-
-          # Try to extract meaningful content from the LLM result
-          ai_content = None
-
-          # Look through messages for final assistant content
-          for msg in reversed(llm_result.get("messages", [])):
-              if hasattr(msg, "type") and msg.type in ("ai", "assistant") and getattr(msg, "content", None):
-                  ai_content = msg.content
-                  break
-              elif isinstance(msg, dict) and msg.get("type") in ("ai", "assistant") and msg.get("content"):
-                  ai_content = msg["content"]
-                  break
-
-          # Fallback: if no content was found but tool_call_results exists
-          if not ai_content and "tool_call_results" in llm_result:
-              ai_content = "\n".join(
-                  str(r.get("content", r)) for r in llm_result["tool_call_results"]
-              )
-
-
-          # Return response
-          if ai_content:
-              print("Assistant generated response")
-              output_messages = [Message(type=MsgType.assistant, content=ai_content)]
-          else:
-              logger.warning("No assistant content found in LLM result")
-              output_messages = []
-
-          # Add a banner before printing the output messages
-          debug_print(f"Agent MCP Capabilities: {output_messages[-1].content}")
-
-      def _create_agent(state: AgentState, config: RunnableConfig) -> Dict[str, Any]:
-          return asyncio.run(_async_komodor_agent(state, config))
-      messages = []
-      state_input = InputState(messages=messages)
-      agent_input = AgentState(input=state_input).model_dump(mode="json")
-      runnable_config = RunnableConfig()
-      # Add a HumanMessage to the input messages if not already present
-      if not any(isinstance(m, HumanMessage) for m in messages):
-          messages.append(HumanMessage(content="What is 2 + 2?"))
-      _create_agent(agent_input, config=runnable_config)
+      self._startup_lock = asyncio.Lock()
+
+    @property
+    def ready(self) -> bool:
+      """True once startup() has built the graph and the agent can serve requests."""
+      return self.graph is not None
+
+    async def startup(self) -> None:
+      """
+      Load the MCP tools and build the graph.
+
+      Tools come from the process-wide pool of warm MCP server sessions, which
+      knows them from the server's prebuilt manifest, so no model call is made
+      and no tool call waits for a server to spawn.
+      """
+      async with self._startup_lock:
+        if self.graph is not None:
+          return
+
+        tools = await get_mcp_pool().get_tools()
+        logger.info(f"Loaded {len(tools)} Komodor MCP tools")
+        debug_print("Available tools: " + ", ".join(tool.name for tool in tools))
+
+        self.graph = create_react_agent(
+          self.model,
+          tools,
+          checkpointer=memory,
+          prompt=self.SYSTEM_INSTRUCTION,
+          response_format=(self.RESPONSE_FORMAT_INSTRUCTION, ResponseFormat),
+        )
 
     async def stream(
       self, query: str, sessionId: str
     ) -> AsyncIterable[dict[str, Any]]:
       print("DEBUG: Starting stream with query:", query, "and sessionId:", sessionId)
+      if self.graph is None:
+        # Serve requests that arrive before the app's startup finished, or outside the A2A app
+        await self.startup()
       inputs: dict[str, Any] = {'messages': [('user', query)]}
-      config: RunnableConfig = {'configurable': {'thread_id': sessionId}}
-
-      async for item in self.graph.astream(inputs, config, stream_mode='values'):
-          message = item['messages'][-1]
-          debug_print(f"Streamed message: {message}")
-          if (
-              isinstance(message, AIMessage)
-              and message.tool_calls
-              and len(message.tool_calls) > 0
-          ):
-              yield {
-                'is_task_complete': False,
-                'require_user_input': False,
-                'content': 'Looking up Komodor Resources rates...',
-              }
-          elif isinstance(message, ToolMessage):
-              yield {
-                'is_task_complete': False,
-                'require_user_input': False,
-                'content': 'Processing Komodor Resources rates..',
-              }
-
-      yield self.get_agent_response(config)
+      config: RunnableConfig = {'configurable': {'thread_id': sessionId}, 'callbacks': metrics_callbacks()}
+      stream_mode = ['messages', 'updates'] if STREAM_TOKENS else ['updates']
+      answer = _AnswerChunks()
+
+      with tracing.start_span("agent.stream", {"session.id": sessionId}):
+        try:
+          async for mode, item in self.graph.astream(inputs, config, stream_mode=stream_mode):
+              if mode == 'messages':
+                  message, metadata = item
+                  # Only the ReAct loop's model calls stream text; the structured response is sent whole at the end
+                  if metadata.get('langgraph_node') == 'agent' and isinstance(message, AIMessageChunk) and (text := message.text()):
+                      for event in answer.add(message.id, text):
+                          yield event
+                  continue
+
+              debug_print(f"Streamed update: {item}")
+              for event in answer.flush():
+                  yield event
+              for update in item.values():
+                  progress = self._progress_message(update)
+                  if progress:
+                      yield {
+                        'is_task_complete': False,
+                        'require_user_input': False,
+                        'content': progress,
+                      }
+          for event in answer.flush():
+              yield event
+        except asyncio.CancelledError:
+          # The task was cancelled; leave the conversation in a state the next request can continue from
+          await self.close_cancelled_tool_calls(config)
+          raise
+
+        yield self.get_agent_response(config)
+
+    @staticmethod
+    def _progress_message(update: Any) -> str | None:
+      """Describe a graph node's update by the tools it calls or returns results from."""
+      messages = update.get('messages', []) if isinstance(update, dict) else []
+      calls = dict.fromkeys(call['name'] for m in messages if isinstance(m, AIMessage) for call in m.tool_calls)
+      if calls:
+        return f"Calling {', '.join(calls)}..."
+      results = dict.fromkeys(m.name or 'tool' for m in messages if isinstance(m, ToolMessage))
+      if results:
+        return f"Processing results from {', '.join(results)}..."
+      return None
+
+    async def close_cancelled_tool_calls(self, config: RunnableConfig) -> None:
+      """
+      Answer tool calls a cancelled run left without results.
+
+      The model API rejects a conversation in which a tool call has no result,
+      so without this the next message in the conversation would fail.
+      """
+      state = await self.graph.aget_state(config)
+      messages = state.values.get('messages', [])
+      answered = {m.tool_call_id for m in messages if isinstance(m, ToolMessage)}
+      pending = [
+        call for m in messages if isinstance(m, AIMessage) for call in m.tool_calls if call['id'] not in answered
+      ]
+      if pending:
+        logger.info(f"Closing {len(pending)} tool call(s) left open by a cancelled run")
+        results = [
+          ToolMessage(content='Cancelled by the user.', name=call['name'], tool_call_id=call['id'], status='error')
+          for call in pending
+        ]
+        await self.graph.aupdate_state(config, {'messages': results}, as_node='tools')
+
     def get_agent_response(self, config: RunnableConfig) -> dict[str, Any]:
       debug_print(f"Fetching agent response with config: {config}")
       current_state = self.graph.get_state(config)
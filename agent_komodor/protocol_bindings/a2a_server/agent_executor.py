@@ -1,17 +1,35 @@
 # Copyright 2025 CNOE
 # SPDX-License-Identifier: Apache-2.0
 
+import asyncio
+import logging
+from typing import Dict, Set
+from uuid import uuid4
+
+from agent_komodor import tracing
+from agent_komodor.protocol_bindings.a2a_server.admission import AdmissionError, admission_controller_from_env
 from agent_komodor.protocol_bindings.a2a_server.agent import KomodorAgent # type: ignore[import-untyped]
 from typing_extensions import override
 from a2a.server.agent_execution import AgentExecutor, RequestContext
 from a2a.server.events.event_queue import EventQueue
 from a2a.types import (
+    Artifact,
+    Part,
+    Task,
     TaskArtifactUpdateEvent,
+    TaskNotCancelableError,
     TaskState,
     TaskStatus,
     TaskStatusUpdateEvent,
+    TextPart,
 )
-from a2a.utils import new_agent_text_message, new_task, new_text_artifact
+from a2a.utils import new_agent_text_message, new_task
+from a2a.utils.errors import ServerError
+
+logger = logging.getLogger(__name__)
+
+# Task states a task never leaves, so there is nothing left to cancel
+TERMINAL_STATES = {TaskState.completed, TaskState.canceled, TaskState.failed, TaskState.rejected}
 
 
 class KomodorAgentExecutor(AgentExecutor):
@@ -19,6 +37,11 @@ class KomodorAgentExecutor(AgentExecutor):
 
     def __init__(self):
         self.agent = KomodorAgent()
+        # Bounds how many tasks call the model and the Komodor API at once
+        self.admission = admission_controller_from_env()
+        # Running executions by task id, and the ones a client asked to cancel
+        self._running: Dict[str, asyncio.Task] = {}
+        self._cancel_requested: Set[str] = set()
 
     @override
     async def execute(
@@ -35,21 +58,91 @@ class KomodorAgentExecutor(AgentExecutor):
         if not task:
             task = new_task(context.message)
             event_queue.enqueue_event(task)
+        self._running[task.id] = asyncio.current_task()
+        try:
+            with tracing.start_span(
+                'a2a.execute', {'a2a.task.id': task.id, 'a2a.context.id': task.contextId}, server=True
+            ):
+                await self._execute(query, task, event_queue)
+        finally:
+            self._running.pop(task.id, None)
+            self._cancel_requested.discard(task.id)
+
+    async def _execute(self, query: str, task: Task, event_queue: EventQueue) -> None:
+        async def on_queued(waiting: int) -> None:
+            event_queue.enqueue_event(
+                self._working_status(task, f'Waiting for the agent to become available ({waiting} request(s) queued)...')
+            )
+
+        try:
+            async with self.admission.slot(task.contextId, on_queued=on_queued):
+                await self._stream(query, task, event_queue)
+        except AdmissionError as e:
+            event_queue.enqueue_event(
+                self._final_status(
+                    task,
+                    TaskState.rejected,
+                    f'The agent is too busy to take this request ({e}). Please try again later.',
+                )
+            )
+        except asyncio.CancelledError:
+            if task.id not in self._cancel_requested:
+                raise
+            # Cancelled through tasks/cancel: report it and finish normally
+            asyncio.current_task().uncancel()
+            logger.info('Task %s canceled', task.id)
+            event_queue.enqueue_event(self._final_status(task, TaskState.canceled, 'The request was canceled.'))
+
+    def _final_status(self, task: Task, state: TaskState, text: str) -> TaskStatusUpdateEvent:
+        return TaskStatusUpdateEvent(
+            status=TaskStatus(
+                state=state,
+                message=new_agent_text_message(text, task.contextId, task.id),
+            ),
+            final=True,
+            contextId=task.contextId,
+            taskId=task.id,
+        )
+
+    def _working_status(self, task: Task, text: str) -> TaskStatusUpdateEvent:
+        return TaskStatusUpdateEvent(
+            status=TaskStatus(
+                state=TaskState.working,
+                message=new_agent_text_message(text, task.contextId, task.id),
+            ),
+            final=False,
+            contextId=task.contextId,
+            taskId=task.id,
+        )
+
+    def _answer(self, task: Task, artifact_id: str, text: str, append: bool, last_chunk: bool) -> TaskArtifactUpdateEvent:
+        return TaskArtifactUpdateEvent(
+            append=append,
+            contextId=task.contextId,
+            taskId=task.id,
+            lastChunk=last_chunk,
+            artifact=Artifact(
+                artifactId=artifact_id,
+                name='current_result',
+                description='Result of request to agent.',
+                parts=[Part(root=TextPart(text=text))],
+            ),
+        )
+
+    async def _stream(self, query: str, task: Task, event_queue: EventQueue) -> None:
+        # Answer chunks build up one artifact; the agent's final response replaces it
+        artifact_id = str(uuid4())
+        streamed = False
         # invoke the underlying agent, using streaming results
         async for event in self.agent.stream(query, task.contextId):
-            if event['is_task_complete']:
+            if event.get('is_answer_chunk'):
                 event_queue.enqueue_event(
-                    TaskArtifactUpdateEvent(
-                        append=False,
-                        contextId=task.contextId,
-                        taskId=task.id,
-                        lastChunk=True,
-                        artifact=new_text_artifact(
-                            name='current_result',
-                            description='Result of request to agent.',
-                            text=event['content'],
-                        ),
-                    )
+                    self._answer(task, artifact_id, event['content'], append=event['append'], last_chunk=False)
+                )
+                streamed = True
+            elif event['is_task_complete']:
+                event_queue.enqueue_event(
+                    self._answer(task, artifact_id, event['content'], append=False, last_chunk=True)
                 )
                 event_queue.enqueue_event(
                     TaskStatusUpdateEvent(
@@ -60,6 +153,11 @@ class KomodorAgentExecutor(AgentExecutor):
                     )
                 )
             elif event['require_user_input']:
+                if streamed:
+                    # Close the streamed answer with the question it turned out to be
+                    event_queue.enqueue_event(
+                        self._answer(task, artifact_id, event['content'], append=False, last_chunk=True)
+                    )
                 event_queue.enqueue_event(
                     TaskStatusUpdateEvent(
                         status=TaskStatus(
@@ -76,24 +174,29 @@ class KomodorAgentExecutor(AgentExecutor):
                     )
                 )
             else:
-                event_queue.enqueue_event(
-                    TaskStatusUpdateEvent(
-                        status=TaskStatus(
-                            state=TaskState.working,
-                            message=new_agent_text_message(
-                                event['content'],
-                                task.contextId,
-                                task.id,
-                            ),
-                        ),
-                        final=False,
-                        contextId=task.contextId,
-                        taskId=task.id,
-                    )
-                )
+                event_queue.enqueue_event(self._working_status(task, event['content']))
 
     @override
     async def cancel(
         self, context: RequestContext, event_queue: EventQueue
     ) -> None:
-        raise Exception('cancel not supported')
+        """Stop a task's model and tool calls and report it as canceled.
+
+        Cancelling the running execution cancels the graph run, and with it the
+        in-flight tool calls, whose MCP server then cancels their Komodor API
+        requests. A task that isn't running here, e.g. one waiting for user
+        input, is just marked canceled.
+        """
+        task = context.current_task
+        running = self._running.get(context.task_id)
+        if running is None:
+            if task is None or task.status.state in TERMINAL_STATES:
+                raise ServerError(error=TaskNotCancelableError())
+            event_queue.enqueue_event(self._final_status(task, TaskState.canceled, 'The request was canceled.'))
+            return
+
+        logger.info('Cancelling task %s', context.task_id)
+        self._cancel_requested.add(context.task_id)
+        running.cancel()
+        # Let execute report the cancellation before the request handler cancels the task itself
+        await asyncio.wait({running})
@@ -0,0 +1,62 @@
+# Copyright 2025 CNOE
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import contextlib
+import logging
+from typing import Any, AsyncIterator, Optional
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+logger = logging.getLogger(__name__)
+
+
+class AgentStartup:
+    """Runs the agent's startup during the app's lifespan and reports readiness.
+
+    Startup runs in the background, so the server answers health checks while
+    tools are loaded: ``/healthz`` reports the process is alive and
+    ``/readyz`` returns 503 until the agent can serve requests.
+    """
+
+    def __init__(self, agent: Any):
+        self.agent = agent
+        self.error: Optional[BaseException] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        try:
+            await self.agent.startup()
+            logger.info('Agent is ready')
+        except Exception as e:
+            self.error = e
+            logger.exception('Agent startup failed')
+
+    @contextlib.asynccontextmanager
+    async def lifespan(self, app) -> AsyncIterator[None]:
+        self._task = asyncio.create_task(self._run(), name='agent-startup')
+        try:
+            yield
+        finally:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+
+    async def live(self, request: Request) -> JSONResponse:
+        return JSONResponse({'status': 'ok'})
+
+    async def ready(self, request: Request) -> JSONResponse:
+        if self.agent.ready:
+            return JSONResponse({'status': 'ready'})
+        if self.error is not None:
+            return JSONResponse({'status': 'failed', 'error': str(self.error)}, status_code=503)
+        return JSONResponse({'status': 'starting'}, status_code=503)
+
+    @property
+    def routes(self) -> list[Route]:
+        return [
+            Route('/healthz', self.live, methods=['GET']),
+            Route('/readyz', self.ready, methods=['GET']),
+        ]
@@ -0,0 +1,186 @@
+"""In-process TTL cache for read-only API responses"""
+
+import json
+import logging
+import os
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger("mcp_komodor")
+
+CACHE_ENABLED = os.getenv("KOMODOR_CACHE_ENABLED", "true").lower() == "true"
+CACHE_MAX_ENTRIES = int(os.getenv("KOMODOR_CACHE_MAX_ENTRIES", "256"))
+
+# Families whose data depend on each other: a mutation in one invalidates cached reads in all of them
+INVALIDATION_GROUPS = [
+    # Roles, policies and actions all feed users' effective permissions
+    ("/mgmt/v1/rbac", "/api/v2/rbac", "/api/v2/users"),
+    # Installing or removing a cluster integration changes the cluster list
+    ("/mgmt/v1/integrations", "/api/v2/clusters"),
+    ("/mgmt/v1/monitors", "/api/v2/realtime-monitors"),
+]
+
+CacheKey = Tuple[str, str]
+
+
+def _normalize(value: Any) -> Any:
+    """Normalize a parameter value so equivalent queries produce the same key."""
+    if isinstance(value, bool):
+        return str(value).lower()
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items() if v is not None}
+    if isinstance(value, (list, tuple, set)):
+        # Filters like clusterName=[a, b] do not depend on order
+        return sorted((_normalize(v) for v in value), key=lambda v: json.dumps(v, sort_keys=True, default=str))
+    return value
+
+
+def cache_key(path: str, params: Optional[Dict[str, Any]] = None) -> CacheKey:
+    """
+    Build a cache key from a path and its query parameters.
+
+    Parameters set to None are dropped, keys are sorted, booleans are lowercased
+    the way the tools send them and list values are sorted.
+
+    Args:
+        path: API path (without base URL)
+        params: Query parameters
+
+    Returns:
+        Hashable key
+    """
+    return path, json.dumps(_normalize(params or {}), sort_keys=True, default=str)
+
+
+def resource_family(path: str) -> str:
+    """
+    Return the resource family of an API path.
+
+    The family is the version prefix and the first resource segment, e.g.
+    /api/v2/users/jane@example.com -> /api/v2/users and
+    /mgmt/v1/rbac/roles/123/policies -> /mgmt/v1/rbac.
+
+    Args:
+        path: API path (without base URL)
+
+    Returns:
+        Path prefix shared by the family
+    """
+    return "/" + "/".join(path.strip("/").split("/")[:3])
+
+
+def is_mutation(method: str, path: str) -> bool:
+    """
+    Return whether a request changes data on the server.
+
+    Args:
+        method: HTTP method
+        path: API path (without base URL)
+
+    Returns:
+        True for PUT, PATCH, DELETE and POSTs other than searches
+    """
+    if method == "POST":
+        return not path.rstrip("/").endswith("/search")
+    return method in {"PUT", "PATCH", "DELETE"}
+
+
+class ResponseCache:
+    """
+    Size-bounded LRU cache of parsed responses with a TTL per entry.
+
+    Cached values are shared between callers and must not be mutated.
+    """
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[CacheKey, Tuple[float, Any]]" = OrderedDict()
+        self._stats: Counter = Counter()
+
+    def get(self, key: CacheKey) -> Optional[Any]:
+        """
+        Return a cached value, or None if it is missing or expired.
+
+        Args:
+            key: Key from cache_key
+
+        Returns:
+            The cached value or None
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self._stats["misses"] += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self._stats["expired"] += 1
+            self._stats["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self._stats["hits"] += 1
+        return value
+
+    def set(self, key: CacheKey, value: Any, ttl: float) -> None:
+        """
+        Cache a value, evicting the least recently used entries beyond max_entries.
+
+        Args:
+            key: Key from cache_key
+            value: Parsed response
+            ttl: Seconds the value stays fresh
+        """
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def invalidate(self, path: str) -> int:
+        """
+        Drop cached reads affected by a mutation of the given path.
+
+        Args:
+            path: API path that was mutated
+
+        Returns:
+            Number of entries dropped
+        """
+        family = resource_family(path)
+        prefixes = {family}
+        for group in INVALIDATION_GROUPS:
+            if any(family.startswith(prefix) for prefix in group):
+                prefixes.update(group)
+
+        stale = [key for key in self._entries if any(key[0].startswith(prefix) for prefix in prefixes)]
+        for key in stale:
+            del self._entries[key]
+        if stale:
+            self._stats["invalidations"] += len(stale)
+            logger.debug("Invalidated %d cached responses after mutating %s", len(stale), path)
+        return len(stale)
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return cache counters.
+
+        Returns:
+            Dict with the number of entries, hits, misses, expired entries,
+            LRU evictions and entries dropped by invalidation
+        """
+        return {
+            "entries": len(self._entries),
+            "hits": self._stats["hits"],
+            "misses": self._stats["misses"],
+            "expired": self._stats["expired"],
+            "evictions": self._stats["evictions"],
+            "invalidations": self._stats["invalidations"],
+        }
+
+
+response_cache = ResponseCache()
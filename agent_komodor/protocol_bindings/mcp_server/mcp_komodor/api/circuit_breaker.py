@@ -0,0 +1,168 @@
+"""Circuit breakers that fail fast while an API endpoint family is degraded"""
+
+import logging
+import os
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger("mcp_komodor")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+CIRCUIT_BREAKER_ENABLED = os.getenv("KOMODOR_CIRCUIT_BREAKER_ENABLED", "true").lower() == "true"
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("KOMODOR_CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RECOVERY_TIMEOUT = float(os.getenv("KOMODOR_CIRCUIT_RECOVERY_TIMEOUT", "30"))
+
+# Endpoint families with their own breaker; other paths share the "/" breaker
+CIRCUIT_BREAKER_FAMILIES: List[str] = ["/api/v2/", "/mgmt/v1/"]
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while its endpoint family's circuit is open."""
+
+    def __init__(self, breaker: "CircuitBreaker"):
+        self.family = breaker.family
+        self.retry_after = breaker.retry_after()
+        self.consecutive_failures = breaker.consecutive_failures
+        super().__init__(
+            f"Komodor API is unavailable for {self.family} endpoints "
+            f"({self.consecutive_failures} consecutive failures), "
+            f"not retrying for {self.retry_after:.0f}s"
+        )
+
+    def to_error(self) -> Dict[str, Any]:
+        """
+        Describe the outage as a tool error the agent can act on.
+
+        Returns:
+            Error dict flagging the upstream as unavailable, with the affected
+            endpoint family and when calls will be attempted again
+        """
+        return {
+            "error": str(self),
+            "upstream_unavailable": True,
+            "endpoint_family": self.family,
+            "retry_after_seconds": round(self.retry_after, 1),
+        }
+
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open circuit breaker for one endpoint family.
+
+    The circuit opens after ``failure_threshold`` consecutive failures and
+    rejects calls for ``recovery_timeout`` seconds. It then lets a single trial
+    call through (half-open): success closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, family: str, failure_threshold: int, recovery_timeout: float):
+        self.family = family
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.rejected = 0
+        self.transitions: Counter = Counter()
+        self._opened_at = 0.0
+        self._trial_started_at: Optional[float] = None
+
+    def _transition(self, state: str) -> None:
+        if state == self.state:
+            return
+        logger.warning("Circuit for %s endpoints %s -> %s", self.family, self.state, state)
+        self.transitions[f"{self.state}->{state}"] += 1
+        self.state = state
+
+    def retry_after(self) -> float:
+        """Return seconds until an open circuit lets a trial call through."""
+        if self.state == CLOSED:
+            return 0.0
+        return max(0.0, self._opened_at + self.recovery_timeout - time.monotonic())
+
+    def allow(self) -> bool:
+        """
+        Return whether a call may be sent now.
+
+        Returns:
+            False while the circuit is open, or half-open with a trial call in flight
+        """
+        now = time.monotonic()
+        if self.state == OPEN and now - self._opened_at >= self.recovery_timeout:
+            self._transition(HALF_OPEN)
+            self._trial_started_at = None
+        if self.state == HALF_OPEN:
+            # A trial that never reported back (e.g. was cancelled) must not block recovery forever
+            if self._trial_started_at is None or now - self._trial_started_at >= self.recovery_timeout:
+                self._trial_started_at = now
+                return True
+        if self.state == CLOSED:
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        """Record a call that reached a healthy upstream."""
+        self.consecutive_failures = 0
+        self._trial_started_at = None
+        self._transition(CLOSED)
+
+    def record_failure(self) -> None:
+        """Record a timeout, transport error or 5xx response."""
+        self.consecutive_failures += 1
+        self._trial_started_at = None
+        if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+            self._transition(OPEN)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return the breaker's state and counters.
+
+        Returns:
+            Dict with the current state, consecutive failures, calls rejected
+            while open and the number of state changes per transition
+        """
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "rejected": self.rejected,
+            "retry_after_seconds": round(self.retry_after(), 1),
+            "transitions": dict(self.transitions),
+        }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker(path: str) -> Optional[CircuitBreaker]:
+    """
+    Return the circuit breaker guarding an API path, creating it on first use.
+
+    Args:
+        path: API path (without base URL)
+
+    Returns:
+        The breaker for the path's endpoint family, or None if
+        KOMODOR_CIRCUIT_BREAKER_ENABLED is false
+    """
+    if not CIRCUIT_BREAKER_ENABLED:
+        return None
+    matches = [prefix for prefix in CIRCUIT_BREAKER_FAMILIES if path.startswith(prefix)]
+    family = max(matches, key=len) if matches else "/"
+    breaker = _breakers.get(family)
+    if breaker is None:
+        breaker = _breakers[family] = CircuitBreaker(family, CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RECOVERY_TIMEOUT)
+    return breaker
+
+
+def get_circuit_breaker_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Return the state and counters of every circuit breaker.
+
+    Returns:
+        Dict keyed by endpoint family, see CircuitBreaker.stats
+    """
+    return {family: breaker.stats() for family, breaker in _breakers.items()}
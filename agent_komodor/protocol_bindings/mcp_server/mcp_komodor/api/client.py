@@ -1,10 +1,23 @@
 """API client for making requests to the service"""
 
+import asyncio
+import importlib.util
+import json
 import os
 import logging
+import time
+from collections import Counter
 from typing import Optional, Dict, Tuple, Any
 import httpx
 
+from mcp_komodor.api import codec
+from mcp_komodor.api.cache import CACHE_ENABLED, cache_key, is_mutation, response_cache
+from mcp_komodor.api.circuit_breaker import CircuitOpenError, get_circuit_breaker, get_circuit_breaker_stats  # noqa: F401
+from mcp_komodor.api.rate_limit import RATE_LIMITING_ENABLED, RATE_LIMITS, RateLimiter
+from mcp_komodor.api.retry import NO_RETRY, RetryPolicy, get_retry_policy, is_idempotent, parse_retry_after
+from mcp_komodor import metrics, tracing
+from mcp_komodor.log import Payload, sample_request
+
 # Load environment variables
 API_URL = os.getenv("KOMODOR_API_URL")
 API_TOKEN = os.getenv("KOMODOR_TOKEN")
@@ -14,10 +27,256 @@ if not API_URL:
 if not API_TOKEN:
     raise ValueError("KOMODOR_API_TOKEN environment variable is not set.")
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
+# Connection pool configuration for the shared HTTP client
+HTTP_MAX_CONNECTIONS = int(os.getenv("KOMODOR_HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("KOMODOR_HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("KOMODOR_HTTP_KEEPALIVE_EXPIRY", "30"))
+
+# Opt-in HTTP/2 so concurrent tool calls multiplex over a single connection
+HTTP2_ENABLED = os.getenv("KOMODOR_HTTP2", "false").lower() == "true"
+
+SUPPORTED_METHODS = {"GET", "POST", "PUT", "PATCH", "DELETE"}
+
 logger = logging.getLogger("mcp_komodor")
 
+# Process-wide HTTP client and the event loop it is bound to
+_http_client: Optional[httpx.AsyncClient] = None
+_http_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+# Responses received per negotiated HTTP version, for diagnosing HTTP/2 use
+_responses_by_http_version: Counter = Counter()
+
+# Rate limiter shared by all tool calls and the event loop its queues belong to
+_rate_limiter: Optional[RateLimiter] = None
+_rate_limiter_loop: Optional[asyncio.AbstractEventLoop] = None
+
+# Identical reads currently in flight, shared by every caller asking for the same thing
+_in_flight: Dict[Tuple[Any, ...], "asyncio.Task[Tuple[bool, Dict[str, Any]]]"] = {}
+_in_flight_waiters: Counter = Counter()
+_single_flight_stats: Counter = Counter()
+
+# Retries spent on idempotent requests
+_retry_stats: Counter = Counter()
+_retries_by_reason: Counter = Counter()
+
+
+def _use_http2() -> bool:
+    """Return whether the shared client should negotiate HTTP/2."""
+    if not HTTP2_ENABLED:
+        return False
+    if importlib.util.find_spec("h2") is None:
+        logger.warning("KOMODOR_HTTP2 is enabled but the 'h2' package is not installed, falling back to HTTP/1.1")
+        return False
+    return True
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Return the process-wide HTTP client, creating it on first use.
+
+    Connections to the API are pooled and kept alive between tool calls so that
+    DNS resolution, TCP connect and TLS handshakes are paid once per connection
+    instead of once per request. A new client is created if the previous one was
+    closed or belongs to an event loop that is no longer running.
+
+    When KOMODOR_HTTP2 is enabled the client offers HTTP/2 via ALPN, so
+    concurrent requests share one multiplexed connection. Servers that do not
+    support HTTP/2 transparently fall back to HTTP/1.1.
+
+    Returns:
+        The shared httpx.AsyncClient
+    """
+    global _http_client, _http_client_loop
+
+    loop = asyncio.get_running_loop()
+    if _http_client is None or _http_client.is_closed or _http_client_loop is not loop:
+        http2 = _use_http2()
+        logger.debug(
+            "Creating shared HTTP client (http2=%s, max_connections=%s, max_keepalive_connections=%s, keepalive_expiry=%ss)",
+            http2,
+            HTTP_MAX_CONNECTIONS,
+            HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            HTTP_KEEPALIVE_EXPIRY,
+        )
+        _http_client = httpx.AsyncClient(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+            ),
+        )
+        _http_client_loop = loop
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the process-wide HTTP client and release its pooled connections."""
+    global _http_client, _http_client_loop
+
+    client, _http_client, _http_client_loop = _http_client, None, None
+    if client is not None and not client.is_closed:
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Closing shared HTTP client, pool stats: %s", _pool_stats(client))
+        await client.aclose()
+
+
+def _pool_stats(client: Optional[httpx.AsyncClient]) -> Dict[str, Any]:
+    """Summarize the connections currently held by a client's pool."""
+    pool = getattr(getattr(client, "_transport", None), "_pool", None)
+    connections = getattr(pool, "connections", [])
+
+    by_http_version: Counter = Counter()
+    idle = 0
+    for connection in connections:
+        # httpcore reports e.g. "HTTP/2, ACTIVE, Request Count: 3" or "CONNECTING"
+        by_http_version[connection.info().split(",")[0]] += 1
+        idle += connection.is_idle()
+
+    return {
+        "http2_enabled": bool(getattr(pool, "_http2", False)),
+        "connections": len(connections),
+        "idle_connections": idle,
+        "connections_by_http_version": dict(by_http_version),
+        "responses_by_http_version": dict(_responses_by_http_version),
+    }
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """
+    Return connection pool statistics for the shared HTTP client.
+
+    Returns:
+        Dict with the number of open and idle connections, connections per
+        negotiated HTTP version and responses received per HTTP version
+    """
+    return _pool_stats(_http_client)
+
+
+
+def get_rate_limiter() -> Optional[RateLimiter]:
+    """
+    Return the process-wide rate limiter, creating it on first use.
+
+    Requests are throttled client-side per endpoint family (path prefix) with a
+    token bucket, so concurrent agent sessions queue instead of being throttled
+    by Komodor. A new limiter is created if the event loop changed.
+
+    Returns:
+        The shared RateLimiter, or None if KOMODOR_RATE_LIMIT_ENABLED is false
+    """
+    global _rate_limiter, _rate_limiter_loop
+
+    if not RATE_LIMITING_ENABLED:
+        return None
+    loop = asyncio.get_running_loop()
+    if _rate_limiter is None or _rate_limiter_loop is not loop:
+        _rate_limiter = RateLimiter(RATE_LIMITS)
+        _rate_limiter_loop = loop
+    return _rate_limiter
+
+
+def get_rate_limit_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Return queueing statistics of the rate limiter per endpoint family.
+
+    Returns:
+        Dict keyed by path prefix, see RateLimiter.stats
+    """
+    return _rate_limiter.stats() if _rate_limiter is not None else {}
+
+
+def get_retry_stats() -> Dict[str, Any]:
+    """
+    Return counters for retries spent on idempotent requests.
+
+    Returns:
+        Dict with the number of requests that were retried, the total number of
+        retries, retries per reason (HTTP status or exception type) and the
+        number of requests that still failed after retrying
+    """
+    return {
+        "retried_requests": _retry_stats["retried_requests"],
+        "retries": _retry_stats["retries"],
+        "retries_by_reason": dict(_retries_by_reason),
+        "exhausted": _retry_stats["exhausted"],
+    }
+
+
+async def _request_with_retries(
+    client: httpx.AsyncClient,
+    method: str,
+    path: str,
+    url: str,
+    policy: RetryPolicy,
+    timeout: float,
+    **request_kwargs: Any,
+) -> Tuple[httpx.Response, int]:
+    """
+    Send a request, retrying timeouts, transport errors and retryable statuses.
+
+    Every attempt is refused with CircuitOpenError while the path's circuit
+    breaker is open, and otherwise first waits for the rate limiter. Timeouts,
+    transport errors and 5xx responses count as failures for the breaker. Each
+    attempt's timeout is
+    capped by what is left of the policy's deadline, and a retry is only made if
+    its backoff (or the server's Retry-After) fits in the remaining budget. The
+    last response is returned, or the last exception re-raised, once attempts or
+    budget run out.
+
+    Returns:
+        Tuple of (response, attempts made)
+    """
+    deadline = time.monotonic() + policy.deadline
+    limiter = get_rate_limiter()
+    breaker = get_circuit_breaker(path)
+    attempt = 0
+    while True:
+        attempt += 1
+        if breaker is not None and not breaker.allow():
+            raise CircuitOpenError(breaker)
+        if limiter is not None:
+            await limiter.acquire(path)
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise httpx.PoolTimeout(f"Deadline of {policy.deadline}s exceeded while waiting for the rate limiter")
+        response = None
+        try:
+            response = await client.request(method, url, timeout=min(timeout, remaining), **request_kwargs)
+            _responses_by_http_version[response.http_version] += 1
+            if breaker is not None:
+                if response.status_code >= 500:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+            if response.status_code not in policy.retry_statuses:
+                return response, attempt
+            reason = str(response.status_code)
+            delay = parse_retry_after(response.headers.get("Retry-After"))
+        except (httpx.TimeoutException, httpx.TransportError) as e:
+            if breaker is not None:
+                breaker.record_failure()
+            reason = type(e).__name__
+            delay = None
+            error = e
+
+        if delay is None:
+            delay = policy.backoff(attempt)
+        if attempt >= policy.max_attempts or delay >= deadline - time.monotonic():
+            if attempt > 1:
+                _retry_stats["exhausted"] += 1
+            if response is not None:
+                return response, attempt
+            raise error
+
+        if attempt == 1:
+            _retry_stats["retried_requests"] += 1
+        _retry_stats["retries"] += 1
+        _retries_by_reason[reason] += 1
+        logger.warning(
+            "%s %s failed (%s), retry %d/%d in %.2fs", method, url, reason, attempt, policy.max_attempts - 1, delay
+        )
+        await asyncio.sleep(delay)
 
 
 def assemble_nested_body(flat_body: Dict[str, Any]) -> Dict[str, Any]:
@@ -39,6 +298,8 @@ async def make_api_request(
     params: Dict[str, Any] = {},
     data: Dict[str, Any] = {},
     timeout: int = 30,
+    retry_policy: Optional[RetryPolicy] = None,
+    cache_ttl: Optional[float] = None,
 ) -> Tuple[bool, Dict[str, Any]]:
     """
     Make a request to the API
@@ -50,15 +311,133 @@ async def make_api_request(
         params: Query parameters for the request (optional)
         data: JSON data for POST/PATCH/PUT requests (optional)
         timeout: Request timeout in seconds (default: 30)
+        retry_policy: Retry policy for this call (defaults to the policy configured
+            for the path). Only GET requests and search POSTs are retried.
+        cache_ttl: Seconds a successful GET response may be served from the
+            in-process cache (optional, not cached by default). Cached responses
+            are shared between callers and must not be mutated.
+
+    Concurrent identical reads (GETs and search POSTs with the same path, params
+    and body) share one upstream request and one parsed response, which must
+    likewise not be mutated.
 
     Returns:
         Tuple of (success, data) where data is either the response JSON or an error dict
     """
-    logger.debug(f"Making {method} request to {path}")
+    with tracing.api_span(method, path):
+        cache = response_cache if CACHE_ENABLED and cache_ttl and method == "GET" else None
+        if cache is not None:
+            key = cache_key(path, params)
+            cached = cache.get(key)
+            if cached is not None:
+                logger.debug("Serving GET %s from cache", path)
+                tracing.set_attributes({"komodor.cache_hit": True})
+                return (True, cached)
+
+        if is_idempotent(method, path):
+            success, response_data = await _single_flight(
+                _request_key(method, path, params, data),
+                lambda: _send_request(path, method, token, params, data, timeout, retry_policy),
+            )
+        else:
+            success, response_data = await _send_request(path, method, token, params, data, timeout, retry_policy)
+
+        if not success:
+            tracing.set_error(str(response_data.get("error")))
+        if success and cache is not None:
+            cache.set(key, response_data, cache_ttl)
+        if success and CACHE_ENABLED and is_mutation(method, path):
+            response_cache.invalidate(path)
+        return (success, response_data)
+
+
+def _request_key(method: str, path: str, params: Dict[str, Any], data: Dict[str, Any]) -> Tuple[Any, ...]:
+    """Key identical requests by method, path and canonical JSON of params and body, ignoring None values."""
+
+    def canonical(value: Dict[str, Any]) -> str:
+        return json.dumps({k: v for k, v in (value or {}).items() if v is not None}, sort_keys=True, default=str)
+
+    return method, path, canonical(params), canonical(data)
+
+
+async def _single_flight(key: Tuple[Any, ...], send) -> Tuple[bool, Dict[str, Any]]:
+    """
+    Await the in-flight request for key, starting it if there is none.
+
+    The request runs in its own task and callers await it through
+    asyncio.shield, so a caller that is cancelled does not cancel the request
+    for the others. Once every caller has been cancelled the request is
+    cancelled too, so abandoned reads (e.g. prefetched pages nobody consumes)
+    do not keep using connections and rate budget.
+    """
+    task = _in_flight.get(key)
+    if task is not None and task.get_loop() is asyncio.get_running_loop():
+        _single_flight_stats["coalesced"] += 1
+        logger.debug("Joining in-flight %s %s", key[0], key[1])
+    else:
+        _single_flight_stats["sent"] += 1
+        task = asyncio.ensure_future(send())
+        _in_flight[key] = task
+        task.add_done_callback(lambda done: _in_flight.pop(key, None) if _in_flight.get(key) is done else None)
+    _in_flight_waiters[task] += 1
+    try:
+        return await asyncio.shield(task)
+    except asyncio.CancelledError:
+        if _in_flight_waiters[task] == 1 and not task.done():
+            _single_flight_stats["abandoned"] += 1
+            task.cancel()
+        raise
+    finally:
+        _in_flight_waiters[task] -= 1
+        if not _in_flight_waiters[task]:
+            del _in_flight_waiters[task]
+
+
+def get_single_flight_stats() -> Dict[str, int]:
+    """
+    Return request coalescing statistics.
+
+    Returns:
+        Dict with the number of reads sent upstream, reads that joined an
+        identical in-flight request instead, reads cancelled because every
+        caller gave up on them, and reads currently in flight
+    """
+    return {
+        "sent": _single_flight_stats["sent"],
+        "coalesced": _single_flight_stats["coalesced"],
+        "abandoned": _single_flight_stats["abandoned"],
+        "in_flight": len(_in_flight),
+    }
+
+
+def get_cache_stats() -> Dict[str, int]:
+    """
+    Return statistics of the response cache.
+
+    Returns:
+        Dict with entries, hits, misses, expired entries, evictions and invalidations
+    """
+    return response_cache.stats()
+
+
+async def _send_request(
+    path: str,
+    method: str,
+    token: Optional[str],
+    params: Dict[str, Any],
+    data: Dict[str, Any],
+    timeout: int,
+    retry_policy: Optional[RetryPolicy],
+) -> Tuple[bool, Dict[str, Any]]:
+    """Send a request to the API and turn the response or failure into (success, data)."""
+    # Per-request debug lines are written for a sample of requests, and only when DEBUG is enabled
+    trace = sample_request(logger)
+    if trace:
+        logger.debug("Making %s request to %s", method, path)
 
     if not token:
-        logger.debug("No token provided, using default token")
         token = API_TOKEN
+    start = time.monotonic()
 
     if not token:
         logger.error("No token available - neither provided nor found in environment")
@@ -69,79 +448,84 @@ async def make_api_request(
 
     try:
         headers = {"X-API-KEY": API_TOKEN}
+        tracing.inject_headers(headers)
+
+        if trace:
+            logger.debug("Request parameters: %s", Payload(params))
+            if data:
+                logger.debug("Request data: %s", Payload(data))
+
+        if method not in SUPPORTED_METHODS:
+            logger.error("Unsupported HTTP method: %s", method)
+            return (False, {"error": f"Unsupported method: {method}"})
+
+        client = get_http_client()
+        url = f"{API_URL}{path}"
+
+        request_kwargs = {
+            "headers": headers,
+            "params": params,
+        }
+        if method in ["POST", "PUT", "PATCH"]:
+            request_kwargs["content"] = codec.dumps(data)
+            headers["Content-Type"] = "application/json"
+
+        policy = (retry_policy or get_retry_policy(path)) if is_idempotent(method, path) else NO_RETRY
+        response, attempts = await _request_with_retries(client, method, path, url, policy, timeout, **request_kwargs)
+        if trace:
+            logger.debug("Response status code: %s (%s)", response.status_code, response.http_version)
+        metrics.observe_api_request(str(response.status_code), time.monotonic() - start, attempts, len(response.content))
+        tracing.set_attributes({"http.response.status_code": response.status_code, "komodor.attempts": attempts})
 
-        logger.debug("Request headers prepared (Authorization header masked)")
-        logger.debug(f"Request parameters: {params}")
-        if data:
-            logger.debug(f"Request data: {data}")
-
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            url = f"{API_URL}{path}"
-            logger.debug(f"Full request URL: {url}")
-
-            method_map = {
-                "GET": client.get,
-                "POST": client.post,
-                "PUT": client.put,
-                "PATCH": client.patch,
-                "DELETE": client.delete,
-            }
-
-            if method not in method_map:
-                logger.error(f"Unsupported HTTP method: {method}")
-                return (False, {"error": f"Unsupported method: {method}"})
-
-            request_kwargs = {
-                "headers": headers,
-                "params": params,
-            }
-            if method in ["POST", "PUT", "PATCH"]:
-                request_kwargs["json"] = data
-
-            response = await method_map[method](url, **request_kwargs)
-            logger.debug(f"Response status code: {response.status_code}")
-
-            if response.status_code in [200, 201, 202, 204]:
-                if response.status_code == 204:
-                    logger.debug("Request successful (204 No Content)")
-                    return (True, {"status": "success"})
-                try:
-                    response_data = response.json()
-                    logger.debug("Request successful, parsed JSON response")
-                    return (True, response_data)
-                except ValueError:
-                    logger.warning("Request successful but could not parse JSON response")
-                    return (True, {"status": "success", "raw_response": response.text})
-            else:
-                error_message = f"API request failed: {response.status_code}"
-                logger.error(error_message)
-                try:
-                    error_data = response.json()
-                    if "error" in error_data:
-                        error_message = f"{error_message} - {error_data['error']}"
-                    elif "message" in error_data:
-                        error_message = f"{error_message} - {error_data['message']}"
-                    logger.error(f"Error details: {error_data}")
-                    return (False, {"error": error_message, "details": error_data})
-                except ValueError:
-                    error_text = response.text[:200] if response.text else ""
-                    logger.error(f"Error response (not JSON): {error_text}")
-                    return (False, {"error": f"{error_message} - {error_text}"})
+        if response.status_code in [200, 201, 202, 204]:
+            if response.status_code == 204:
+                return (True, {"status": "success"})
+            try:
+                parse_start = time.monotonic()
+                response_data = codec.loads(response.content)
+                metrics.observe_parse(time.monotonic() - parse_start)
+                return (True, response_data)
+            except ValueError:
+                logger.warning("Request successful but could not parse JSON response")
+                return (True, {"status": "success", "raw_response": response.text})
+        else:
+            error_message = f"API request failed: {response.status_code}"
+            if attempts > 1:
+                error_message = f"{error_message} after {attempts} attempts"
+            logger.error(error_message)
+            try:
+                error_data = codec.loads(response.content)
+                if "error" in error_data:
+                    error_message = f"{error_message} - {error_data['error']}"
+                elif "message" in error_data:
+                    error_message = f"{error_message} - {error_data['message']}"
+                logger.error("Error details: %s", Payload(error_data))
+                return (False, {"error": error_message, "details": error_data})
+            except ValueError:
+                error_text = response.text[:200] if response.text else ""
+                logger.error("Error response (not JSON): %s", error_text)
+                return (False, {"error": f"{error_message} - {error_text}"})
+    except CircuitOpenError as e:
+        metrics.observe_api_request("circuit_open", time.monotonic() - start)
+        logger.error(str(e))
+        return (False, e.to_error())
     except httpx.TimeoutException:
-        logger.error(f"Request timed out after {timeout} seconds")
+        metrics.observe_api_request("timeout", time.monotonic() - start)
+        logger.error("Request timed out after %s seconds", timeout)
         return (False, {"error": f"Request timed out after {timeout} seconds"})
     except httpx.HTTPStatusError as e:
-        logger.error(f"HTTP error: {e.response.status_code} - {str(e)}")
+        logger.error("HTTP error: %s - %s", e.response.status_code, e)
         return (False, {"error": f"HTTP error: {e.response.status_code} - {str(e)}"})
     except httpx.RequestError as e:
+        metrics.observe_api_request("request_error", time.monotonic() - start)
         error_message = str(e)
         if token and token in error_message:
             error_message = error_message.replace(token, "[REDACTED]")
-        logger.error(f"Request error: {error_message}")
+        logger.error("Request error: %s", error_message)
         return (False, {"error": f"Request error: {error_message}"})
     except Exception as e:
         error_message = str(e)
         if token and token in error_message:
             error_message = error_message.replace(token, "[REDACTED]")
-        logger.error(f"Unexpected error: {error_message}")
+        logger.error("Unexpected error: %s", error_message)
         return (False, {"error": f"Unexpected error: {error_message}"})
@@ -0,0 +1,69 @@
+"""JSON encoding and decoding, using orjson when it is installed"""
+
+import json
+import logging
+import os
+from typing import Any, Union
+
+logger = logging.getLogger("mcp_komodor")
+
+# "orjson", "json" or "auto" (orjson if installed, else the standard library)
+JSON_CODEC = os.getenv("KOMODOR_JSON_CODEC", "auto").lower()
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if JSON_CODEC == "orjson" and orjson is None:
+    logger.warning("KOMODOR_JSON_CODEC is orjson but the 'orjson' package is not installed, falling back to json")
+
+CODEC = "orjson" if orjson is not None and JSON_CODEC in ("auto", "orjson") else "json"
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Parse a JSON document.
+
+    Args:
+        data: Encoded JSON, e.g. a response body
+
+    Returns:
+        The parsed value
+
+    Raises:
+        ValueError: If the document is not valid JSON
+    """
+    if CODEC == "orjson":
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(value: Any) -> bytes:
+    """
+    Encode a value as compact UTF-8 JSON.
+
+    Values that JSON cannot represent are encoded with str().
+
+    Args:
+        value: Value to encode
+
+    Returns:
+        Encoded JSON
+    """
+    if CODEC == "orjson":
+        return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, default=str, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def dumps_str(value: Any) -> str:
+    """
+    Encode a value as compact JSON text.
+
+    Args:
+        value: Value to encode
+
+    Returns:
+        Encoded JSON
+    """
+    return dumps(value).decode()
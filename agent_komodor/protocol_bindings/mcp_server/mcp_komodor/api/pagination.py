@@ -0,0 +1,441 @@
+"""Pagination over Komodor list and search endpoints"""
+
+import asyncio
+import copy
+import logging
+import math
+import os
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from mcp_komodor.api.client import make_api_request
+
+logger = logging.getLogger("mcp_komodor")
+
+PAGINATION_CONCURRENCY = int(os.getenv("KOMODOR_PAGINATION_CONCURRENCY", "4"))
+PAGINATION_PAGE_SIZE = int(os.getenv("KOMODOR_PAGINATION_PAGE_SIZE", "50"))
+
+# Fields that may carry the total number of items or the next page's cursor,
+# checked at the top level and inside the containers below
+_TOTAL_FIELDS = ("total", "totalCount", "totalResults", "totalItems", "count")
+_CURSOR_FIELDS = ("nextPageToken", "nextToken", "nextCursor", "pageToken")
+_META_CONTAINERS = ("meta", "pagination", "data", "page")
+
+
+@dataclass(frozen=True)
+class PageStyle:
+    """
+    How an endpoint is paginated.
+
+    Attributes:
+        position_field: Dotted name of the page number, offset or cursor field
+        size_field: Dotted name of the page size field
+        in_body: Whether the fields go in the JSON body rather than the query string
+        by_offset: Whether position_field is an item offset rather than a page number
+        by_cursor: Whether position_field takes the cursor returned with the previous page
+    """
+
+    position_field: str
+    size_field: str
+    in_body: bool = False
+    by_offset: bool = False
+    by_cursor: bool = False
+
+
+# Pagination of the endpoints that support it, keyed by path
+PAGE_STYLES: Dict[str, PageStyle] = {
+    "/api/v2/health/risks": PageStyle(position_field="offset", size_field="pageSize", by_offset=True),
+    "/api/v2/audit-log": PageStyle(position_field="page", size_field="pageSize"),
+    "/api/v2/services/search": PageStyle(
+        position_field="pagination.page", size_field="pagination.pageSize", in_body=True
+    ),
+    "/api/v2/jobs/search": PageStyle(position_field="pagination.page", size_field="pagination.pageSize", in_body=True),
+    "/api/v2/cost/allocation": PageStyle(position_field="pageToken", size_field="pageSize", by_cursor=True),
+}
+
+
+class PaginationError(Exception):
+    """Raised by the page iterators when a page cannot be fetched."""
+
+    def __init__(self, page: int, error: Dict[str, Any]):
+        self.page = page
+        self.error = error
+        super().__init__(f"page {page}: {error.get('error')}")
+
+
+def _set_field(target: Dict[str, Any], dotted: str, value: Any) -> None:
+    *parents, last = dotted.split(".")
+    for part in parents:
+        target = target.setdefault(part, {})
+    target[last] = value
+
+
+def _get_field(source: Dict[str, Any], dotted: str) -> Any:
+    for part in dotted.split("."):
+        if not isinstance(source, dict):
+            return None
+        source = source.get(part)
+    return source
+
+
+def _find_meta(response: Any, fields: Tuple[str, ...], kind: type) -> Any:
+    if not isinstance(response, dict):
+        return None
+    containers = [response] + [response[c] for c in _META_CONTAINERS if isinstance(response.get(c), dict)]
+    for container in containers:
+        for field in fields:
+            value = container.get(field)
+            if isinstance(value, kind) and not isinstance(value, bool) and value != "":
+                return value
+    return None
+
+
+def find_items(response: Any) -> Optional[Tuple[Dict[str, Any], str]]:
+    """
+    Locate the list of items in a page.
+
+    Looks for list values at the top level of the response and one level down
+    (e.g. data.services) and picks the longest one.
+
+    Args:
+        response: Parsed page
+
+    Returns:
+        Tuple of (containing dict, key) or None if the page holds no list
+    """
+    if not isinstance(response, dict):
+        return None
+    candidates = []
+    for key, value in response.items():
+        if isinstance(value, list):
+            candidates.append((response, key))
+        elif isinstance(value, dict):
+            candidates.extend((value, k) for k, v in value.items() if isinstance(v, list))
+    if not candidates:
+        return None
+    return max(candidates, key=lambda c: len(c[0][c[1]]))
+
+
+def page_items(response: Any) -> List[Any]:
+    """
+    Return the items of a page.
+
+    Args:
+        response: Parsed page
+
+    Returns:
+        The page's item list, or an empty list if it holds none
+    """
+    located = find_items(response)
+    return located[0][located[1]] if located else []
+
+
+def find_total(response: Any) -> Optional[int]:
+    """
+    Return the total number of items a paginated response reports, if any.
+
+    Args:
+        response: Parsed first page
+
+    Returns:
+        The total, or None if the response does not report one
+    """
+    return _find_meta(response, _TOTAL_FIELDS, int)
+
+
+def find_next_cursor(response: Any) -> Optional[str]:
+    """
+    Return the cursor of the page after this one, if any.
+
+    Args:
+        response: Parsed page
+
+    Returns:
+        The cursor, or None on the last page
+    """
+    return _find_meta(response, _CURSOR_FIELDS, str)
+
+
+class _Pager:
+    """Builds and sends the request for one page of an endpoint."""
+
+    def __init__(
+        self,
+        path: str,
+        style: Optional[PageStyle],
+        method: str,
+        params: Optional[Dict[str, Any]],
+        data: Optional[Dict[str, Any]],
+        page_size: Optional[int],
+    ):
+        self.path = path
+        self.style = style or PAGE_STYLES[path]
+        self.method = method
+        self.params = copy.deepcopy(params or {})
+        self.data = copy.deepcopy(data or {})
+        target = self.data if self.style.in_body else self.params
+        self.page_size = page_size or _get_field(target, self.style.size_field) or PAGINATION_PAGE_SIZE
+        self.start = _get_field(target, self.style.position_field)
+        if self.start is None and not self.style.by_cursor:
+            self.start = 0 if self.style.by_offset else 1
+
+    async def fetch(self, index: int, cursor: Optional[str] = None) -> Tuple[bool, Dict[str, Any]]:
+        """Fetch the page ``index`` pages after the starting one, or the page at ``cursor``."""
+        params, data = copy.deepcopy(self.params), copy.deepcopy(self.data)
+        target = data if self.style.in_body else params
+        _set_field(target, self.style.size_field, self.page_size)
+        if self.style.by_cursor:
+            position = cursor if index else self.start
+        elif self.style.by_offset:
+            position = self.start + index * self.page_size
+        else:
+            position = self.start + index
+        if position is not None:
+            _set_field(target, self.style.position_field, position)
+        return await make_api_request(self.path, method=self.method, params=params, data=data)
+
+    def remaining(self, total: Optional[int]) -> Optional[int]:
+        """Return how many of the ``total`` items lie at or after the starting position."""
+        if total is None or self.style.by_cursor:
+            return total
+        skipped = self.start if self.style.by_offset else (self.start - 1) * self.page_size
+        return max(0, total - skipped)
+
+
+async def iter_pages(
+    path: str,
+    method: str = "GET",
+    params: Optional[Dict[str, Any]] = None,
+    data: Optional[Dict[str, Any]] = None,
+    page_size: Optional[int] = None,
+    prefetch: int = 1,
+    style: Optional[PageStyle] = None,
+) -> AsyncIterator[List[Any]]:
+    """
+    Yield the items of a paginated endpoint one page at a time.
+
+    While the consumer processes a page, the next ``prefetch`` pages are already
+    being fetched, and only those pages are held in memory, so exports and
+    aggregations can walk any number of records. Iteration stops after a short
+    or empty page, once the reported total is reached, or when a cursor endpoint
+    returns no next cursor. Closing the iterator early cancels the prefetched
+    requests.
+
+    Args:
+        path: API path (without base URL)
+        method: HTTP method (default: GET)
+        params: Query parameters (optional)
+        data: JSON body (optional)
+        page_size: Items per page (defaults to the size already set in params or
+            data, or KOMODOR_PAGINATION_PAGE_SIZE)
+        prefetch: Pages fetched ahead of the consumer. Cursor endpoints always
+            prefetch one page, since each cursor arrives with the page before it
+        style: How the endpoint is paginated (defaults to PAGE_STYLES[path])
+
+    Yields:
+        The list of items of each page
+
+    Raises:
+        PaginationError: If a page cannot be fetched
+    """
+    pager = _Pager(path, style, method, params, data, page_size)
+    pending: Deque[Tuple[int, asyncio.Future]] = deque()
+    next_index = 0
+    total: Optional[int] = None
+    seen = 0
+
+    def schedule(cursor: Optional[str] = None) -> None:
+        nonlocal next_index
+        pending.append((next_index, asyncio.ensure_future(pager.fetch(next_index, cursor))))
+        next_index += 1
+
+    schedule()
+    try:
+        while pending:
+            index, request = pending.popleft()
+            success, page = await request
+            if not success:
+                raise PaginationError(index, page)
+
+            items = page_items(page)
+            seen += len(items)
+            if index == 0:
+                total = pager.remaining(find_total(page))
+            last = len(items) < pager.page_size or (total is not None and seen >= total)
+
+            if last:
+                for _, stale in pending:
+                    stale.cancel()
+                pending.clear()
+            elif pager.style.by_cursor:
+                cursor = find_next_cursor(page)
+                if cursor is not None:
+                    schedule(cursor)
+            else:
+                # Top up the pages in flight before handing this one to the consumer
+                while len(pending) < max(1, prefetch):
+                    if total is not None and next_index * pager.page_size >= total:
+                        break
+                    schedule()
+
+            yield items
+    finally:
+        for _, request in pending:
+            request.cancel()
+
+
+async def iter_items(
+    path: str,
+    method: str = "GET",
+    params: Optional[Dict[str, Any]] = None,
+    data: Optional[Dict[str, Any]] = None,
+    page_size: Optional[int] = None,
+    prefetch: int = 1,
+    style: Optional[PageStyle] = None,
+) -> AsyncIterator[Any]:
+    """
+    Yield the records of a paginated endpoint one at a time.
+
+    Takes the same arguments as iter_pages, which it wraps.
+
+    Yields:
+        Each record of each page, in order
+
+    Raises:
+        PaginationError: If a page cannot be fetched
+    """
+    pages = iter_pages(path, method, params, data, page_size, prefetch, style)
+    try:
+        async for items in pages:
+            for item in items:
+                yield item
+    finally:
+        await pages.aclose()
+
+
+async def fetch_all_pages(
+    path: str,
+    max_items: int,
+    method: str = "GET",
+    params: Optional[Dict[str, Any]] = None,
+    data: Optional[Dict[str, Any]] = None,
+    page_size: Optional[int] = None,
+    concurrency: int = PAGINATION_CONCURRENCY,
+    style: Optional[PageStyle] = None,
+) -> Tuple[bool, Dict[str, Any]]:
+    """
+    Fetch up to max_items across pages and merge them into one response.
+
+    The first page is fetched on its own. If it reports a total, the remaining
+    pages are fetched concurrently (at most ``concurrency`` at a time).
+    Otherwise pages are fetched in concurrent windows until a short or empty
+    page is seen. Cursor endpoints are walked one page at a time. The merged
+    response is the first page with its item list replaced by the items of all
+    pages, plus an ``autoPagination`` summary.
+
+    Args:
+        path: API path (without base URL)
+        max_items: Maximum number of items to return
+        method: HTTP method (default: GET)
+        params: Query parameters (optional)
+        data: JSON body (optional)
+        page_size: Items per page (defaults to the size already set in params or
+            data, or KOMODOR_PAGINATION_PAGE_SIZE)
+        concurrency: Maximum pages fetched in parallel
+        style: How the endpoint is paginated (defaults to PAGE_STYLES[path])
+
+    Returns:
+        Tuple of (success, data) where data is the merged response or an error dict
+
+    Raises:
+        ValueError: If max_items is not positive
+    """
+    if max_items <= 0:
+        raise ValueError(f"max_items must be positive, got {max_items}")
+    pager = _Pager(path, style, method, params, data, page_size)
+    max_pages = max(1, math.ceil(max_items / pager.page_size))
+
+    success, first = await pager.fetch(0)
+    if not success:
+        return success, first
+    located = find_items(first)
+    if located is None:
+        logger.warning("No item list found in %s response, returning the first page only", path)
+        return success, first
+    container, key = located
+
+    items: List[Any] = list(container[key])
+    total = find_total(first)
+    # Items from the starting position on, which is what a request that starts mid-list can return
+    remaining = pager.remaining(total)
+    if remaining is not None and len(items) < min(pager.page_size, remaining) and not pager.style.by_cursor:
+        # The server capped the page size; page by what it actually returns
+        pager.page_size = max(1, len(items))
+        max_pages = max(1, math.ceil(max_items / pager.page_size))
+        remaining = pager.remaining(total)
+    if remaining is not None:
+        max_pages = min(max_pages, math.ceil(remaining / pager.page_size))
+
+    errors: List[str] = []
+    # Pages whose items were merged; pages fetched past the last one are not counted
+    pages_merged = 1
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def bounded_fetch(index: int) -> Tuple[bool, Dict[str, Any]]:
+        async with semaphore:
+            return await pager.fetch(index)
+
+    def collect(results: List[Tuple[bool, Dict[str, Any]]], first_index: int) -> bool:
+        """Append pages in order; return False once the last page has been reached."""
+        nonlocal pages_merged
+        for offset, (page_success, page) in enumerate(results):
+            if not page_success:
+                errors.append(f"page {first_index + offset}: {page.get('error')}")
+                return False
+            fetched = page_items(page)
+            items.extend(fetched)
+            pages_merged += 1
+            if len(fetched) < pager.page_size:
+                return False
+        return True
+
+    index = 1
+    more = len(items) >= pager.page_size
+    if pager.style.by_cursor:
+        page = first
+        while more and index < max_pages:
+            cursor = find_next_cursor(page)
+            if cursor is None:
+                more = False
+                break
+            page_success, page = await pager.fetch(index, cursor)
+            more = collect([(page_success, page)], index)
+            index += 1
+    else:
+        # With a known total every remaining page is requested at once; otherwise
+        # pages are probed in windows until one comes back short
+        window_size = max_pages if total is not None else max(1, concurrency)
+        while more and index < max_pages:
+            window = list(range(index, min(index + window_size, max_pages)))
+            more = collect(await asyncio.gather(*(bounded_fetch(i) for i in window)), index)
+            index += len(window)
+
+    truncated = (
+        len(items) > max_items
+        or (remaining is not None and remaining > max_items)
+        or (more and total is None)
+        or bool(errors)
+    )
+    summary = {"pagesFetched": pages_merged, "items": min(len(items), max_items), "total": total, "truncated": truncated}
+    if errors:
+        summary["errors"] = errors
+
+    merged = dict(first)
+    if container is first:
+        merged[key] = items[:max_items]
+    else:
+        parent = next(k for k, v in first.items() if v is container)
+        merged[parent] = {**container, key: items[:max_items]}
+    merged["autoPagination"] = summary
+    return True, merged
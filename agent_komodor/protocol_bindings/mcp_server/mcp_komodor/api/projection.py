@@ -0,0 +1,372 @@
+"""Field projection, token budgets and tabular encoding of tool responses"""
+
+import copy
+import itertools
+import json
+import logging
+import os
+import re
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from mcp_komodor.api.pagination import find_items
+
+logger = logging.getLogger("mcp_komodor")
+
+# Budget applied when a tool call does not pass max_tokens; 0 returns responses in full
+DEFAULT_MAX_TOKENS = int(os.getenv("KOMODOR_TOOL_MAX_TOKENS", "0"))
+
+# Encoding of list results when a tool call does not pass output_format: "json" or "table"
+OUTPUT_FORMATS = ("json", "table")
+DEFAULT_OUTPUT_FORMAT = os.getenv("KOMODOR_TOOL_OUTPUT_FORMAT", "json").lower()
+
+# Rough size of a token in characters of compact JSON
+CHARS_PER_TOKEN = 4
+
+# Item fields kept when low-signal fields have to be dropped to fit the budget
+HIGH_SIGNAL_FIELDS = re.compile(
+    r"(status|state|phase|severity|reason|message|error|health|"
+    r"time|timestamp|date|epoch|createdat|updatedat|lastseen|firstseen|"
+    r"name$|namespace|cluster|kind|^type$|^id$|uid|count$)",
+    re.IGNORECASE,
+)
+
+# Strings are never cut below this many characters
+_MIN_STRING_CHARS = 200
+_TRUNCATION_MARKER = "\n... [{} characters elided] ...\n"
+
+
+def estimate_tokens(value: Any) -> int:
+    """
+    Estimate the tokens a value takes up in the model's context.
+
+    Uses the length of its compact JSON encoding, which is deterministic and
+    does not depend on the model's tokenizer.
+
+    Args:
+        value: JSON-serializable value
+
+    Returns:
+        Estimated token count
+    """
+    text = value if isinstance(value, str) else json.dumps(value, separators=(",", ":"), default=str)
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def _select(value: Any, path: List[str]) -> Any:
+    """Return the part of value under path, mapping over lists; None if absent."""
+    if not path:
+        return value
+    if isinstance(value, list):
+        # Keep list positions, with an empty record for items that lack the field
+        return [{} if (selected := _select(item, path)) is None else selected for item in value]
+    if isinstance(value, dict) and path[0] in value:
+        selected = _select(value[path[0]], path[1:])
+        return None if selected is None else {path[0]: selected}
+    return None
+
+
+def _merge_item(target: Any, source: Any) -> Any:
+    """Merge two selections of the same list element."""
+    if isinstance(target, dict) and isinstance(source, dict):
+        return _merge(target, source)
+    return source if target is None else target
+
+
+def _merge(target: Dict[str, Any], source: Dict[str, Any]) -> Dict[str, Any]:
+    for key, value in source.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _merge(target[key], value)
+        elif isinstance(value, list) and isinstance(target.get(key), list):
+            target[key] = [_merge_item(t, s) for t, s in itertools.zip_longest(target[key], value)]
+        else:
+            target[key] = value
+    return target
+
+
+def project(value: Any, fields: List[str]) -> Any:
+    """
+    Keep only the selected fields of a record.
+
+    Args:
+        value: Record to project
+        fields: Dotted field names, e.g. ["name", "metadata.namespace"];
+            names that go through a list apply to each of its elements
+
+    Returns:
+        The record with only the selected fields, or the value unchanged if it is not a dict
+    """
+    if not isinstance(value, dict):
+        return value
+    projected: Dict[str, Any] = {}
+    for field in fields:
+        selected = _select(value, field.split("."))
+        if selected is not None:
+            _merge(projected, selected)
+    return projected
+
+
+def project_response(response: Dict[str, Any], fields: List[str]) -> Dict[str, Any]:
+    """
+    Apply a field selection to a response.
+
+    When the response holds a list of items, the selection applies to each item
+    and the rest of the response (totals, pagination) is kept as is. Otherwise
+    it applies to the response itself.
+
+    Args:
+        response: Parsed API response
+        fields: Dotted field names to keep
+
+    Returns:
+        The projected response
+    """
+    located = find_items(response)
+    if located is None:
+        return project(response, fields)
+    container, key = located
+    items = [project(item, fields) for item in container[key]]
+    if container is response:
+        return {**response, key: items}
+    parent = next(k for k, v in response.items() if v is container)
+    return {**response, parent: {**container, key: items}}
+
+
+def _walk(value: Any, path: Tuple[Any, ...] = ()):
+    """Yield (path, value) for every node under value, depth first in key order."""
+    yield path, value
+    if isinstance(value, dict):
+        for key, child in value.items():
+            yield from _walk(child, path + (key,))
+    elif isinstance(value, list):
+        for index, child in enumerate(value):
+            yield from _walk(child, path + (index,))
+
+
+def _format_path(path: Tuple[Any, ...]) -> str:
+    return ".".join("[]" if isinstance(part, int) else str(part) for part in path).replace(".[]", "[]") or "$"
+
+
+def _record_lists(value: Any) -> List[List[Dict[str, Any]]]:
+    return [node for _, node in _walk(value) if isinstance(node, list) and any(isinstance(i, dict) for i in node)]
+
+
+def _filter_record(record: Dict[str, Any], prefix: str, dropped: Set[str]) -> Dict[str, Any]:
+    """Return the high-signal fields of a record, descending into nested objects."""
+    kept: Dict[str, Any] = {}
+    for key, value in record.items():
+        if HIGH_SIGNAL_FIELDS.search(key):
+            kept[key] = value
+        elif isinstance(value, dict) and (nested := _filter_record(value, f"{prefix}{key}.", dropped)):
+            kept[key] = nested
+        else:
+            dropped.add(f"{prefix}{key}")
+    return kept
+
+
+def _drop_low_signal_fields(value: Any) -> Set[str]:
+    """Reduce records in lists to their high-signal fields, in place."""
+    dropped: Set[str] = set()
+    for records in _record_lists(value):
+        records[:] = [_filter_record(r, "", dropped) if isinstance(r, dict) else r for r in records]
+    return dropped
+
+
+def _truncate_strings(value: Any, max_chars: int) -> Any:
+    """Return value with strings longer than max_chars cut down, keeping their head and tail."""
+    if isinstance(value, str) and len(value) > max_chars:
+        # Keep more of the head; the tail often holds the most recent lines or, in YAML, the status
+        head = max_chars * 2 // 3
+        tail = max_chars - head
+        return value[:head] + _TRUNCATION_MARKER.format(len(value) - max_chars) + value[len(value) - tail :]
+    if isinstance(value, dict):
+        return {k: _truncate_strings(v, max_chars) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_truncate_strings(v, max_chars) for v in value]
+    return value
+
+
+def _largest_fitting(low: int, high: int, fits) -> int:
+    """Return the largest n in [low, high] for which fits(n) holds, or low."""
+    while low < high:
+        middle = (low + high + 1) // 2
+        if fits(middle):
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def summarize(response: Dict[str, Any], max_tokens: int) -> Dict[str, Any]:
+    """
+    Shrink a response to fit a token budget.
+
+    The same response and budget always produce the same summary. Each step is
+    applied only while the response is still over budget:
+
+    1. Fields of records in lists that carry little signal are dropped; status,
+       severity, reason, message, timestamps, names and identifiers are kept.
+    2. Long strings such as manifests are cut in the middle, keeping their head
+       and tail.
+    3. Trailing records of the longest list are dropped.
+
+    What was removed is reported under an ``elided`` key.
+
+    Args:
+        response: Parsed API response
+        max_tokens: Token budget for the returned response
+
+    Returns:
+        The response, unchanged if it already fits
+    """
+    original_tokens = estimate_tokens(response)
+    if original_tokens <= max_tokens or not isinstance(response, dict):
+        return response
+
+    elided: Dict[str, Any] = {"originalTokens": original_tokens}
+    # Leave room for the elided report itself
+    budget = max(1, max_tokens - 60)
+    summary = copy.deepcopy(response)
+
+    dropped = _drop_low_signal_fields(summary)
+    if dropped:
+        elided["droppedFields"] = sorted(dropped)
+
+    if estimate_tokens(summary) > budget:
+        long_strings = [
+            _format_path(path) for path, node in _walk(summary) if isinstance(node, str) and len(node) > _MIN_STRING_CHARS
+        ]
+        if long_strings:
+            longest = max(len(node) for _, node in _walk(summary) if isinstance(node, str))
+            max_chars = _largest_fitting(
+                _MIN_STRING_CHARS, longest, lambda n: estimate_tokens(_truncate_strings(summary, n)) <= budget
+            )
+            summary = _truncate_strings(summary, max_chars)
+            elided["truncatedStrings"] = sorted(set(long_strings))
+
+    if estimate_tokens(summary) > budget:
+        lists = _record_lists(summary) or [node for _, node in _walk(summary) if isinstance(node, list)]
+        if lists:
+            records = max(lists, key=estimate_tokens)
+            full = list(records)
+
+            def fits(count: int) -> bool:
+                records[:] = full[:count]
+                return estimate_tokens(summary) <= budget
+
+            kept = _largest_fitting(0, len(full), fits)
+            records[:] = full[:kept]
+            elided["droppedItems"] = len(full) - kept
+
+    elided["returnedTokens"] = estimate_tokens(summary)
+    logger.debug("Summarized response from %d to %d tokens", original_tokens, elided["returnedTokens"])
+    summary["elided"] = elided
+    return summary
+
+
+def _flatten(record: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+    flat: Dict[str, Any] = {}
+    for key, value in record.items():
+        if isinstance(value, dict) and value:
+            flat.update(_flatten(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def _cell(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        text = str(value).lower()
+    elif isinstance(value, (list, dict)):
+        text = json.dumps(value, separators=(",", ":"), default=str)
+    else:
+        text = str(value)
+    return text.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n")
+
+
+def to_table(records: List[Any]) -> str:
+    """
+    Encode a list of records as tab-separated text with a header row.
+
+    Nested objects are flattened into dotted column names, other nested values
+    are written as compact JSON, missing values are left empty and tabs and
+    newlines inside values are escaped. Columns appear in the order they are
+    first seen.
+
+    Args:
+        records: List of records
+
+    Returns:
+        Header line followed by one line per record
+    """
+    rows = [_flatten(r) if isinstance(r, dict) else {"value": r} for r in records]
+    columns: Dict[str, None] = {}
+    for row in rows:
+        columns.update(dict.fromkeys(row))
+    lines = ["\t".join(columns)]
+    lines.extend("\t".join(_cell(row.get(column)) for column in columns) for row in rows)
+    return "\n".join(lines)
+
+
+def tabulate_response(response: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Replace the list of items in a response with a table.
+
+    Every record repeats its keys in JSON, so on large lists a header row plus
+    value rows takes a fraction of the tokens. The rest of the response is kept
+    and ``outputFormat`` tells the model how to read the items.
+
+    Args:
+        response: Parsed API response
+
+    Returns:
+        The response with its item list encoded by to_table, or the response
+        unchanged if it has no list of records
+    """
+    located = find_items(response)
+    if located is None or not any(isinstance(item, dict) for item in located[0][located[1]]):
+        return response
+    container, key = located
+    table = to_table(container[key])
+    if container is response:
+        tabulated = {**response, key: table}
+    else:
+        parent = next(k for k, v in response.items() if v is container)
+        tabulated = {**response, parent: {**container, key: table}}
+    tabulated["outputFormat"] = "table: tab-separated values, header row first"
+    return tabulated
+
+
+def shape_response(
+    response: Dict[str, Any],
+    fields: Optional[List[str]] = None,
+    max_tokens: Optional[int] = None,
+    output_format: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Apply a tool call's field selection, token budget and output format to its response.
+
+    The token budget is applied to the JSON form, before the items are encoded
+    as a table.
+
+    Args:
+        response: Parsed API response
+        fields: Dotted field names to keep (optional)
+        max_tokens: Token budget (defaults to KOMODOR_TOOL_MAX_TOKENS; 0 disables)
+        output_format: "json" or "table" (defaults to KOMODOR_TOOL_OUTPUT_FORMAT)
+
+    Returns:
+        The shaped response, or an error dict for an unknown output format
+    """
+    output_format = (output_format or DEFAULT_OUTPUT_FORMAT).lower()
+    if output_format not in OUTPUT_FORMATS:
+        return {"error": f"Unknown output_format '{output_format}', expected one of {', '.join(OUTPUT_FORMATS)}"}
+    if fields:
+        response = project_response(response, fields)
+    max_tokens = DEFAULT_MAX_TOKENS if max_tokens is None else max_tokens
+    if max_tokens:
+        response = summarize(response, max_tokens)
+    if output_format == "table":
+        response = tabulate_response(response)
+    return response
@@ -0,0 +1,171 @@
+"""Client-side rate limiting of API requests per endpoint family"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger("mcp_komodor")
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """
+    Budget for one endpoint family.
+
+    Attributes:
+        rate: Requests per second sustained over time
+        burst: Requests that may be sent back to back after an idle period
+    """
+
+    rate: float
+    burst: int
+
+
+RATE_LIMITING_ENABLED = os.getenv("KOMODOR_RATE_LIMIT_ENABLED", "true").lower() == "true"
+
+# Budgets keyed by path prefix; the longest matching prefix wins
+RATE_LIMITS: Dict[str, RateLimit] = {
+    "/api/v2/": RateLimit(rate=10, burst=20),
+    "/mgmt/v1/": RateLimit(rate=5, burst=10),
+}
+
+
+def _load_rate_limits_from_env() -> None:
+    """
+    Apply budgets from KOMODOR_RATE_LIMITS.
+
+    The variable holds a JSON object mapping path prefixes to RateLimit fields,
+    e.g. {"/api/v2/": {"rate": 20, "burst": 40}}.
+    """
+    raw = os.getenv("KOMODOR_RATE_LIMITS")
+    if not raw:
+        return
+    try:
+        for prefix, fields in json.loads(raw).items():
+            RATE_LIMITS[prefix] = RateLimit(**fields)
+    except (ValueError, TypeError, AttributeError) as e:
+        logger.error("Ignoring invalid KOMODOR_RATE_LIMITS: %s", e)
+
+
+_load_rate_limits_from_env()
+
+# Queue statistics per endpoint family, kept across limiter instances
+_stats: Dict[str, Dict[str, float]] = defaultdict(
+    lambda: {"requests": 0, "queued": 0, "total_wait_seconds": 0.0, "max_wait_seconds": 0.0}
+)
+
+
+class TokenBucket:
+    """
+    Token bucket that queues callers in FIFO order until a token is available.
+
+    Callers wait on an asyncio.Lock, which wakes waiters in arrival order, and
+    the caller holding the lock sleeps until the next token is due. A burst of
+    callers is therefore served first come, first served instead of racing for
+    tokens.
+    """
+
+    def __init__(self, family: str, limit: RateLimit):
+        self.family = family
+        self.limit = limit
+        self._tokens = float(limit.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self.waiting = 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.limit.burst, self._tokens + (now - self._updated) * self.limit.rate)
+        self._updated = now
+
+    async def acquire(self) -> float:
+        """
+        Wait for a token.
+
+        Returns:
+            Seconds spent queueing
+        """
+        start = time.monotonic()
+        self.waiting += 1
+        try:
+            async with self._lock:
+                self._refill()
+                if self._tokens < 1:
+                    await asyncio.sleep((1 - self._tokens) / self.limit.rate)
+                    self._refill()
+                self._tokens -= 1
+        finally:
+            self.waiting -= 1
+
+        waited = time.monotonic() - start
+        stats = _stats[self.family]
+        stats["requests"] += 1
+        if waited > 0.001:
+            stats["queued"] += 1
+            stats["total_wait_seconds"] += waited
+            stats["max_wait_seconds"] = max(stats["max_wait_seconds"], waited)
+        return waited
+
+
+class RateLimiter:
+    """Token buckets for every configured endpoint family."""
+
+    def __init__(self, limits: Dict[str, RateLimit]):
+        self._buckets = {prefix: TokenBucket(prefix, limit) for prefix, limit in limits.items()}
+
+    def bucket_for(self, path: str) -> Optional[TokenBucket]:
+        """
+        Return the bucket for an API path.
+
+        Args:
+            path: API path (without base URL)
+
+        Returns:
+            The bucket with the longest matching prefix, or None if the path is not limited
+        """
+        matches = [prefix for prefix in self._buckets if path.startswith(prefix)]
+        if not matches:
+            return None
+        return self._buckets[max(matches, key=len)]
+
+    async def acquire(self, path: str) -> float:
+        """
+        Wait until a request to the path fits its family's budget.
+
+        Args:
+            path: API path (without base URL)
+
+        Returns:
+            Seconds spent queueing
+        """
+        bucket = self.bucket_for(path)
+        if bucket is None:
+            return 0.0
+        waited = await bucket.acquire()
+        if waited > 0.001:
+            logger.debug("Rate limited %s for %.3fs (%s)", path, waited, bucket.family)
+        return waited
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Return queue statistics per endpoint family.
+
+        Returns:
+            Dict keyed by path prefix with the configured budget, requests
+            admitted, requests that had to queue, total and maximum queue wait
+            in seconds and the number of callers currently waiting
+        """
+        return {
+            prefix: {
+                "rate": bucket.limit.rate,
+                "burst": bucket.limit.burst,
+                **_stats[prefix],
+                "waiting": bucket.waiting,
+            }
+            for prefix, bucket in self._buckets.items()
+        }
@@ -0,0 +1,141 @@
+"""Retry policy for idempotent API requests"""
+
+import json
+import logging
+import os
+import random
+import time
+from dataclasses import dataclass, field, replace
+from email.utils import parsedate_to_datetime
+from typing import Dict, FrozenSet, Optional
+
+logger = logging.getLogger("mcp_komodor")
+
+# Statuses worth retrying: throttling and transient upstream failures
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    How often and how long to retry an idempotent request.
+
+    Attributes:
+        max_attempts: Total attempts including the first one (1 disables retries)
+        base_delay: Backoff before the first retry in seconds, doubled per retry
+        max_delay: Upper bound for a single backoff in seconds
+        deadline: Budget in seconds for all attempts and backoffs of one call
+        retry_statuses: HTTP statuses that are retried
+    """
+
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+    deadline: float = 60.0
+    retry_statuses: FrozenSet[int] = field(default=RETRYABLE_STATUSES)
+
+    def backoff(self, retry: int) -> float:
+        """
+        Return a randomized backoff before the given retry.
+
+        Uses "full jitter": a uniform delay between 0 and the exponential backoff,
+        which spreads out retries from concurrent callers.
+
+        Args:
+            retry: Number of the retry, starting at 1
+
+        Returns:
+            Delay in seconds
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (retry - 1)))
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy(
+    max_attempts=int(os.getenv("KOMODOR_RETRY_MAX_ATTEMPTS", "3")),
+    base_delay=float(os.getenv("KOMODOR_RETRY_BASE_DELAY", "0.5")),
+    max_delay=float(os.getenv("KOMODOR_RETRY_MAX_DELAY", "8")),
+    deadline=float(os.getenv("KOMODOR_RETRY_DEADLINE", "60")),
+)
+
+# Used for requests that must not be repeated
+NO_RETRY = RetryPolicy(max_attempts=1, deadline=float("inf"))
+
+# Per-endpoint overrides keyed by path prefix; the longest matching prefix wins
+RETRY_POLICY_OVERRIDES: Dict[str, RetryPolicy] = {
+    # Key validation should report a bad key immediately rather than after backoffs
+    "/mgmt/v1/apikey/validate": replace(DEFAULT_RETRY_POLICY, max_attempts=1),
+}
+
+
+def _load_overrides_from_env() -> None:
+    """
+    Apply overrides from KOMODOR_RETRY_OVERRIDES.
+
+    The variable holds a JSON object mapping path prefixes to RetryPolicy fields,
+    e.g. {"/api/v2/services/search": {"max_attempts": 5, "deadline": 90}}.
+    """
+    raw = os.getenv("KOMODOR_RETRY_OVERRIDES")
+    if not raw:
+        return
+    try:
+        for prefix, fields in json.loads(raw).items():
+            RETRY_POLICY_OVERRIDES[prefix] = replace(DEFAULT_RETRY_POLICY, **fields)
+    except (ValueError, TypeError, AttributeError) as e:
+        logger.error("Ignoring invalid KOMODOR_RETRY_OVERRIDES: %s", e)
+
+
+_load_overrides_from_env()
+
+
+def get_retry_policy(path: str) -> RetryPolicy:
+    """
+    Return the retry policy for an API path.
+
+    Args:
+        path: API path (without base URL)
+
+    Returns:
+        The override with the longest matching prefix, or the default policy
+    """
+    matches = [prefix for prefix in RETRY_POLICY_OVERRIDES if path.startswith(prefix)]
+    if not matches:
+        return DEFAULT_RETRY_POLICY
+    return RETRY_POLICY_OVERRIDES[max(matches, key=len)]
+
+
+def is_idempotent(method: str, path: str) -> bool:
+    """
+    Return whether a request can safely be sent more than once.
+
+    GET requests and POSTs to search endpoints only read data.
+
+    Args:
+        method: HTTP method
+        path: API path (without base URL)
+
+    Returns:
+        True if the request may be retried
+    """
+    return method == "GET" or (method == "POST" and path.rstrip("/").endswith("/search"))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header.
+
+    Args:
+        value: Header value, either delay seconds or an HTTP date
+
+    Returns:
+        Delay in seconds, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,42 @@
+"""
+Request cancellation support.
+
+When a client sends ``notifications/cancelled`` for a tool call, the MCP SDK
+cancels the task handling the request, which cancels the tool and its in-flight
+Komodor API requests. Before mcp 1.12.3 the resulting ``CancelledError`` escapes
+the request's task and takes down the whole session, so a client that cancels a
+single call loses its connection to the server. ``handle_cancelled_requests``
+ends cancelled requests quietly instead, as newer SDK versions do.
+"""
+
+import functools
+import logging
+from typing import Any
+
+import anyio
+from mcp.server.fastmcp import FastMCP
+from mcp.shared.session import RequestResponder
+
+logger = logging.getLogger("mcp_komodor")
+
+
+def handle_cancelled_requests(mcp: FastMCP) -> None:
+    """
+    Keep the session running when the client cancels a request.
+
+    Args:
+        mcp: Server whose request handling to wrap
+    """
+    server = mcp._mcp_server
+    handle_message = server._handle_message
+
+    @functools.wraps(handle_message)
+    async def wrapper(message: Any, *args: Any, **kwargs: Any) -> None:
+        try:
+            await handle_message(message, *args, **kwargs)
+        except anyio.get_cancelled_exc_class():
+            if not (isinstance(message, RequestResponder) and message.cancelled):
+                raise
+            logger.info("Request %s cancelled by the client", message.request_id)
+
+    server._handle_message = wrapper
@@ -0,0 +1,98 @@
+"""Logging setup for the MCP server"""
+
+import json
+import logging
+import os
+import random
+import sys
+from typing import Any, Optional
+
+from mcp_komodor.api import codec
+
+LOG_LEVEL = os.getenv("MCP_LOG_LEVEL", "INFO").upper()
+# "text" for human-readable lines, "json" for one JSON object per line
+LOG_FORMAT = os.getenv("MCP_LOG_FORMAT", "text").lower()
+# Longest request or response payload written to a log line, in characters
+LOG_PAYLOAD_LIMIT = int(os.getenv("MCP_LOG_PAYLOAD_LIMIT", "512"))
+# Share of API requests whose per-request debug lines are written
+LOG_SAMPLE_RATE = float(os.getenv("MCP_LOG_SAMPLE_RATE", "1.0"))
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+# Libraries that log every request at DEBUG level
+_NOISY_LOGGERS = ("httpx", "httpcore", "hpack")
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as single-line JSON objects."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class Payload:
+    """
+    Defer rendering a payload until a log record is actually emitted.
+
+    Pass it as a %-style argument, e.g. ``logger.debug("Request data: %s",
+    Payload(data))``. The payload is only encoded when the line passes the level
+    check, and is cut to LOG_PAYLOAD_LIMIT characters.
+    """
+
+    __slots__ = ("value", "limit")
+
+    def __init__(self, value: Any, limit: Optional[int] = None):
+        self.value = value
+        self.limit = LOG_PAYLOAD_LIMIT if limit is None else limit
+
+    def __str__(self) -> str:
+        text = self.value if isinstance(self.value, str) else codec.dumps_str(self.value)
+        if len(text) <= self.limit:
+            return text
+        return f"{text[:self.limit]}... ({len(text) - self.limit} more characters)"
+
+
+def sample_request(logger: logging.Logger) -> bool:
+    """
+    Decide whether to write the per-request debug lines of one API request.
+
+    Args:
+        logger: Logger the request's debug lines go to
+
+    Returns:
+        True if DEBUG is enabled for the logger and the request falls within
+        LOG_SAMPLE_RATE
+    """
+    return logger.isEnabledFor(logging.DEBUG) and (LOG_SAMPLE_RATE >= 1 or random.random() < LOG_SAMPLE_RATE)
+
+
+def configure_logging(level: Optional[str] = None) -> None:
+    """
+    Set up logging for the server process.
+
+    Logs go to stderr, since in stdio mode stdout carries the MCP protocol.
+    HTTP client libraries are kept at WARNING unless the level is DEBUG.
+
+    Args:
+        level: Log level name (defaults to MCP_LOG_LEVEL)
+    """
+    level = (level or LOG_LEVEL).upper()
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(JsonFormatter() if LOG_FORMAT == "json" else logging.Formatter(TEXT_FORMAT))
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level)
+
+    for name in _NOISY_LOGGERS:
+        logging.getLogger(name).setLevel(logging.DEBUG if level == "DEBUG" else logging.WARNING)
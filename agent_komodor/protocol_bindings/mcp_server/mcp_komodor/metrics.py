@@ -0,0 +1,119 @@
+"""Prometheus metrics for tool calls and Komodor API requests"""
+
+import contextvars
+import logging
+import os
+from typing import Optional
+
+logger = logging.getLogger("mcp_komodor")
+
+try:
+    import prometheus_client
+except ImportError:
+    prometheus_client = None
+
+METRICS_ENABLED = prometheus_client is not None and os.getenv("MCP_METRICS_ENABLED", "true").lower() == "true"
+
+# Tool whose call is in progress, so API requests can be attributed to it
+current_tool: contextvars.ContextVar[str] = contextvars.ContextVar("current_tool", default="none")
+
+# Same estimate as mcp_komodor.api.projection.estimate_tokens
+CHARS_PER_TOKEN = 4
+
+_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+_PARSE_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25)
+_SIZE_BUCKETS = tuple(2**n for n in range(8, 25, 2))
+_RETRY_BUCKETS = (0, 1, 2, 3, 5, 8)
+
+if METRICS_ENABLED:
+    TOOL_DURATION = prometheus_client.Histogram(
+        "komodor_mcp_tool_duration_seconds", "Duration of MCP tool calls", ["tool", "status"], buckets=_LATENCY_BUCKETS
+    )
+    TOOL_RESULT_TOKENS = prometheus_client.Histogram(
+        "komodor_mcp_tool_result_tokens", "Estimated tokens of MCP tool results", ["tool", "status"], buckets=_SIZE_BUCKETS
+    )
+    API_DURATION = prometheus_client.Histogram(
+        "komodor_api_request_duration_seconds",
+        "Duration of Komodor API requests including retries",
+        ["tool", "status"],
+        buckets=_LATENCY_BUCKETS,
+    )
+    API_RETRIES = prometheus_client.Histogram(
+        "komodor_api_request_retries", "Retries spent on Komodor API requests", ["tool", "status"], buckets=_RETRY_BUCKETS
+    )
+    API_RESPONSE_BYTES = prometheus_client.Histogram(
+        "komodor_api_response_bytes", "Size of Komodor API response bodies", ["tool", "status"], buckets=_SIZE_BUCKETS
+    )
+    API_PARSE_DURATION = prometheus_client.Histogram(
+        "komodor_api_response_parse_seconds", "Time spent parsing Komodor API responses", ["tool"], buckets=_PARSE_BUCKETS
+    )
+
+
+def observe_tool_call(tool: str, status: str, seconds: float, result: Optional[str]) -> None:
+    """
+    Record a finished tool call.
+
+    Args:
+        tool: Tool name
+        status: "success", "error" for an error result, "exception" or "cancelled"
+        seconds: Duration of the call
+        result: Serialized result, if the call returned one
+    """
+    if not METRICS_ENABLED:
+        return
+    TOOL_DURATION.labels(tool, status).observe(seconds)
+    if result is not None:
+        TOOL_RESULT_TOKENS.labels(tool, status).observe(len(result) / CHARS_PER_TOKEN)
+
+
+def observe_api_request(
+    status: str, seconds: float, attempts: Optional[int] = None, response_bytes: Optional[int] = None
+) -> None:
+    """
+    Record a finished API request, attributed to the current tool.
+
+    Args:
+        status: HTTP status code, or the kind of failure (e.g. "timeout")
+        seconds: Duration including retries and backoff
+        attempts: Attempts made, if known
+        response_bytes: Size of the final response body, if one was received
+    """
+    if not METRICS_ENABLED:
+        return
+    tool = current_tool.get()
+    API_DURATION.labels(tool, status).observe(seconds)
+    if attempts is not None:
+        API_RETRIES.labels(tool, status).observe(max(0, attempts - 1))
+    if response_bytes is not None:
+        API_RESPONSE_BYTES.labels(tool, status).observe(response_bytes)
+
+
+def observe_parse(seconds: float) -> None:
+    """
+    Record the time spent parsing a response body, attributed to the current tool.
+
+    Args:
+        seconds: Parse duration
+    """
+    if METRICS_ENABLED:
+        API_PARSE_DURATION.labels(current_tool.get()).observe(seconds)
+
+
+def register_metrics_route(mcp) -> None:
+    """
+    Serve the metrics at /metrics on the server's HTTP app (SSE mode).
+
+    Args:
+        mcp: FastMCP server
+    """
+    if not METRICS_ENABLED:
+        if prometheus_client is None:
+            logger.info("prometheus_client is not installed, /metrics is disabled")
+        return
+
+    from starlette.requests import Request
+    from starlette.responses import Response
+
+    @mcp.custom_route("/metrics", methods=["GET"], include_in_schema=False)
+    async def metrics(request: Request) -> Response:
+        return Response(prometheus_client.generate_latest(), media_type=prometheus_client.CONTENT_TYPE_LATEST)
@@ -0,0 +1,312 @@
+"""
+Declarative registry of the tools exposed by the MCP server.
+
+Tool schemas are served from a prebuilt manifest, and the module implementing a
+tool is only imported the first time that tool is called. This keeps the
+server's cold start independent of the number of tool modules. ``tools/list``
+is answered from the same manifest without introspecting any function.
+
+The manifest is keyed by a hash of the tool sources. A missing or stale
+manifest is rebuilt at startup (importing every tool module once) and written
+back when the package directory is writable. Regenerate it at build time with:
+
+    python -m mcp_komodor.registry
+"""
+
+import asyncio
+import functools
+import hashlib
+import importlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp.tools import Tool
+from mcp.server.fastmcp.utilities.func_metadata import FuncMetadata
+from mcp.types import Tool as MCPTool
+from pydantic import Field, PrivateAttr
+
+from mcp_komodor import metrics, tracing
+from mcp_komodor.api import codec
+
+logger = logging.getLogger("mcp_komodor")
+
+TOOLS_PACKAGE = "mcp_komodor.tools"
+TOOLS_DIR = Path(__file__).with_name("tools")
+MANIFEST_PATH = Path(__file__).with_name("tool_manifest.json")
+# Bump when the manifest layout changes
+MANIFEST_VERSION = 1
+
+# (module in mcp_komodor.tools, function) for every registered tool
+TOOLS: List[Tuple[str, str]] = [
+    ("api_v2_services_search", "post_api_v2_services_search"),
+    ("api_v2_jobs_search", "post_api_v2_jobs_search"),
+    ("api_v2_service_yaml", "get_api_v2_service_yaml"),
+    ("api_v2_services_issues_search", "post_api_v2_services_issues_search"),
+    ("api_v2_clusters_issues_search", "post_api_v2_clusters_issues_search"),
+    ("api_v2_services_k8s_events_search", "post_api_v2_services_k8s_events_search"),
+    ("api_v2_clusters_k8s_events_search", "post_api_v2_clusters_k8s_events_search"),
+    ("api_v2_rbac_kubeconfig", "get_api_v2_rbac_kubeconfig"),
+    ("api_v2_clusters", "get_api_v2_clusters"),
+    ("api_v2_realtime_monitors_config", "get_api_v2_realtime_monitors_config"),
+    ("api_v2_realtime_monitors_config", "post_api_v2_realtime_monitors_config"),
+    ("api_v2_realtime_monitors_config_id", "get_api_v2_realtime_monitors_config_id"),
+    ("api_v2_realtime_monitors_config_id", "put_api_v2_realtime_monitors_config_id"),
+    ("api_v2_realtime_monitors_config_id", "delete_api_v2_realtime_monitors_config_id"),
+    ("api_v2_audit_log", "get_api_v2_audit_log"),
+    ("api_v2_audit_log_filters", "get_api_v2_audit_log_filters"),
+    ("api_v2_health_risks", "get_health_risks"),
+    ("api_v2_health_risks_id", "get_health_risk_data"),
+    ("api_v2_health_risks_id", "update_health_risk_status"),
+    ("api_v2_users", "get_api_v2_users"),
+    ("api_v2_users", "post_api_v2_users"),
+    ("api_v2_users_id_or_email", "get_api_v2_users_id_or_email"),
+    ("api_v2_users_id_or_email", "put_api_v2_users_id_or_email"),
+    ("api_v2_users_id_or_email", "delete_api_v2_users_id_or_email"),
+    ("api_v2_users_effective_permissions", "get_api_v2_users_effective_permissions"),
+    ("api_v2_rbac_roles_id_or_name", "get_api_v2_rbac_roles_id_or_name"),
+    ("api_v2_rbac_roles_id_or_name", "put_api_v2_rbac_roles_id_or_name"),
+    ("api_v2_rbac_roles_id_or_name", "delete_api_v2_rbac_roles_id_or_name"),
+    ("api_v2_rbac_policies", "post_api_v2_rbac_policies"),
+    ("api_v2_rbac_policies_id_or_name", "get_api_v2_rbac_policies_id_or_name"),
+    ("api_v2_rbac_policies_id_or_name", "put_api_v2_rbac_policies_id_or_name"),
+    ("api_v2_rbac_policies_id_or_name", "delete_api_v2_rbac_policies_id_or_name"),
+    ("api_v2_cost_allocation", "get_cost_allocation"),
+    ("api_v2_cost_right_sizing_service", "get_cost_right_sizing_per_service"),
+    ("api_v2_cost_right_sizing_container", "get_cost_right_sizing_per_container"),
+    ("api_v2_klaudia_rca_sessions", "trigger_klaudia_rca"),
+    ("api_v2_klaudia_rca_sessions_id", "get_klaudia_rca_results"),
+    ("mgmt_v1_apikey_validate", "api_keys_controller_validate"),
+    ("mgmt_v1_events", "events_controller_create_custom_event"),
+    ("mgmt_v1_monitors_config", "monitors_controller_v1_get_all"),
+    ("mgmt_v1_monitors_config", "monitors_controller_v1_post"),
+    ("mgmt_v1_monitors_config_id", "monitors_controller_v1_get"),
+    ("mgmt_v1_monitors_config_id", "monitors_controller_v1_put"),
+    ("mgmt_v1_monitors_config_id", "monitors_controller_v1_delete"),
+    ("mgmt_v1_rbac_roles", "roles_controller_v1_get_all"),
+    ("mgmt_v1_rbac_roles", "roles_controller_v1_post"),
+    ("mgmt_v1_rbac_roles", "roles_controller_v1_delete"),
+    ("mgmt_v1_rbac_roles_id", "roles_controller_v1_get"),
+    ("mgmt_v1_rbac_roles_id_policies", "rbac_role_policies_controller_v1_get"),
+    ("mgmt_v1_rbac_roles_policies", "rbac_role_policies_controller_v1_post"),
+    ("mgmt_v1_rbac_roles_policies", "rbac_role_policies_controller_v1_delete"),
+    ("mgmt_v1_rbac_policies", "policies_controller_v1_get_all"),
+    ("mgmt_v1_rbac_policies", "policies_controller_v1_post"),
+    ("mgmt_v1_rbac_policies", "policies_controller_v1_delete"),
+    ("mgmt_v1_rbac_policies_id", "policies_controller_v1_get"),
+    ("mgmt_v1_rbac_policies_id", "policies_controller_v1_update_policy"),
+    ("mgmt_v1_rbac_users", "rbac_user_controller_v1_get_all"),
+    ("mgmt_v1_rbac_users_id", "rbac_user_controller_v1_get"),
+    ("mgmt_v1_rbac_users_id_roles", "rbac_user_roles_controller_v1_get"),
+    ("mgmt_v1_rbac_users_roles", "rbac_user_roles_controller_v1_post"),
+    ("mgmt_v1_rbac_users_roles", "rbac_user_roles_controller_v1_delete"),
+    ("mgmt_v1_integrations_kubernetes", "cluster_controller_post"),
+    ("mgmt_v1_integrations_kubernetes_id", "cluster_controller_delete"),
+    ("mgmt_v1_integrations_kubernetes_clustername", "cluster_controller_get_by_cluster_name"),
+    ("mgmt_v1_rbac_actions", "actions_controller_v1_get_all"),
+    ("mgmt_v1_rbac_actions", "actions_controller_v1_post"),
+    ("mgmt_v1_rbac_actions_action", "actions_controller_v1_get"),
+    ("mgmt_v1_rbac_actions_id", "actions_controller_v1_delete"),
+    ("mgmt_v1_rbac_actions_id", "actions_controller_v1_update"),
+]
+
+
+def _load_tool_function(module: str, function: str) -> Callable[..., Any]:
+    return getattr(importlib.import_module(f"{TOOLS_PACKAGE}.{module}"), function)
+
+
+def wrap_tool(fn: Callable[..., Any], name: str) -> Callable[..., Any]:
+    """
+    Wrap a tool so its result is returned as compact JSON text and its calls are measured.
+
+    FastMCP would otherwise encode dict results as indented JSON with
+    pydantic. Encoding once with the shared codec is faster on large payloads
+    and leaves out the indentation the model does not need. API requests made
+    during the call are attributed to the tool in the metrics, and traced as
+    children of the call's span.
+
+    Args:
+        fn: Async tool function
+        name: Tool name used in metrics
+
+    Returns:
+        Async function with the same signature returning a string
+    """
+
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        token = metrics.current_tool.set(name)
+        start = time.monotonic()
+        try:
+            with tracing.tool_span(name):
+                try:
+                    result = await fn(*args, **kwargs)
+                except asyncio.CancelledError:
+                    # The client cancelled the call; its API requests are cancelled with it
+                    logger.info("Tool %s cancelled after %.2fs", name, time.monotonic() - start)
+                    metrics.observe_tool_call(name, "cancelled", time.monotonic() - start, None)
+                    raise
+                except Exception:
+                    metrics.observe_tool_call(name, "exception", time.monotonic() - start, None)
+                    raise
+                status = "error" if isinstance(result, dict) and "error" in result else "success"
+                if status == "error":
+                    tracing.set_error(str(result["error"]))
+                text = result if isinstance(result, str) else codec.dumps_str(result)
+        finally:
+            metrics.current_tool.reset(token)
+        metrics.observe_tool_call(name, status, time.monotonic() - start, text)
+        return text
+
+    return wrapper
+
+
+class LazyTool(Tool):
+    """A tool registered from the manifest whose module is imported on first call."""
+
+    module: str
+    function: str
+    fn: Optional[Callable[..., Any]] = Field(default=None, exclude=True)
+    fn_metadata: Optional[FuncMetadata] = None
+    is_async: bool = True
+
+    _resolved: Optional[Tool] = PrivateAttr(default=None)
+
+    def resolve(self) -> Tool:
+        """Import the implementing module and build the real tool."""
+        if self._resolved is None:
+            logger.debug("Loading tool %s from %s.%s", self.name, TOOLS_PACKAGE, self.module)
+            fn = _load_tool_function(self.module, self.function)
+            self._resolved = Tool.from_function(wrap_tool(fn, self.name), name=self.name, description=self.description)
+        return self._resolved
+
+    async def run(self, arguments: Dict[str, Any], context=None) -> Any:
+        return await self.resolve().run(arguments, context=context)
+
+
+def source_hash() -> str:
+    """Hash the tool table and the source of every tool module it references."""
+    digest = hashlib.sha256(json.dumps(TOOLS).encode())
+    for module in sorted({module for module, _ in TOOLS}):
+        digest.update(module.encode())
+        digest.update((TOOLS_DIR / f"{module}.py").read_bytes())
+    return digest.hexdigest()
+
+
+def build_manifest() -> Dict[str, Any]:
+    """Import every tool module and describe each tool's name, description and input schema."""
+    tools = []
+    for module, function in TOOLS:
+        tool = Tool.from_function(_load_tool_function(module, function))
+        tools.append(
+            {
+                "name": tool.name,
+                "module": module,
+                "function": function,
+                "description": tool.description,
+                "inputSchema": tool.parameters,
+            }
+        )
+    return {"version": MANIFEST_VERSION, "source_hash": source_hash(), "tools": tools}
+
+
+def write_manifest(manifest: Dict[str, Any], path: Path = MANIFEST_PATH) -> None:
+    """Write the manifest to disk."""
+    with open(path, "w") as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+
+
+def load_manifest(path: Path = MANIFEST_PATH) -> Optional[Dict[str, Any]]:
+    """
+    Return the prebuilt manifest if it matches the current tool sources.
+
+    Args:
+        path: Manifest file to read
+
+    Returns:
+        The manifest, or None if it is missing, has another layout version or
+        was built from different tool sources
+    """
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+    if manifest.get("version") != MANIFEST_VERSION:
+        logger.warning("Ignoring tool manifest %s with version %s", path, manifest.get("version"))
+        return None
+    if manifest.get("source_hash") != source_hash():
+        logger.warning("Ignoring stale tool manifest %s", path)
+        return None
+    return manifest
+
+
+def load_or_build_manifest(path: Path = MANIFEST_PATH) -> Dict[str, Any]:
+    """Return the cached manifest, rebuilding and caching it if it is missing or stale."""
+    manifest = load_manifest(path)
+    if manifest is not None:
+        return manifest
+
+    logger.warning("Rebuilding tool manifest %s, importing all tool modules", path)
+    manifest = build_manifest()
+    try:
+        write_manifest(manifest, path)
+    except OSError as e:
+        logger.warning("Could not cache tool manifest %s: %s", path, e)
+    return manifest
+
+
+def serve_tool_list(mcp: FastMCP, manifest: Dict[str, Any]) -> None:
+    """Answer tools/list with a tool list built once from the manifest."""
+    tools = [
+        MCPTool(name=entry["name"], description=entry["description"], inputSchema=entry["inputSchema"])
+        for entry in manifest["tools"]
+    ]
+
+    async def list_tools() -> List[MCPTool]:
+        return tools
+
+    mcp._mcp_server.list_tools()(list_tools)
+
+
+def register_tools(mcp: FastMCP, lazy: bool = True) -> None:
+    """
+    Register every tool in TOOLS with the server.
+
+    Args:
+        mcp: Server to register the tools with
+        lazy: Register tools from the manifest, import their modules on first
+            call and serve tools/list from the manifest. When False every tool
+            module is imported and registered at startup.
+    """
+    if not lazy:
+        for module, function in TOOLS:
+            mcp.tool()(wrap_tool(_load_tool_function(module, function), function))
+        return
+
+    manifest = load_or_build_manifest()
+    for entry in manifest["tools"]:
+        # FastMCP has no public API for registering a prebuilt Tool
+        mcp._tool_manager._tools[entry["name"]] = LazyTool(
+            name=entry["name"],
+            description=entry["description"],
+            parameters=entry["inputSchema"],
+            module=entry["module"],
+            function=entry["function"],
+        )
+    serve_tool_list(mcp, manifest)
+
+
+if __name__ == "__main__":
+    # Tool modules read the API settings at import time; they are not used to build the manifest
+    os.environ.setdefault("KOMODOR_API_URL", "https://api.komodor.com")
+    os.environ.setdefault("KOMODOR_TOKEN", "manifest-build")
+    logging.disable(logging.CRITICAL)
+
+    write_manifest(build_manifest())
+    print(f"Wrote {len(TOOLS)} tools to {MANIFEST_PATH}")
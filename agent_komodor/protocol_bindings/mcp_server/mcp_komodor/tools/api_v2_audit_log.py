@@ -3,9 +3,9 @@
 import logging
 from typing import Dict, Any, List
 from mcp_komodor.api.client import make_api_request, assemble_nested_body
+from mcp_komodor.api.pagination import fetch_all_pages
+from mcp_komodor.api.projection import shape_response
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger("mcp_tools")
 
 
@@ -23,6 +23,8 @@ async def get_api_v2_audit_log(
     param_page: int = None,
     param_pageSize: int = None,
     param_sort: str = None,
+    max_items: int = None,
+    output_format: str = None,
 ) -> Dict[str, Any]:
     '''
     Query audit logs with filters, sort, and pagination.
@@ -41,6 +43,10 @@ async def get_api_v2_audit_log(
         param_page (int, optional): Page number for pagination. Defaults to 1 if not provided. Ignored if the response is CSV.
         param_pageSize (int, optional): Page size for pagination. Defaults to 20 if not provided. Ignored if the response is CSV.
         param_sort (str, optional): Sort order for the audit logs. Defaults to None.
+        max_items (int, optional): Fetch pages concurrently until this many items are collected and return them
+            merged in one response, instead of a single page. Defaults to None.
+        output_format (str, optional): "json", or "table" to return the items as tab-separated rows under one
+            header row, which takes far fewer tokens on large lists. Defaults to KOMODOR_TOOL_OUTPUT_FORMAT.
 
     Returns:
         Dict[str, Any]: The JSON response from the API call.
@@ -97,9 +103,16 @@ async def get_api_v2_audit_log(
     flat_body = {}
     data = assemble_nested_body(flat_body)
 
-    success, response = await make_api_request("/api/v2/audit-log", method="GET", params=params, data=data)
+    if max_items is not None and max_items <= 0:
+        return {"error": f"max_items must be positive, got {max_items}"}
+    if max_items:
+        success, response = await fetch_all_pages(
+            "/api/v2/audit-log", max_items, method="GET", params=params, data=data
+        )
+    else:
+        success, response = await make_api_request("/api/v2/audit-log", method="GET", params=params, data=data)
 
     if not success:
-        logger.error(f"Request failed: {response.get('error')}")
+        logger.error("Request failed: %s", response.get("error"))
         return {"error": response.get("error", "Request failed")}
-    return response
\ No newline at end of file
+    return shape_response(response, output_format=output_format)
\ No newline at end of file
@@ -4,8 +4,6 @@ import logging
 from typing import Dict, Any
 from mcp_komodor.api.client import make_api_request, assemble_nested_body
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger("mcp_tools")
 
 
@@ -37,9 +35,11 @@ async def get_api_v2_audit_log_filters(param_startTime: str = None, param_endTim
     flat_body = {}
     data = assemble_nested_body(flat_body)
 
-    success, response = await make_api_request("/api/v2/audit-log/filters", method="GET", params=params, data=data)
+    success, response = await make_api_request(
+        "/api/v2/audit-log/filters", method="GET", params=params, data=data, cache_ttl=300
+    )
 
     if not success:
-        logger.error(f"Request failed: {response.get('error')}")
+        logger.error("Request failed: %s", response.get("error"))
         return {"error": response.get("error", "Request failed")}
     return response
\ No newline at end of file
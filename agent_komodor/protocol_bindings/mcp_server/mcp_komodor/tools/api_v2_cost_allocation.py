@@ -4,8 +4,6 @@ import logging
 from typing import Dict, Any, List
 from mcp_komodor.api.client import make_api_request, assemble_nested_body
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger("mcp_tools")
 
 
@@ -85,6 +83,6 @@ async def get_cost_allocation(
     success, response = await make_api_request("/api/v2/cost/allocation", method="GET", params=params, data=data)
 
     if not success:
-        logger.error(f"Request failed: {response.get('error')}")
+        logger.error("Request failed: %s", response.get("error"))
         return {"error": response.get("error", "Request failed")}
     return response
\ No newline at end of file
@@ -3,9 +3,9 @@
 import logging
 from typing import Dict, Any, List
 from mcp_komodor.api.client import make_api_request, assemble_nested_body
+from mcp_komodor.api.pagination import fetch_all_pages
+from mcp_komodor.api.projection import shape_response
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger("mcp_tools")
 
 
@@ -26,6 +26,10 @@ async def get_health_risks(
     param_createdFromEpoch: str = None,
     param_createdToEpoch: str = None,
     param_checkCategory: List[str] = None,
+    max_items: int = None,
+    fields: List[str] = None,
+    max_tokens: int = None,
+    output_format: str = None,
 ) -> Dict[str, Any]:
     '''
     Get all the health risks.
@@ -47,6 +51,15 @@ async def get_health_risks(
         param_createdFromEpoch (str, optional): The start epoch time to filter the creation date. Defaults to None.
         param_createdToEpoch (str, optional): The end epoch time to filter the creation date. Defaults to None.
         param_checkCategory (List[str], optional): The category of checks to filter by. Defaults to None.
+        max_items (int, optional): Fetch pages concurrently until this many items are collected and return them
+            merged in one response, instead of a single page. Defaults to None.
+        fields (List[str], optional): Dotted field names to keep, e.g. ["reason", "metadata.namespace"]. Applied to
+            each item when the response is a list of items. Defaults to None (all fields).
+        max_tokens (int, optional): Token budget for the response. Larger responses are summarized, keeping status,
+            severity, reason and timestamps, and what was left out is listed under "elided". Defaults to
+            KOMODOR_TOOL_MAX_TOKENS.
+        output_format (str, optional): "json", or "table" to return the items as tab-separated rows under one
+            header row, which takes far fewer tokens on large lists. Defaults to KOMODOR_TOOL_OUTPUT_FORMAT.
 
     Returns:
         Dict[str, Any]: The JSON response from the API call containing health risks data.
@@ -132,9 +145,16 @@ async def get_health_risks(
     flat_body = {}
     data = assemble_nested_body(flat_body)
 
-    success, response = await make_api_request("/api/v2/health/risks", method="GET", params=params, data=data)
+    if max_items is not None and max_items <= 0:
+        return {"error": f"max_items must be positive, got {max_items}"}
+    if max_items:
+        success, response = await fetch_all_pages(
+            "/api/v2/health/risks", max_items, method="GET", params=params, data=data
+        )
+    else:
+        success, response = await make_api_request("/api/v2/health/risks", method="GET", params=params, data=data)
 
     if not success:
-        logger.error(f"Request failed: {response.get('error')}")
+        logger.error("Request failed: %s", response.get("error"))
         return {"error": response.get("error", "Request failed")}
-    return response
+    return shape_response(response, fields, max_tokens, output_format)
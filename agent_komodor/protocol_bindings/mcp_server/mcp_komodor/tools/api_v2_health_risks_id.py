@@ -4,8 +4,6 @@ import logging
 from typing import Dict, Any
 from mcp_komodor.api.client import make_api_request, assemble_nested_body
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger("mcp_tools")
 
 
@@ -35,7 +33,7 @@ async def get_health_risk_data(path_id: str) -> Dict[str, Any]:
     )
 
     if not success:
-        logger.error(f"Request failed: {response.get('error')}")
+        logger.error("Request failed: %s", response.get("error"))
         return {"error": response.get("error", "Request failed")}
     return response
 
@@ -69,6 +67,6 @@ async def update_health_risk_status(path_id: str, body_status: str = None) -> Di
     )
 
     if not success:
-        logger.error(f"Request failed: {response.get('error')}")
+        logger.error("Request failed: %s", response.get("error"))
         return {"error": response.get("error", "Request failed")}
     return response
\ No newline at end of file
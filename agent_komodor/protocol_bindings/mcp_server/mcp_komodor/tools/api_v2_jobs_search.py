@@ -3,9 +3,9 @@
 import logging
 from typing import Dict, Any, List
 from mcp_komodor.api.client import make_api_request, assemble_nested_body
+from mcp_komodor.api.pagination import fetch_all_pages
+from mcp_komodor.api.projection import shape_response
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger("mcp_tools")
 
 
@@ -16,6 +16,8 @@ async def post_api_v2_jobs_search(
     body_status: str = None,
     body_pagination_pageSize: int = None,
     body_pagination_page: int = None,
+    max_items: int = None,
+    output_format: str = None,
 ) -> Dict[str, Any]:
     '''
     Search for jobs and cron jobs.
@@ -29,6 +31,10 @@ async def post_api_v2_jobs_search(
         body_status (str, optional): The status of the job. Defaults to None.
         body_pagination_pageSize (int, optional): The number of results returned per page. Defaults to None.
         body_pagination_page (int, optional): The page number. Defaults to None.
+        max_items (int, optional): Fetch pages concurrently until this many items are collected and return them
+            merged in one response, instead of a single page. Defaults to None.
+        output_format (str, optional): "json", or "table" to return the items as tab-separated rows under one
+            header row, which takes far fewer tokens on large lists. Defaults to KOMODOR_TOOL_OUTPUT_FORMAT.
 
     Returns:
         Dict[str, Any]: The JSON response from the API call.
@@ -56,9 +62,16 @@ async def post_api_v2_jobs_search(
         flat_body["pagination_page"] = body_pagination_page
     data = assemble_nested_body(flat_body)
 
-    success, response = await make_api_request("/api/v2/jobs/search", method="POST", params=params, data=data)
+    if max_items is not None and max_items <= 0:
+        return {"error": f"max_items must be positive, got {max_items}"}
+    if max_items:
+        success, response = await fetch_all_pages(
+            "/api/v2/jobs/search", max_items, method="POST", params=params, data=data
+        )
+    else:
+        success, response = await make_api_request("/api/v2/jobs/search", method="POST", params=params, data=data)
 
     if not success:
-        logger.error(f"Request failed: {response.get('error')}")
+        logger.error("Request failed: %s", response.get("error"))
         return {"error": response.get("error", "Request failed")}
-    return response
\ No newline at end of file
+    return shape_response(response, output_format=output_format)
\ No newline at end of file
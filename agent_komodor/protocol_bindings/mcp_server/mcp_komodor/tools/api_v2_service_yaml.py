@@ -1,16 +1,20 @@
 """Tools for /api/v2/service/yaml operations"""
 
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List
 from mcp_komodor.api.client import make_api_request, assemble_nested_body
+from mcp_komodor.api.projection import shape_response
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger("mcp_tools")
 
 
 async def get_api_v2_service_yaml(
-    param_cluster: str, param_namespace: str, param_kind: str, param_name: str
+    param_cluster: str,
+    param_namespace: str,
+    param_kind: str,
+    param_name: str,
+    fields: List[str] = None,
+    max_tokens: int = None,
 ) -> Dict[str, Any]:
     '''
     Get the YAML for a service.
@@ -20,6 +24,11 @@ async def get_api_v2_service_yaml(
         param_namespace (str): The namespace of the service.
         param_kind (str): The kind of the service.
         param_name (str): The service name.
+        fields (List[str], optional): Dotted field names to keep, e.g. ["reason", "metadata.namespace"]. Applied to
+            each item when the response is a list of items. Defaults to None (all fields).
+        max_tokens (int, optional): Token budget for the response. Larger responses are summarized, keeping status,
+            severity, reason and timestamps, and what was left out is listed under "elided". Defaults to
+            KOMODOR_TOOL_MAX_TOKENS.
 
     Returns:
         Dict[str, Any]: The JSON response from the API call containing the service YAML.
@@ -50,6 +59,6 @@ async def get_api_v2_service_yaml(
     success, response = await make_api_request("/api/v2/service/yaml", method="GET", params=params, data=data)
 
     if not success:
-        logger.error(f"Request failed: {response.get('error')}")
+        logger.error("Request failed: %s", response.get("error"))
         return {"error": response.get("error", "Request failed")}
-    return response
\ No newline at end of file
+    return shape_response(response, fields, max_tokens)
\ No newline at end of file
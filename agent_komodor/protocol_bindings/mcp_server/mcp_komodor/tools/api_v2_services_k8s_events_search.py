@@ -1,15 +1,16 @@
 """Tools for /api/v2/services/k8s-events/search operations"""
 
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List
 from mcp_komodor.api.client import make_api_request, assemble_nested_body
+from mcp_komodor.api.projection import shape_response
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger("mcp_tools")
 
 
-async def post_api_v2_services_k8s_events_search(body: str) -> Dict[str, Any]:
+async def post_api_v2_services_k8s_events_search(
+    body: str, fields: List[str] = None, max_tokens: int = None, output_format: str = None
+) -> Dict[str, Any]:
     '''
     Search for Kubernetes events within a service scope.
 
@@ -17,6 +18,13 @@ async def post_api_v2_services_k8s_events_search(body: str) -> Dict[str, Any]:
 
     Args:
         body (str): The request body containing search criteria for Kubernetes events.
+        fields (List[str], optional): Dotted field names to keep, e.g. ["reason", "metadata.namespace"]. Applied to
+            each item when the response is a list of items. Defaults to None (all fields).
+        max_tokens (int, optional): Token budget for the response. Larger responses are summarized, keeping status,
+            severity, reason and timestamps, and what was left out is listed under "elided". Defaults to
+            KOMODOR_TOOL_MAX_TOKENS.
+        output_format (str, optional): "json", or "table" to return the items as tab-separated rows under one
+            header row, which takes far fewer tokens on large lists. Defaults to KOMODOR_TOOL_OUTPUT_FORMAT.
 
     Returns:
         Dict[str, Any]: A dictionary containing the JSON response from the API call, which includes the search results.
@@ -37,6 +45,6 @@ async def post_api_v2_services_k8s_events_search(body: str) -> Dict[str, Any]:
     )
 
     if not success:
-        logger.error(f"Request failed: {response.get('error')}")
+        logger.error("Request failed: %s", response.get("error"))
         return {"error": response.get("error", "Request failed")}
-    return response
\ No newline at end of file
+    return shape_response(response, fields, max_tokens, output_format)
\ No newline at end of file
@@ -4,8 +4,6 @@ import logging
 from typing import Dict, Any, List
 from mcp_komodor.api.client import make_api_request, assemble_nested_body
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger("mcp_tools")
 
 
@@ -37,7 +35,7 @@ async def policies_controller_v1_get_all() -> Dict[str, Any]:
     success, response = await make_api_request("/mgmt/v1/rbac/policies", method="GET", params=params, data=data)
 
     if not success:
-        logger.error(f"Request failed: {response.get('error')}")
+        logger.error("Request failed: %s", response.get("error"))
         return {"error": response.get("error", "Request failed")}
     return response
 
@@ -71,7 +69,7 @@ async def policies_controller_v1_post(body_name: str, body_statements: List[str]
     success, response = await make_api_request("/mgmt/v1/rbac/policies", method="POST", params=params, data=data)
 
     if not success:
-        logger.error(f"Request failed: {response.get('error')}")
+        logger.error("Request failed: %s", response.get("error"))
         return {"error": response.get("error", "Request failed")}
     return response
 
@@ -102,6 +100,6 @@ async def policies_controller_v1_delete(body_id: str) -> Dict[str, Any]:
     success, response = await make_api_request("/mgmt/v1/rbac/policies", method="DELETE", params=params, data=data)
 
     if not success:
-        logger.error(f"Request failed: {response.get('error')}")
+        logger.error("Request failed: %s", response.get("error"))
         return {"error": response.get("error", "Request failed")}
     return response
\ No newline at end of file
@@ -4,8 +4,6 @@ import logging
 from typing import Dict, Any
 from mcp_komodor.api.client import make_api_request, assemble_nested_body
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger("mcp_tools")
 
 
@@ -35,10 +33,12 @@ async def roles_controller_v1_get_all() -> Dict[str, Any]:
     flat_body = {}
     data = assemble_nested_body(flat_body)
 
-    success, response = await make_api_request("/mgmt/v1/rbac/roles", method="GET", params=params, data=data)
+    success, response = await make_api_request(
+        "/mgmt/v1/rbac/roles", method="GET", params=params, data=data, cache_ttl=120
+    )
 
     if not success:
-        logger.error(f"Request failed: {response.get('error')}")
+        logger.error("Request failed: %s", response.get("error"))
         return {"error": response.get("error", "Request failed")}
     return response
 
@@ -69,7 +69,7 @@ async def roles_controller_v1_post(body_name: str) -> Dict[str, Any]:
     success, response = await make_api_request("/mgmt/v1/rbac/roles", method="POST", params=params, data=data)
 
     if not success:
-        logger.error(f"Request failed: {response.get('error')}")
+        logger.error("Request failed: %s", response.get("error"))
         return {"error": response.get("error", "Request failed")}
     return response
 
@@ -100,6 +100,6 @@ async def roles_controller_v1_delete(body_id: str) -> Dict[str, Any]:
     success, response = await make_api_request("/mgmt/v1/rbac/roles", method="DELETE", params=params, data=data)
 
     if not success:
-        logger.error(f"Request failed: {response.get('error')}")
+        logger.error("Request failed: %s", response.get("error"))
         return {"error": response.get("error", "Request failed")}
     return response
\ No newline at end of file
@@ -0,0 +1,141 @@
+"""OpenTelemetry tracing for tool calls and Komodor API requests"""
+
+import contextlib
+import logging
+import os
+import sys
+from typing import Any, Dict, Iterator, Optional
+
+logger = logging.getLogger("mcp_komodor")
+
+try:
+    from opentelemetry import propagate, trace
+    from opentelemetry.trace import SpanKind, Status, StatusCode
+except ImportError:
+    trace = None
+
+# "none" keeps whatever tracer provider the process already has, "console"
+# writes finished spans to stderr and "otlp" exports them to OTEL_EXPORTER_OTLP_ENDPOINT
+TRACES_EXPORTER = os.getenv("OTEL_TRACES_EXPORTER", "none").lower()
+SERVICE_NAME = os.getenv("OTEL_SERVICE_NAME", "mcp-komodor")
+
+TRACER_NAME = "mcp_komodor"
+
+
+def configure_tracing(exporter: Optional[str] = None) -> None:
+    """
+    Install a tracer provider for the server process.
+
+    Console output goes to stderr, since in stdio mode stdout carries the MCP
+    protocol. Does nothing if the OpenTelemetry SDK is not installed.
+
+    Args:
+        exporter: "none", "console" or "otlp" (defaults to OTEL_TRACES_EXPORTER)
+    """
+    exporter = (exporter or TRACES_EXPORTER).lower()
+    if exporter == "none":
+        return
+    try:
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+    except ImportError:
+        logger.warning("OTEL_TRACES_EXPORTER is %s but the OpenTelemetry SDK is not installed", exporter)
+        return
+
+    if exporter == "console":
+        span_exporter = ConsoleSpanExporter(out=sys.stderr)
+    elif exporter == "otlp":
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        except ImportError:
+            logger.warning("OTLP trace exporter is not installed, tracing is disabled")
+            return
+        span_exporter = OTLPSpanExporter()
+    else:
+        logger.warning("Unknown OTEL_TRACES_EXPORTER %s, tracing is disabled", exporter)
+        return
+
+    provider = TracerProvider(resource=Resource.create({"service.name": SERVICE_NAME}))
+    provider.add_span_processor(BatchSpanProcessor(span_exporter))
+    trace.set_tracer_provider(provider)
+
+
+def _request_carrier() -> Dict[str, Any]:
+    """Return the _meta fields of the MCP request being handled, which carry the caller's trace context."""
+    from mcp.server.lowlevel.server import request_ctx
+
+    context = request_ctx.get(None)
+    meta = getattr(context, "meta", None)
+    return meta.model_dump(exclude_none=True) if meta is not None else {}
+
+
+@contextlib.contextmanager
+def tool_span(name: str) -> Iterator[None]:
+    """
+    Trace a tool call as a child of the span the client sent in the request's _meta.
+
+    Args:
+        name: Tool name
+    """
+    if trace is None:
+        yield
+        return
+    parent = propagate.extract(_request_carrier())
+    tracer = trace.get_tracer(TRACER_NAME)
+    with tracer.start_as_current_span(
+        f"tools/call {name}", context=parent, kind=SpanKind.SERVER, attributes={"mcp.tool.name": name}
+    ):
+        yield
+
+
+@contextlib.contextmanager
+def api_span(method: str, path: str) -> Iterator[None]:
+    """
+    Trace a Komodor API request.
+
+    Args:
+        method: HTTP method
+        path: API path
+    """
+    if trace is None:
+        yield
+        return
+    tracer = trace.get_tracer(TRACER_NAME)
+    with tracer.start_as_current_span(
+        f"{method} {path}", kind=SpanKind.CLIENT, attributes={"http.request.method": method, "url.path": path}
+    ):
+        yield
+
+
+def set_attributes(attributes: Dict[str, Any]) -> None:
+    """
+    Add attributes to the current span.
+
+    Args:
+        attributes: Attribute names and values
+    """
+    if trace is not None:
+        trace.get_current_span().set_attributes(attributes)
+
+
+def set_error(description: str) -> None:
+    """
+    Mark the current span as failed without an exception, e.g. for an error result.
+
+    Args:
+        description: Error message
+    """
+    if trace is not None:
+        trace.get_current_span().set_status(Status(StatusCode.ERROR, description))
+
+
+def inject_headers(headers: Dict[str, str]) -> None:
+    """
+    Add the current trace context to outgoing HTTP headers.
+
+    Args:
+        headers: Request headers, updated in place
+    """
+    if trace is not None:
+        propagate.inject(headers)
@@ -0,0 +1,442 @@
+# Copyright CNOE Contributors (https://cnoe.io)
+# SPDX-License-Identifier: Apache-2.0
+
+"""SQLite-backed conversation checkpointer and A2A task store shared by replicas."""
+
+import asyncio
+import logging
+import os
+import random
+import sqlite3
+import threading
+import zlib
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from a2a.server.tasks import InMemoryTaskStore, TaskStore
+from a2a.types import Task
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+  WRITES_IDX_MAP,
+  BaseCheckpointSaver,
+  ChannelVersions,
+  Checkpoint,
+  CheckpointMetadata,
+  CheckpointTuple,
+  get_checkpoint_id,
+  get_checkpoint_metadata,
+)
+from langgraph.checkpoint.serde.types import TASKS, ChannelProtocol
+
+logger = logging.getLogger(__name__)
+
+# Serialized values at least this large are stored zlib-compressed
+COMPRESS_MIN_BYTES = 1024
+_COMPRESSED_SUFFIX = "+zlib"
+
+_CHECKPOINT_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+  thread_id TEXT NOT NULL,
+  checkpoint_ns TEXT NOT NULL DEFAULT '',
+  checkpoint_id TEXT NOT NULL,
+  parent_checkpoint_id TEXT,
+  type TEXT NOT NULL,
+  checkpoint BLOB NOT NULL,
+  metadata_type TEXT NOT NULL,
+  metadata BLOB NOT NULL,
+  PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+);
+CREATE TABLE IF NOT EXISTS checkpoint_blobs (
+  thread_id TEXT NOT NULL,
+  checkpoint_ns TEXT NOT NULL DEFAULT '',
+  channel TEXT NOT NULL,
+  version TEXT NOT NULL,
+  type TEXT NOT NULL,
+  blob BLOB,
+  PRIMARY KEY (thread_id, checkpoint_ns, channel, version)
+);
+CREATE TABLE IF NOT EXISTS checkpoint_writes (
+  thread_id TEXT NOT NULL,
+  checkpoint_ns TEXT NOT NULL DEFAULT '',
+  checkpoint_id TEXT NOT NULL,
+  task_id TEXT NOT NULL,
+  idx INTEGER NOT NULL,
+  channel TEXT NOT NULL,
+  type TEXT NOT NULL,
+  blob BLOB NOT NULL,
+  task_path TEXT NOT NULL DEFAULT '',
+  PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+);
+"""
+
+_TASK_SCHEMA = """
+CREATE TABLE IF NOT EXISTS a2a_tasks (
+  id TEXT PRIMARY KEY,
+  context_id TEXT NOT NULL,
+  compressed INTEGER NOT NULL,
+  data BLOB NOT NULL
+);
+"""
+
+
+def connect(path: str) -> sqlite3.Connection:
+  """
+  Open a database in WAL mode, so readers in any process don't block the writer.
+
+  The connection is in autocommit mode; callers group statements with ``transaction``.
+  """
+  directory = os.path.dirname(path)
+  if directory:
+    os.makedirs(directory, exist_ok=True)
+  conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+  conn.execute("PRAGMA journal_mode=WAL")
+  # With WAL, NORMAL only risks the last commits on power loss, never corruption
+  conn.execute("PRAGMA synchronous=NORMAL")
+  conn.execute("PRAGMA busy_timeout=5000")
+  return conn
+
+
+class _Database:
+  """One connection per process, serialized by a lock."""
+
+  def __init__(self, path: str, schema: str):
+    self.path = path
+    self.conn = connect(path)
+    self.lock = threading.Lock()
+    with self.lock:
+      self.conn.executescript(schema)
+
+  def transaction(
+    self, statements: Sequence[Tuple[str, List[tuple]]], then: Optional[Callable[[sqlite3.Connection], None]] = None
+  ) -> None:
+    """Run several ``executemany`` statements, then ``then(conn)`` if given, in one write transaction."""
+    with self.lock:
+      self.conn.execute("BEGIN IMMEDIATE")
+      try:
+        for sql, rows in statements:
+          if rows:
+            self.conn.executemany(sql, rows)
+        if then is not None:
+          then(self.conn)
+      except BaseException:
+        self.conn.execute("ROLLBACK")
+        raise
+      self.conn.execute("COMMIT")
+
+  def query(self, sql: str, params: Sequence[Any] = ()) -> List[tuple]:
+    with self.lock:
+      return self.conn.execute(sql, params).fetchall()
+
+  def close(self) -> None:
+    with self.lock:
+      self.conn.close()
+
+
+def _pack(typed: Tuple[str, bytes]) -> Tuple[str, bytes]:
+  """Compress a serialized value if it is large and compresses well."""
+  type_, data = typed
+  if len(data) >= COMPRESS_MIN_BYTES:
+    compressed = zlib.compress(data, 1)
+    if len(compressed) < len(data):
+      return type_ + _COMPRESSED_SUFFIX, compressed
+  return type_, data
+
+
+def _unpack(type_: str, data: bytes) -> Tuple[str, bytes]:
+  if type_.endswith(_COMPRESSED_SUFFIX):
+    return type_[: -len(_COMPRESSED_SUFFIX)], zlib.decompress(data)
+  return type_, data
+
+
+class SqliteSaver(BaseCheckpointSaver[str]):
+  """
+  A LangGraph checkpointer that stores conversations in a SQLite database.
+
+  Channel values are stored once per version, as in ``InMemorySaver``, rather
+  than once per checkpoint. Each ``put`` or ``put_writes`` is a single
+  transaction, and large values are compressed. Processes that share the
+  database file (e.g. replicas mounting the same volume) share conversations.
+
+  As in ``BoundedMemorySaver``, only the newest ``max_checkpoints`` checkpoints
+  of a conversation are kept, together with the channel values and pending
+  writes they reference; ``put`` drops the rest in the same transaction.
+  """
+
+  def __init__(self, path: str, serde=None, max_checkpoints: int = 10):
+    super().__init__(serde=serde)
+    self.db = _Database(path, _CHECKPOINT_SCHEMA)
+    self.max_checkpoints = max_checkpoints
+    self.pruned_checkpoints = 0
+
+  def _dumps(self, value: Any) -> Tuple[str, bytes]:
+    return _pack(self.serde.dumps_typed(value))
+
+  def _loads(self, type_: str, data: bytes) -> Any:
+    return self.serde.loads_typed(_unpack(type_, data))
+
+  def _load_blobs(self, thread_id: str, checkpoint_ns: str, versions: ChannelVersions) -> Dict[str, Any]:
+    if not versions:
+      return {}
+    keys = [(channel, str(version)) for channel, version in versions.items()]
+    rows = self.db.query(
+      "SELECT channel, type, blob FROM checkpoint_blobs WHERE thread_id = ? AND checkpoint_ns = ? "
+      f"AND (channel, version) IN (VALUES {', '.join(['(?, ?)'] * len(keys))})",
+      [thread_id, checkpoint_ns, *(part for key in keys for part in key)],
+    )
+    return {channel: self._loads(type_, blob) for channel, type_, blob in rows if type_ != "empty"}
+
+  def _load_writes(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str, channel: Optional[str] = None) -> List[tuple]:
+    sql = "SELECT task_id, channel, type, blob FROM checkpoint_writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?"
+    params = [thread_id, checkpoint_ns, checkpoint_id]
+    if channel is not None:
+      sql += " AND channel = ? ORDER BY task_path, task_id, idx"
+      params.append(channel)
+    else:
+      sql += " ORDER BY task_id, idx"
+    return [(task_id, c, self._loads(type_, blob)) for task_id, c, type_, blob in self.db.query(sql, params)]
+
+  def _to_tuple(self, thread_id: str, checkpoint_ns: str, row: tuple) -> CheckpointTuple:
+    checkpoint_id, parent_checkpoint_id, type_, checkpoint_b, metadata_type, metadata_b = row
+    checkpoint: Checkpoint = self._loads(type_, checkpoint_b)
+    sends = self._load_writes(thread_id, checkpoint_ns, parent_checkpoint_id, TASKS) if parent_checkpoint_id else []
+    return CheckpointTuple(
+      config={"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint_id}},
+      checkpoint={
+        **checkpoint,
+        "channel_values": self._load_blobs(thread_id, checkpoint_ns, checkpoint["channel_versions"]),
+        "pending_sends": [value for _, _, value in sends],
+      },
+      metadata=self._loads(metadata_type, metadata_b),
+      parent_config=(
+        {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": parent_checkpoint_id}}
+        if parent_checkpoint_id
+        else None
+      ),
+      pending_writes=self._load_writes(thread_id, checkpoint_ns, checkpoint_id),
+    )
+
+  _COLUMNS = "checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata_type, metadata"
+
+  def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+    thread_id = config["configurable"]["thread_id"]
+    checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+    if checkpoint_id := get_checkpoint_id(config):
+      rows = self.db.query(
+        f"SELECT {self._COLUMNS} FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+        (thread_id, checkpoint_ns, checkpoint_id),
+      )
+    else:
+      rows = self.db.query(
+        f"SELECT {self._COLUMNS} FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? ORDER BY checkpoint_id DESC LIMIT 1",
+        (thread_id, checkpoint_ns),
+      )
+    return self._to_tuple(thread_id, checkpoint_ns, rows[0]) if rows else None
+
+  def list(
+    self,
+    config: Optional[RunnableConfig],
+    *,
+    filter: Optional[Dict[str, Any]] = None,
+    before: Optional[RunnableConfig] = None,
+    limit: Optional[int] = None,
+  ) -> Iterator[CheckpointTuple]:
+    where, params = [], []
+    if config:
+      where.append("thread_id = ?")
+      params.append(config["configurable"]["thread_id"])
+      if (checkpoint_ns := config["configurable"].get("checkpoint_ns")) is not None:
+        where.append("checkpoint_ns = ?")
+        params.append(checkpoint_ns)
+      if checkpoint_id := get_checkpoint_id(config):
+        where.append("checkpoint_id = ?")
+        params.append(checkpoint_id)
+    if before and (before_id := get_checkpoint_id(before)):
+      where.append("checkpoint_id < ?")
+      params.append(before_id)
+    sql = f"SELECT thread_id, checkpoint_ns, {self._COLUMNS} FROM checkpoints"
+    if where:
+      sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY thread_id, checkpoint_ns, checkpoint_id DESC"
+
+    for thread_id, checkpoint_ns, *row in self.db.query(sql, params):
+      if filter:
+        metadata = self._loads(row[4], row[5])
+        if not all(metadata.get(key) == value for key, value in filter.items()):
+          continue
+      if limit is not None:
+        if limit <= 0:
+          break
+        limit -= 1
+      yield self._to_tuple(thread_id, checkpoint_ns, tuple(row))
+
+  def put(
+    self,
+    config: RunnableConfig,
+    checkpoint: Checkpoint,
+    metadata: CheckpointMetadata,
+    new_versions: ChannelVersions,
+  ) -> RunnableConfig:
+    thread_id = config["configurable"]["thread_id"]
+    checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+    stored = checkpoint.copy()
+    stored.pop("pending_sends", None)
+    values = stored.pop("channel_values")
+    blobs = [
+      (thread_id, checkpoint_ns, channel, str(version), *(self._dumps(values[channel]) if channel in values else ("empty", None)))
+      for channel, version in new_versions.items()
+    ]
+    self.db.transaction([
+      ("INSERT OR IGNORE INTO checkpoint_blobs VALUES (?, ?, ?, ?, ?, ?)", blobs),
+      (
+        "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        [(
+          thread_id,
+          checkpoint_ns,
+          checkpoint["id"],
+          config["configurable"].get("checkpoint_id"),
+          *self._dumps(stored),
+          *self._dumps(get_checkpoint_metadata(config, metadata)),
+        )],
+      ),
+    ], then=lambda conn: self._prune(conn, thread_id, checkpoint_ns))
+    return {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint["id"]}}
+
+  def _prune(self, conn: sqlite3.Connection, thread_id: str, checkpoint_ns: str) -> None:
+    """Drop the oldest checkpoints of a namespace and whatever only they referenced."""
+    if not self.max_checkpoints:
+      return
+    # Checkpoint IDs sort in creation order
+    rows = conn.execute(
+      "SELECT checkpoint_id FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? ORDER BY checkpoint_id DESC",
+      (thread_id, checkpoint_ns),
+    ).fetchall()
+    old = [(thread_id, checkpoint_ns, checkpoint_id) for checkpoint_id, in rows[self.max_checkpoints :]]
+    if not old:
+      return
+    for table in ("checkpoints", "checkpoint_writes"):
+      conn.executemany(f"DELETE FROM {table} WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?", old)
+    self.pruned_checkpoints += len(old)
+
+    referenced = {
+      (channel, str(version))
+      for type_, checkpoint in conn.execute(
+        "SELECT type, checkpoint FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?", (thread_id, checkpoint_ns)
+      )
+      for channel, version in self._loads(type_, checkpoint)["channel_versions"].items()
+    }
+    stored = conn.execute(
+      "SELECT channel, version FROM checkpoint_blobs WHERE thread_id = ? AND checkpoint_ns = ?", (thread_id, checkpoint_ns)
+    ).fetchall()
+    conn.executemany(
+      "DELETE FROM checkpoint_blobs WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version = ?",
+      [(thread_id, checkpoint_ns, channel, version) for channel, version in stored if (channel, version) not in referenced],
+    )
+
+  def put_writes(self, config: RunnableConfig, writes: Sequence[Tuple[str, Any]], task_id: str, task_path: str = "") -> None:
+    thread_id = config["configurable"]["thread_id"]
+    checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+    checkpoint_id = config["configurable"]["checkpoint_id"]
+    # Regular writes are kept from the first attempt; special ones (errors, interrupts) are replaced
+    keep, replace = [], []
+    for idx, (channel, value) in enumerate(writes):
+      write_idx = WRITES_IDX_MAP.get(channel, idx)
+      row = (thread_id, checkpoint_ns, checkpoint_id, task_id, write_idx, channel, *self._dumps(value), task_path)
+      (keep if write_idx >= 0 else replace).append(row)
+    self.db.transaction([
+      ("INSERT OR IGNORE INTO checkpoint_writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", keep),
+      ("INSERT OR REPLACE INTO checkpoint_writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", replace),
+    ])
+
+  def delete_thread(self, thread_id: str) -> None:
+    self.db.transaction([
+      (f"DELETE FROM {table} WHERE thread_id = ?", [(thread_id,)])
+      for table in ("checkpoints", "checkpoint_blobs", "checkpoint_writes")
+    ])
+
+  async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+    return await asyncio.to_thread(self.get_tuple, config)
+
+  async def alist(
+    self,
+    config: Optional[RunnableConfig],
+    *,
+    filter: Optional[Dict[str, Any]] = None,
+    before: Optional[RunnableConfig] = None,
+    limit: Optional[int] = None,
+  ) -> AsyncIterator[CheckpointTuple]:
+    items = await asyncio.to_thread(lambda: list(self.list(config, filter=filter, before=before, limit=limit)))
+    for item in items:
+      yield item
+
+  async def aput(
+    self,
+    config: RunnableConfig,
+    checkpoint: Checkpoint,
+    metadata: CheckpointMetadata,
+    new_versions: ChannelVersions,
+  ) -> RunnableConfig:
+    return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+  async def aput_writes(self, config: RunnableConfig, writes: Sequence[Tuple[str, Any]], task_id: str, task_path: str = "") -> None:
+    await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+  async def adelete_thread(self, thread_id: str) -> None:
+    await asyncio.to_thread(self.delete_thread, thread_id)
+
+  def get_next_version(self, current: Optional[str], channel: ChannelProtocol) -> str:
+    # Same scheme as InMemorySaver: sortable, and unique across concurrent writers
+    if current is None:
+      current_v = 0
+    elif isinstance(current, int):
+      current_v = current
+    else:
+      current_v = int(current.split(".")[0])
+    return f"{current_v + 1:032}.{random.random():016}"
+
+  def stats(self) -> Dict[str, int]:
+    """Return the number of stored conversations and checkpoints, and the database size."""
+    (threads, checkpoints), = self.db.query("SELECT COUNT(DISTINCT thread_id), COUNT(*) FROM checkpoints")
+    (pages,), = self.db.query("PRAGMA page_count")
+    (page_size,), = self.db.query("PRAGMA page_size")
+    return {"threads": threads, "checkpoints": checkpoints, "bytes": pages * page_size}
+
+
+class SqliteTaskStore(TaskStore):
+  """An A2A task store in a SQLite database, shared by processes that use the same file."""
+
+  def __init__(self, path: str):
+    self.db = _Database(path, _TASK_SCHEMA)
+
+  def _save(self, task: Task) -> None:
+    type_, data = _pack(("json", task.model_dump_json(exclude_none=True).encode()))
+    self.db.transaction([
+      ("INSERT OR REPLACE INTO a2a_tasks VALUES (?, ?, ?, ?)", [(task.id, task.contextId, type_ != "json", data)]),
+    ])
+
+  def _get(self, task_id: str) -> Optional[Task]:
+    rows = self.db.query("SELECT compressed, data FROM a2a_tasks WHERE id = ?", (task_id,))
+    if not rows:
+      return None
+    compressed, data = rows[0]
+    return Task.model_validate_json(zlib.decompress(data) if compressed else data)
+
+  async def save(self, task: Task) -> None:
+    await asyncio.to_thread(self._save, task)
+
+  async def get(self, task_id: str) -> Optional[Task]:
+    return await asyncio.to_thread(self._get, task_id)
+
+  async def delete(self, task_id: str) -> None:
+    await asyncio.to_thread(self.db.transaction, [("DELETE FROM a2a_tasks WHERE id = ?", [(task_id,)])])
+
+
+# "memory" keeps conversations and tasks in the process, "sqlite" in KOMODOR_AGENT_SQLITE_PATH
+AGENT_STORE = os.getenv("KOMODOR_AGENT_STORE", "memory").lower()
+SQLITE_PATH = os.getenv("KOMODOR_AGENT_SQLITE_PATH", "./data/agent_komodor.db")
+
+
+def task_store_from_env() -> TaskStore:
+  """Return the A2A task store selected by ``KOMODOR_AGENT_STORE``."""
+  if AGENT_STORE == "sqlite":
+    logger.info(f"Storing A2A tasks in {SQLITE_PATH}")
+    return SqliteTaskStore(SQLITE_PATH)
+  return InMemoryTaskStore()
@@ -0,0 +1,88 @@
+# Copyright CNOE Contributors (https://cnoe.io)
+# SPDX-License-Identifier: Apache-2.0
+
+"""OpenTelemetry tracing for agent requests, graph runs and MCP tool calls."""
+
+import contextlib
+import logging
+import os
+from typing import Any, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+  from opentelemetry import propagate, trace
+  from opentelemetry.trace import SpanKind
+except ImportError:
+  trace = None
+
+# Same variables as the MCP server: "none" keeps the process's tracer provider,
+# "console" prints finished spans and "otlp" exports them to OTEL_EXPORTER_OTLP_ENDPOINT
+TRACES_EXPORTER = os.getenv("OTEL_TRACES_EXPORTER", "none").lower()
+SERVICE_NAME = os.getenv("OTEL_SERVICE_NAME", "agent-komodor")
+
+TRACER_NAME = "agent_komodor"
+
+
+def configure_tracing(exporter: Optional[str] = None) -> None:
+  """
+  Install a tracer provider for the agent process.
+
+  Does nothing if the exporter is "none" or the OpenTelemetry SDK is not installed.
+  """
+  exporter = (exporter or TRACES_EXPORTER).lower()
+  if exporter == "none":
+    return
+  try:
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+  except ImportError:
+    logger.warning(f"OTEL_TRACES_EXPORTER is {exporter} but the OpenTelemetry SDK is not installed")
+    return
+
+  if exporter == "console":
+    span_exporter = ConsoleSpanExporter()
+  elif exporter == "otlp":
+    try:
+      from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+    except ImportError:
+      logger.warning("OTLP trace exporter is not installed, tracing is disabled")
+      return
+    span_exporter = OTLPSpanExporter()
+  else:
+    logger.warning(f"Unknown OTEL_TRACES_EXPORTER {exporter}, tracing is disabled")
+    return
+
+  provider = TracerProvider(resource=Resource.create({"service.name": SERVICE_NAME}))
+  provider.add_span_processor(BatchSpanProcessor(span_exporter))
+  trace.set_tracer_provider(provider)
+
+
+@contextlib.contextmanager
+def start_span(name: str, attributes: Optional[Dict[str, Any]] = None, server: bool = False) -> Iterator[None]:
+  """Run the block in a span, a server span for incoming requests. A no-op without OpenTelemetry."""
+  if trace is None:
+    yield
+    return
+  kind = SpanKind.SERVER if server else SpanKind.INTERNAL
+  with trace.get_tracer(TRACER_NAME).start_as_current_span(name, kind=kind, attributes=attributes):
+    yield
+
+
+@contextlib.contextmanager
+def tool_call_span(name: str) -> Iterator[Dict[str, Any]]:
+  """
+  Trace an MCP tool call and yield the ``_meta`` fields to send with it.
+
+  The fields carry the W3C trace context, so the server's spans for the call
+  join this trace across the stdio or SSE transport.
+  """
+  carrier: Dict[str, Any] = {}
+  if trace is None:
+    yield carrier
+    return
+  tracer = trace.get_tracer(TRACER_NAME)
+  with tracer.start_as_current_span(f"tools/call {name}", kind=SpanKind.CLIENT, attributes={"mcp.tool.name": name}):
+    propagate.inject(carrier)
+    yield carrier
@@ -0,0 +1,113 @@
+# Copyright CNOE Contributors (https://cnoe.io)
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Per-call latency of make_api_request against a local stub Komodor API.
+
+Compares the previous behaviour (a new httpx.AsyncClient, and therefore a new
+connection, for every call) with the shared, pooled client.
+
+Usage:
+  python benchmarks/bench_api_client.py --requests 500 --concurrency 10
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "agent_komodor" / "protocol_bindings" / "mcp_server"))
+
+PAYLOAD = json.dumps({"data": {"clusters": [{"name": f"cluster-{i}", "tags": ["prod"]} for i in range(20)]}}).encode()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+  """Minimal keep-alive capable JSON endpoint."""
+
+  protocol_version = "HTTP/1.1"
+
+  def do_GET(self):
+    self.send_response(200)
+    self.send_header("Content-Type", "application/json")
+    self.send_header("Content-Length", str(len(PAYLOAD)))
+    self.end_headers()
+    self.wfile.write(PAYLOAD)
+
+  def log_message(self, format, *args):
+    pass
+
+
+def start_stub_server() -> ThreadingHTTPServer:
+  server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+  server.daemon_threads = True
+  threading.Thread(target=server.serve_forever, daemon=True).start()
+  return server
+
+
+async def per_call_client(path: str) -> None:
+  """The previous make_api_request behaviour: one client per call."""
+  async with httpx.AsyncClient(timeout=30) as client:
+    response = await client.get(f"{os.environ['KOMODOR_API_URL']}{path}", headers={"X-API-KEY": "bench"})
+    response.json()
+
+
+async def run(call, total: int, concurrency: int) -> list[float]:
+  semaphore = asyncio.Semaphore(concurrency)
+  latencies: list[float] = []
+
+  async def one():
+    async with semaphore:
+      start = time.perf_counter()
+      await call("/api/v2/clusters")
+      latencies.append((time.perf_counter() - start) * 1000)
+
+  await asyncio.gather(*(one() for _ in range(total)))
+  return latencies
+
+
+def report(label: str, latencies: list[float]) -> None:
+  latencies = sorted(latencies)
+  p95 = latencies[int(len(latencies) * 0.95) - 1]
+  print(f"{label:<24} mean={statistics.mean(latencies):7.3f}ms  p50={statistics.median(latencies):7.3f}ms  p95={p95:7.3f}ms")
+
+
+async def main(total: int, concurrency: int) -> None:
+  server = start_stub_server()
+  os.environ["KOMODOR_API_URL"] = f"http://127.0.0.1:{server.server_address[1]}"
+  os.environ.setdefault("KOMODOR_TOKEN", "bench")
+
+  import logging
+  logging.disable(logging.CRITICAL)
+  from mcp_komodor.api.client import close_http_client, make_api_request
+
+  async def shared_client(path: str) -> None:
+    success, _ = await make_api_request(path)
+    assert success
+
+  # Warm up both paths once so import and first-connection costs are excluded
+  await per_call_client("/api/v2/clusters")
+  await shared_client("/api/v2/clusters")
+
+  print(f"{total} requests, concurrency {concurrency}, stub API at {os.environ['KOMODOR_API_URL']}")
+  report("before (client per call)", await run(per_call_client, total, concurrency))
+  report("after (shared client)", await run(shared_client, total, concurrency))
+
+  await close_http_client()
+  server.shutdown()
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument("--requests", type=int, default=500)
+  parser.add_argument("--concurrency", type=int, default=10)
+  args = parser.parse_args()
+  asyncio.run(main(args.requests, args.concurrency))
@@ -0,0 +1,66 @@
+# Copyright CNOE Contributors (https://cnoe.io)
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+JSON handling cost of one tool call, per codec.
+
+For each fixture in benchmarks/fixtures the benchmark times what the MCP server
+does with an API response: parse the body, then serialize the tool result for
+the transport. The previous path parsed with the standard library and let
+FastMCP re-encode the result as indented JSON with pydantic. The codec path
+parses and encodes once with mcp_komodor.api.codec, using each available
+backend.
+
+Usage:
+  python benchmarks/bench_json_codec.py --repeat 200
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import pydantic_core
+
+ROOT = Path(__file__).resolve().parent.parent
+FIXTURES_DIR = ROOT / "benchmarks" / "fixtures"
+sys.path.insert(0, str(ROOT / "agent_komodor" / "protocol_bindings" / "mcp_server"))
+
+from mcp_komodor.api import codec  # noqa: E402
+
+
+def previous(body: bytes) -> str:
+  return pydantic_core.to_json(json.loads(body), fallback=str, indent=2).decode()
+
+
+def with_codec(body: bytes) -> str:
+  return codec.dumps_str(codec.loads(body))
+
+
+def time_per_call(fn, body: bytes, repeat: int) -> float:
+  timings = []
+  for _ in range(repeat):
+    start = time.perf_counter()
+    fn(body)
+    timings.append(time.perf_counter() - start)
+  return statistics.median(timings) * 1000
+
+
+def main(repeat: int) -> None:
+  backends = ["json"] + (["orjson"] if codec.orjson is not None else [])
+  print(f"{'fixture':<24}{'KB':>6}{'previous ms':>13}" + "".join(f"{b + ' ms':>12}" for b in backends))
+  for path in sorted(FIXTURES_DIR.glob("*.json")):
+    body = json.dumps(json.loads(path.read_text())).encode()
+    line = f"{path.stem:<24}{len(body) / 1024:>6.0f}{time_per_call(previous, body, repeat):>13.3f}"
+    for backend in backends:
+      codec.CODEC = backend
+      line += f"{time_per_call(with_codec, body, repeat):>12.3f}"
+    print(line)
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument("--repeat", type=int, default=200, help="calls per fixture and path")
+  main(parser.parse_args().repeat)
@@ -0,0 +1,83 @@
+# Copyright CNOE Contributors (https://cnoe.io)
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Cold-start cost of the MCP server with lazy and eager tool registration.
+
+Each mode runs in a fresh interpreter under ``python -X importtime``, builds the
+server and answers one tools/list, then reports wall time, the time spent
+registering tools, how many mcp_komodor modules were loaded and the slowest
+imports. ``-X importtime`` does not see ``importlib.import_module``, so tool
+modules are counted from ``sys.modules`` instead.
+
+Usage:
+  python benchmarks/bench_mcp_startup.py --runs 5
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+MCP_SERVER_DIR = ROOT / "agent_komodor" / "protocol_bindings" / "mcp_server"
+
+STARTUP = """
+import asyncio, sys, time
+start = time.perf_counter()
+from mcp.server.fastmcp import FastMCP
+from mcp_komodor.registry import register_tools
+mcp = FastMCP("bench")
+registering = time.perf_counter()
+register_tools(mcp, lazy={lazy})
+registered = time.perf_counter()
+tools = asyncio.run(mcp.list_tools())
+loaded = sum(name.startswith("mcp_komodor") for name in sys.modules)
+print((time.perf_counter() - start) * 1000, (registered - registering) * 1000, len(tools), loaded)
+"""
+
+
+def parse_importtime(stderr: str) -> dict[str, int]:
+  """Map each imported module to its cumulative import time in microseconds."""
+  times = {}
+  for line in stderr.splitlines():
+    if not line.startswith("import time:") or "cumulative" in line:
+      continue
+    _, cumulative, module = (part.strip() for part in line[len("import time:"):].split("|"))
+    times[module] = int(cumulative)
+  return times
+
+
+def run_once(lazy: bool) -> tuple[float, float, int, int, dict[str, int]]:
+  env = dict(os.environ, KOMODOR_API_URL="https://komodor.test", KOMODOR_TOKEN="bench")
+  result = subprocess.run(
+    [sys.executable, "-X", "importtime", "-c", STARTUP.format(lazy=lazy)],
+    cwd=MCP_SERVER_DIR,
+    env=env,
+    capture_output=True,
+    text=True,
+    check=True,
+  )
+  wall_ms, register_ms, tools, loaded = result.stdout.split()
+  return float(wall_ms), float(register_ms), int(tools), int(loaded), parse_importtime(result.stderr)
+
+
+def report(label: str, lazy: bool, runs: int, top: int) -> None:
+  samples = [run_once(lazy) for _ in range(runs)]
+  wall = statistics.median(s[0] for s in samples)
+  register = statistics.median(s[1] for s in samples)
+  _, _, tools, loaded, imports = samples[-1]
+  print(f"{label:<6} tools={tools}  wall(p50)={wall:7.1f}ms  register_tools(p50)={register:7.1f}ms  mcp_komodor modules loaded={loaded}")
+  for module, t in sorted(imports.items(), key=lambda item: item[1], reverse=True)[:top]:
+    print(f"         {t / 1000:8.1f}ms  {module}")
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument("--runs", type=int, default=5)
+  parser.add_argument("--top", type=int, default=5, help="number of slowest top-level imports to list")
+  args = parser.parse_args()
+  report("eager", False, args.runs, args.top)
+  report("lazy", True, args.runs, args.top)
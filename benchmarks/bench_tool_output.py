@@ -0,0 +1,130 @@
+# Copyright CNOE Contributors (https://cnoe.io)
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Size of list tool results as JSON and as tables.
+
+Each fixture in benchmarks/fixtures is a recorded-shape response of a list tool
+(services and jobs search, k8s events search, health risks). The benchmark
+shapes it once as JSON and once with output_format="table", serializes both
+the way the MCP server hands tool results to the model (compact JSON from the
+shared codec), and reports characters, tokens and the time spent encoding.
+Both encodings go through the same serializer, so the ratio measures only the
+shaping. Tokens are counted with tiktoken's cl100k_base when it
+is available, otherwise estimated like the projection layer does.
+
+With --llm a ReAct agent on the model configured for the agent (LLM_PROVIDER
+and its credentials) answers the same question over both encodings: it calls
+a tool that returns the encoded fixture and answers from the tool message.
+The median latency of the whole agent run is reported as well.
+
+Usage:
+  python benchmarks/bench_tool_output.py
+  python benchmarks/bench_tool_output.py --llm --runs 3
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+FIXTURES_DIR = ROOT / "benchmarks" / "fixtures"
+sys.path.insert(0, str(ROOT / "agent_komodor" / "protocol_bindings" / "mcp_server"))
+# The fixtures are encoded locally; the API client only needs these to import
+os.environ.setdefault("KOMODOR_API_URL", "https://komodor.test")
+os.environ.setdefault("KOMODOR_TOKEN", "bench")
+
+from mcp_komodor.api import codec  # noqa: E402
+from mcp_komodor.api.projection import estimate_tokens, shape_response  # noqa: E402
+
+QUESTION = "List the names of the items that look unhealthy or failing, one per line. Answer with the list only."
+
+
+def count_tokens():
+  try:
+    import tiktoken
+
+    encoding = tiktoken.get_encoding("cl100k_base")
+  except Exception:
+    # Not installed, or the encoding cannot be downloaded
+    return "estimate (4 characters per token)", estimate_tokens
+  return "cl100k_base", lambda text: len(encoding.encode(text))
+
+
+def serialize(response) -> str:
+  """Serialize a tool result the way registry.wrap_tool does, as compact JSON from the shared codec."""
+  return codec.dumps_str(response)
+
+
+def encode(response, output_format: str, repeat: int = 20) -> tuple[str, float]:
+  start = time.perf_counter()
+  for _ in range(repeat):
+    text = serialize(shape_response(response, output_format=output_format))
+  return text, (time.perf_counter() - start) / repeat * 1000
+
+
+def fixture_tool(text: str):
+  """Return a list tool whose result is the encoded fixture."""
+  from langchain_core.tools import tool
+
+  @tool
+  async def list_items() -> str:
+    """List the items the question is about."""
+    return text
+
+  return list_items
+
+
+async def agent_latency(llm, text: str, runs: int) -> float:
+  """Median time for a ReAct agent to call the tool and answer from its result."""
+  from langgraph.prebuilt import create_react_agent
+
+  agent = create_react_agent(llm, [fixture_tool(text)], prompt="Call list_items once, then answer from its result.")
+  timings = []
+  for _ in range(runs):
+    start = time.perf_counter()
+    await agent.ainvoke({"messages": [("user", QUESTION)]})
+    timings.append(time.perf_counter() - start)
+  return statistics.median(timings)
+
+
+async def main(args: argparse.Namespace) -> None:
+  tokenizer, tokens = count_tokens()
+  llm = None
+  if args.llm:
+    from cnoe_agent_utils import LLMFactory
+
+    llm = LLMFactory().get_llm()
+
+  header = f"{'fixture':<24}{'format':<8}{'chars':>9}{'tokens':>9}{'ratio':>7}{'encode ms':>11}"
+  print(f"tokens counted with {tokenizer}")
+  print(header + (f"{'agent s':>9}" if llm else ""))
+  print("-" * (len(header) + (9 if llm else 0)))
+  totals = {"json": 0, "table": 0}
+  for path in sorted(FIXTURES_DIR.glob("*.json")):
+    response = json.loads(path.read_text())
+    baseline = None
+    for output_format in ("json", "table"):
+      text, encode_ms = encode(response, output_format)
+      count = tokens(text)
+      totals[output_format] += count
+      baseline = baseline or count
+      line = f"{path.stem:<24}{output_format:<8}{len(text):>9}{count:>9}{baseline / count:>6.1f}x{encode_ms:>11.2f}"
+      if llm:
+        line += f"{await agent_latency(llm, text, args.runs):>9.2f}"
+      print(line)
+  print(f"\ntotal tokens: json {totals['json']}, table {totals['table']} ({totals['json'] / totals['table']:.1f}x fewer)")
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument(
+    "--llm", action="store_true", help="also time a ReAct agent on the configured LLM answering over each encoding"
+  )
+  parser.add_argument("--runs", type=int, default=3, help="agent runs per fixture and format")
+  asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,46 @@
+# Copyright CNOE Contributors (https://cnoe.io)
+# SPDX-License-Identifier: Apache-2.0
+
+import functools
+import os
+import sys
+from pathlib import Path
+
+import httpx
+import pytest_asyncio
+
+# The MCP server is its own project and imports itself as the top-level
+# ``mcp_komodor`` package, so make it importable the same way it is when
+# launched with ``uv run``.
+MCP_SERVER_DIR = Path(__file__).resolve().parent.parent / "agent_komodor" / "protocol_bindings" / "mcp_server"
+sys.path.insert(0, str(MCP_SERVER_DIR))
+
+# mcp_komodor.api.client reads these at import time
+os.environ.setdefault("KOMODOR_API_URL", "https://komodor.test")
+os.environ.setdefault("KOMODOR_TOKEN", "test-token")
+
+
+@pytest_asyncio.fixture
+async def transport(monkeypatch):
+    """Route the shared API client through an in-memory transport and record requests."""
+    from mcp_komodor.api import circuit_breaker, client
+    from mcp_komodor.api.cache import ResponseCache
+
+    requests = []
+    responses = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        factory = responses.get(request.url.path)
+        if factory is None:
+            return httpx.Response(200, json={"path": request.url.path})
+        return factory(request)
+
+    mock = httpx.MockTransport(handler)
+    mock.requests = requests
+    mock.responses = responses
+    monkeypatch.setattr(client.httpx, "AsyncClient", functools.partial(httpx.AsyncClient, transport=mock))
+    monkeypatch.setattr(circuit_breaker, "_breakers", {})
+    monkeypatch.setattr(client, "response_cache", ResponseCache())
+    yield mock
+    await client.close_http_client()
@@ -0,0 +1,26 @@
+# Copyright CNOE Contributors (https://cnoe.io)
+# SPDX-License-Identifier: Apache-2.0
+
+"""Minimal stdio MCP server used to exercise the MCP session pool."""
+
+import os
+
+from mcp.server.fastmcp import FastMCP
+
+mcp = FastMCP("echo")
+
+
+@mcp.tool()
+async def echo(text: str) -> str:
+    """Echo the text back."""
+    return text
+
+
+@mcp.tool()
+async def server_pid() -> int:
+    """Return the server's process id."""
+    return os.getpid()
+
+
+if __name__ == "__main__":
+    mcp.run()
@@ -0,0 +1,132 @@
+# Copyright CNOE Contributors (https://cnoe.io)
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+
+from agent_komodor.mcp_pool import MCPSessionPool, load_tool_manifest
+from agent_komodor.protocol_bindings.a2a_server.startup import AgentStartup
+
+ECHO_SERVER = str(Path(__file__).parent / "fixtures" / "echo_mcp_server.py")
+ECHO_CONNECTION = {"command": sys.executable, "args": [ECHO_SERVER], "transport": "stdio"}
+
+
+class FakeAgent:
+  def __init__(self, error=None):
+    self.graph = None
+    self.error = error
+    self.release = asyncio.Event()
+
+  @property
+  def ready(self):
+    return self.graph is not None
+
+  async def startup(self):
+    await self.release.wait()
+    if self.error:
+      raise self.error
+    self.graph = object()
+
+
+async def _get(app, path):
+  async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://agent") as client:
+    return await client.get(path)
+
+
+@pytest.mark.asyncio
+async def test_readiness_follows_startup_in_the_background():
+  agent = FakeAgent()
+  startup = AgentStartup(agent)
+  app = Starlette(routes=startup.routes)
+
+  async with startup.lifespan(app):
+    assert (await _get(app, "/healthz")).status_code == 200
+    response = await _get(app, "/readyz")
+    assert (response.status_code, response.json()) == (503, {"status": "starting"})
+
+    agent.release.set()
+    await asyncio.sleep(0)
+
+    response = await _get(app, "/readyz")
+    assert (response.status_code, response.json()) == (200, {"status": "ready"})
+
+
+@pytest.mark.asyncio
+async def test_failed_startup_is_reported():
+  agent = FakeAgent(error=ValueError("KOMODOR_TOKEN must be set as an environment variable."))
+  agent.release.set()
+  startup = AgentStartup(agent)
+  app = Starlette(routes=startup.routes)
+
+  async with startup.lifespan(app):
+    await asyncio.sleep(0)
+    response = await _get(app, "/readyz")
+
+  assert response.status_code == 503
+  assert response.json() == {"status": "failed", "error": "KOMODOR_TOKEN must be set as an environment variable."}
+
+
+@pytest.mark.asyncio
+async def test_shutdown_cancels_a_pending_startup():
+  agent = FakeAgent()
+  startup = AgentStartup(agent)
+
+  async with startup.lifespan(Starlette()):
+    pass
+
+  assert startup._task.cancelled()
+  assert not agent.ready
+
+
+def _pool_agent(monkeypatch, pool):
+  from agent_komodor.protocol_bindings.a2a_server import agent as a2a_agent
+
+  model = MagicMock()
+  monkeypatch.setattr(a2a_agent, "LLMFactory", lambda: MagicMock(get_llm=lambda: model))
+  monkeypatch.setattr(a2a_agent, "get_mcp_pool", lambda: pool)
+  create_react_agent = MagicMock(return_value="graph")
+  monkeypatch.setattr(a2a_agent, "create_react_agent", create_react_agent)
+  return a2a_agent.KomodorAgent(), model, create_react_agent
+
+
+@pytest.mark.asyncio
+async def test_agent_startup_builds_the_graph_from_the_manifest_without_calling_the_model(monkeypatch):
+  from mcp_komodor import registry
+
+  pool = MCPSessionPool(ECHO_CONNECTION, tools=load_tool_manifest(registry.MANIFEST_PATH), restart_delay=0.1)
+  agent, model, create_react_agent = _pool_agent(monkeypatch, pool)
+  try:
+    assert not agent.ready
+    await agent.startup()
+    await agent.startup()
+  finally:
+    await pool.aclose()
+
+  assert agent.ready
+  create_react_agent.assert_called_once()
+  assert len(create_react_agent.call_args.args[1]) == len(registry.TOOLS)
+  assert model.mock_calls == []
+
+
+@pytest.mark.asyncio
+async def test_agent_tool_calls_reuse_a_pooled_session(monkeypatch):
+  pool = MCPSessionPool(ECHO_CONNECTION, restart_delay=0.1)
+  agent, _, create_react_agent = _pool_agent(monkeypatch, pool)
+  try:
+    await agent.startup()
+    server_pid = next(t for t in create_react_agent.call_args.args[1] if t.name == "server_pid")
+
+    first = await server_pid.ainvoke({})
+    second = await server_pid.ainvoke({})
+    spawns = pool.stats()["sessions"][0]["spawns"]
+  finally:
+    await pool.aclose()
+
+  assert first == second
+  assert spawns == 1
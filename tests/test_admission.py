@@ -0,0 +1,164 @@
+# Copyright CNOE Contributors (https://cnoe.io)
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+
+import pytest
+from a2a.types import Message, Part, Role, TaskState, TaskStatusUpdateEvent, TextPart
+
+from agent_komodor.protocol_bindings.a2a_server.admission import AdmissionController, AdmissionError
+from agent_komodor.protocol_bindings.a2a_server.agent_executor import KomodorAgentExecutor
+
+
+async def _run(controller, context_id, order, hold):
+  async with controller.slot(context_id):
+    order.append(context_id)
+    await hold.wait()
+
+
+async def _settle():
+  for _ in range(5):
+    await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_free_slots_go_to_waiting_contexts_in_turn():
+  controller = AdmissionController(max_concurrent=1, max_per_context=0)
+  order, hold = [], asyncio.Event()
+
+  first = asyncio.create_task(_run(controller, "busy", order, hold))
+  await _settle()
+  waiting = [asyncio.create_task(_run(controller, c, order, hold)) for c in ("busy", "busy", "busy", "quiet")]
+  await _settle()
+  assert (controller.running, controller.queued) == (1, 4)
+
+  hold.set()
+  await asyncio.gather(first, *waiting)
+
+  assert order == ["busy", "busy", "quiet", "busy", "busy"]
+  assert controller.stats() == {"running": 0, "queued": 0, "admitted": 5}
+
+
+@pytest.mark.asyncio
+async def test_one_context_cannot_take_every_slot():
+  controller = AdmissionController(max_concurrent=4, max_per_context=1)
+  order, hold = [], asyncio.Event()
+
+  tasks = [asyncio.create_task(_run(controller, c, order, hold)) for c in ("a", "a", "b")]
+  await _settle()
+
+  assert sorted(order) == ["a", "b"]
+  assert (controller.running, controller.queued) == (2, 1)
+  hold.set()
+  await asyncio.gather(*tasks)
+
+
+@pytest.mark.asyncio
+async def test_full_queue_and_timeouts_are_rejected():
+  controller = AdmissionController(max_concurrent=1, max_queued=1, queue_timeout=0.05)
+  order, hold = [], asyncio.Event()
+  running = asyncio.create_task(_run(controller, "a", order, hold))
+  await _settle()
+
+  queued = asyncio.create_task(_run(controller, "b", order, hold))
+  await _settle()
+  with pytest.raises(AdmissionError) as full:
+    await _run(controller, "c", order, hold)
+  with pytest.raises(AdmissionError) as timed_out:
+    await queued
+
+  assert (full.value.reason, timed_out.value.reason) == ("queue_full", "queue_timeout")
+  assert controller.stats()["queued"] == 0
+  hold.set()
+  await running
+  assert controller.stats() == {"running": 0, "queued": 0, "admitted": 1, "rejected_queue_full": 1, "rejected_queue_timeout": 1}
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiters_leave_the_queue():
+  controller = AdmissionController(max_concurrent=1)
+  order, hold = [], asyncio.Event()
+  running = asyncio.create_task(_run(controller, "a", order, hold))
+  await _settle()
+  waiting = asyncio.create_task(_run(controller, "b", order, hold))
+  await _settle()
+
+  waiting.cancel()
+  await _settle()
+  hold.set()
+  await running
+
+  assert order == ["a"]
+  assert (controller.running, controller.queued) == (0, 0)
+
+
+class FakeAgent:
+  def __init__(self):
+    self.release = asyncio.Event()
+
+  async def stream(self, query, context_id):
+    await self.release.wait()
+    yield {"is_task_complete": True, "require_user_input": False, "content": f"answer to {query}"}
+
+
+class RecordingQueue:
+  def __init__(self):
+    self.events = []
+
+  def enqueue_event(self, event):
+    self.events.append(event)
+
+
+class FakeContext:
+  def __init__(self, text):
+    self.message = Message(role=Role.user, parts=[Part(root=TextPart(text=text))], messageId=text, contextId="ctx")
+    self.current_task = None
+
+  def get_user_input(self):
+    return self.message.parts[0].root.text
+
+
+def _executor(admission):
+  executor = KomodorAgentExecutor.__new__(KomodorAgentExecutor)
+  executor.agent = FakeAgent()
+  executor.admission = admission
+  executor._running, executor._cancel_requested = {}, set()
+  return executor
+
+
+def _states(queue):
+  return [e.status.state for e in queue.events if isinstance(e, TaskStatusUpdateEvent)]
+
+
+@pytest.mark.asyncio
+async def test_executor_reports_queued_tasks_as_working():
+  executor = _executor(AdmissionController(max_concurrent=1))
+  first_queue, second_queue = RecordingQueue(), RecordingQueue()
+
+  first = asyncio.create_task(executor.execute(FakeContext("one"), first_queue))
+  await _settle()
+  second = asyncio.create_task(executor.execute(FakeContext("two"), second_queue))
+  await _settle()
+
+  assert _states(second_queue) == [TaskState.working]
+  assert "queued" in second_queue.events[-1].status.message.parts[0].root.text
+  executor.agent.release.set()
+  await asyncio.gather(first, second)
+
+  assert _states(first_queue) == [TaskState.completed]
+  assert _states(second_queue) == [TaskState.working, TaskState.completed]
+
+
+@pytest.mark.asyncio
+async def test_executor_rejects_tasks_that_wait_too_long():
+  executor = _executor(AdmissionController(max_concurrent=1, queue_timeout=0.01))
+  queue = RecordingQueue()
+
+  first = asyncio.create_task(executor.execute(FakeContext("one"), RecordingQueue()))
+  await _settle()
+  await executor.execute(FakeContext("two"), queue)
+  executor.agent.release.set()
+  await first
+
+  assert _states(queue) == [TaskState.working, TaskState.rejected]
+  assert queue.events[-1].final
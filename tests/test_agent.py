@@ -1,7 +1,17 @@
 import pytest
+from unittest.mock import AsyncMock, patch
+
+from agent_komodor import agent as agent_module
 from agent_komodor.agent import _async_komodor_agent
 from agent_komodor.state import AgentState, InputState, Message, MsgType
 
+
+@pytest.fixture(autouse=True)
+def clear_agent_cache():
+    agent_module.invalidate_agent_cache()
+    yield
+    agent_module.invalidate_agent_cache()
+
 @pytest.mark.asyncio
 async def test_async_komodor_agent_success():
     mock_messages = [
@@ -25,7 +35,7 @@ async def test_async_komodor_agent_success():
     # Mock necessary dependencies
     with patch("agent_komodor.agent.os.getenv") as mock_getenv, \
        patch("agent_komodor.agent.LLMFactory") as mock_llm_factory, \
-       patch("agent_komodor.agent.MultiServerMCPClient") as mock_client_class, \
+       patch("agent_komodor.agent.get_mcp_pool") as mock_get_pool, \
        patch("agent_komodor.agent.create_react_agent") as mock_create_agent:
 
       # Configure mocks
@@ -33,9 +43,9 @@ async def test_async_komodor_agent_success():
       mock_llm = AsyncMock()
       mock_llm_factory.return_value.get_llm.return_value = mock_llm
 
-      mock_client = AsyncMock()
-      mock_client.get_tools.return_value = []
-      mock_client_class.return_value = mock_client
+      mock_pool = AsyncMock()
+      mock_pool.get_tools.return_value = []
+      mock_get_pool.return_value = mock_pool
 
       mock_agent = AsyncMock()
       mock_agent.ainvoke.return_value = {
@@ -52,3 +62,32 @@ async def test_async_komodor_agent_success():
       assert len(result["output"].messages) > 0
       assert any(msg.type == MsgType.assistant and "Sync completed successfully" in msg.content
             for msg in result["output"].messages)
+
+
+@pytest.mark.asyncio
+async def test_react_agent_is_compiled_once_per_tool_set():
+    mock_pool = AsyncMock()
+    mock_pool.get_tools.return_value = []
+    mock_pool.tools_fingerprint = "tools-v1"
+
+    with patch("agent_komodor.agent.get_mcp_pool", return_value=mock_pool), \
+       patch("agent_komodor.agent.LLMFactory") as mock_llm_factory, \
+       patch("agent_komodor.agent.create_react_agent") as mock_create_agent:
+
+      first = await agent_module.get_react_agent(prompt="p")
+      second = await agent_module.get_react_agent(prompt="p")
+      assert first is second
+      assert mock_create_agent.call_count == 1
+      assert mock_llm_factory.call_count == 1
+
+      await agent_module.get_react_agent(prompt="other")
+      assert mock_create_agent.call_count == 2
+
+      mock_pool.tools_fingerprint = "tools-v2"
+      await agent_module.get_react_agent(prompt="p")
+      assert mock_create_agent.call_count == 3
+
+      agent_module.invalidate_agent_cache()
+      await agent_module.get_react_agent(prompt="p")
+      assert mock_create_agent.call_count == 4
+      assert mock_llm_factory.call_count == 2
@@ -0,0 +1,303 @@
+# Copyright CNOE Contributors (https://cnoe.io)
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+
+import httpx
+import pytest
+
+from mcp_komodor.api import circuit_breaker, client
+from mcp_komodor.api.cache import ResponseCache, cache_key
+from mcp_komodor.api.rate_limit import RateLimit, TokenBucket
+from mcp_komodor.api.retry import RetryPolicy, parse_retry_after
+
+FAST_RETRY = RetryPolicy(max_attempts=3, base_delay=0.001, max_delay=0.001, deadline=5)
+
+
+def respond_in_sequence(*responses: httpx.Response):
+    """Response factory returning the given responses in order, then repeating the last one."""
+    remaining = list(responses)
+    return lambda request: remaining.pop(0) if len(remaining) > 1 else remaining[0]
+
+
+@pytest.mark.asyncio
+async def test_make_api_request_reuses_shared_client(transport):
+    success, data = await client.make_api_request("/api/v2/clusters")
+    first = client.get_http_client()
+    success2, _ = await client.make_api_request("/api/v2/users")
+
+    assert success and success2
+    assert data == {"path": "/api/v2/clusters"}
+    assert client.get_http_client() is first
+    assert [r.url.path for r in transport.requests] == ["/api/v2/clusters", "/api/v2/users"]
+    assert transport.requests[0].headers["X-API-KEY"] == "test-token"
+
+
+@pytest.mark.asyncio
+async def test_close_http_client_releases_client(transport):
+    await client.make_api_request("/api/v2/clusters")
+    shared = client.get_http_client()
+
+    await client.close_http_client()
+
+    assert shared.is_closed
+    assert client.get_http_client() is not shared
+
+
+@pytest.mark.asyncio
+async def test_make_api_request_reports_error_details(transport):
+    transport.responses["/api/v2/users"] = lambda r: httpx.Response(404, json={"message": "not found"})
+
+    success, data = await client.make_api_request("/api/v2/users")
+
+    assert not success
+    assert data["error"] == "API request failed: 404 - not found"
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_count_responses_by_http_version(transport):
+    await client.make_api_request("/api/v2/clusters")
+    await client.make_api_request("/api/v2/clusters")
+
+    stats = client.get_pool_stats()
+
+    assert stats["responses_by_http_version"]["HTTP/1.1"] >= 2
+
+
+@pytest.mark.asyncio
+async def test_http2_falls_back_to_http1_without_h2(monkeypatch):
+    monkeypatch.setattr(client, "HTTP2_ENABLED", True)
+    monkeypatch.setattr(client.importlib.util, "find_spec", lambda name: None)
+
+    try:
+        client.get_http_client()
+        assert client.get_pool_stats()["http2_enabled"] is False
+    finally:
+        await client.close_http_client()
+
+
+@pytest.mark.asyncio
+async def test_idempotent_request_is_retried_on_5xx(transport):
+    transport.responses["/api/v2/services/search"] = respond_in_sequence(
+        httpx.Response(503), httpx.Response(502), httpx.Response(200, json={"data": []})
+    )
+    before = client.get_retry_stats()
+
+    success, data = await client.make_api_request(
+        "/api/v2/services/search", method="POST", data={"kind": ["Deployment"]}, retry_policy=FAST_RETRY
+    )
+
+    assert success and data == {"data": []}
+    assert len(transport.requests) == 3
+    stats = client.get_retry_stats()
+    assert stats["retries"] - before["retries"] == 2
+    assert stats["retries_by_reason"]["503"] - before["retries_by_reason"].get("503", 0) == 1
+
+
+@pytest.mark.asyncio
+async def test_non_idempotent_request_is_not_retried(transport):
+    transport.responses["/api/v2/klaudia/rca-sessions"] = respond_in_sequence(httpx.Response(503))
+
+    success, data = await client.make_api_request("/api/v2/klaudia/rca-sessions", method="POST", retry_policy=FAST_RETRY)
+
+    assert not success
+    assert data["error"] == "API request failed: 503 - "
+    assert len(transport.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_retries_stop_when_retry_after_exceeds_deadline(transport):
+    transport.responses["/api/v2/clusters"] = respond_in_sequence(
+        httpx.Response(429, headers={"Retry-After": "3600"}, json={"message": "slow down"})
+    )
+
+    success, data = await client.make_api_request("/api/v2/clusters", retry_policy=FAST_RETRY)
+
+    assert not success
+    assert data["error"] == "API request failed: 429 - slow down"
+    assert len(transport.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_timeouts_are_retried(transport):
+    def flaky(request):
+        if len(transport.requests) == 1:
+            raise httpx.ReadTimeout("timed out", request=request)
+        return httpx.Response(200, json={"ok": True})
+
+    transport.responses["/api/v2/clusters"] = flaky
+
+    success, data = await client.make_api_request("/api/v2/clusters", retry_policy=FAST_RETRY)
+
+    assert success and data == {"ok": True}
+    assert len(transport.requests) == 2
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("2") == 2.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_serves_callers_in_arrival_order():
+    bucket = TokenBucket("/test-fifo/", RateLimit(rate=100, burst=1))
+    order = []
+
+    async def call(i):
+        await bucket.acquire()
+        order.append(i)
+
+    await asyncio.gather(*(call(i) for i in range(5)))
+
+    assert order == [0, 1, 2, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_requests_queue_behind_rate_limit(transport, monkeypatch):
+    monkeypatch.setattr(client, "RATE_LIMITS", {"/api/v2/": RateLimit(rate=50, burst=2), "/mgmt/v1/": RateLimit(rate=50, burst=2)})
+    monkeypatch.setattr(client, "_rate_limiter", None)
+    before = client.get_rate_limiter().stats()["/api/v2/"]
+
+    results = await asyncio.gather(*(client.make_api_request("/api/v2/clusters", params={"clusterName": [str(i)]}) for i in range(6)))
+    await client.make_api_request("/mgmt/v1/rbac/roles")
+
+    assert all(success for success, _ in results)
+    stats = client.get_rate_limit_stats()
+    assert stats["/api/v2/"]["requests"] - before["requests"] == 6
+    assert stats["/api/v2/"]["queued"] - before["queued"] == 4
+    assert stats["/api/v2/"]["max_wait_seconds"] > 0
+    assert stats["/api/v2/"]["waiting"] == 0
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_after_consecutive_failures_and_fails_fast(transport, monkeypatch):
+    monkeypatch.setattr(circuit_breaker, "CIRCUIT_FAILURE_THRESHOLD", 2)
+    transport.responses["/mgmt/v1/rbac/roles"] = respond_in_sequence(httpx.Response(503))
+
+    for _ in range(2):
+        await client.make_api_request("/mgmt/v1/rbac/roles", method="POST")
+    success, data = await client.make_api_request("/mgmt/v1/rbac/roles", method="POST")
+
+    assert not success
+    assert data["upstream_unavailable"] is True
+    assert data["endpoint_family"] == "/mgmt/v1/"
+    assert data["retry_after_seconds"] > 0
+    assert len(transport.requests) == 2
+
+    # Other endpoint families are unaffected
+    assert (await client.make_api_request("/api/v2/clusters"))[0]
+
+    stats = client.get_circuit_breaker_stats()["/mgmt/v1/"]
+    assert stats["state"] == "open"
+    assert stats["rejected"] == 1
+    assert stats["transitions"] == {"closed->open": 1}
+
+
+@pytest.mark.asyncio
+async def test_half_open_trial_closes_circuit(transport, monkeypatch):
+    monkeypatch.setattr(circuit_breaker, "CIRCUIT_FAILURE_THRESHOLD", 1)
+    monkeypatch.setattr(circuit_breaker, "CIRCUIT_RECOVERY_TIMEOUT", 0)
+    transport.responses["/api/v2/clusters"] = respond_in_sequence(httpx.Response(500), httpx.Response(200, json={}))
+
+    assert not (await client.make_api_request("/api/v2/clusters", retry_policy=client.NO_RETRY))[0]
+    assert client.get_circuit_breaker_stats()["/api/v2/"]["state"] == "open"
+
+    assert (await client.make_api_request("/api/v2/clusters"))[0]
+
+    stats = client.get_circuit_breaker_stats()["/api/v2/"]
+    assert stats["state"] == "closed"
+    assert stats["transitions"] == {"closed->open": 1, "open->half_open": 1, "half_open->closed": 1}
+
+
+@pytest.mark.asyncio
+async def test_get_responses_are_cached_with_normalized_params(transport):
+    first = await client.make_api_request("/api/v2/clusters", params={"clusterName": ["b", "a"], "tags": None}, cache_ttl=60)
+    second = await client.make_api_request("/api/v2/clusters", params={"clusterName": ["a", "b"]}, cache_ttl=60)
+    uncached = await client.make_api_request("/api/v2/clusters", params={"clusterName": ["a", "b"]})
+
+    assert first == second == uncached
+    assert len(transport.requests) == 2
+    assert client.get_cache_stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_successful_mutation_invalidates_related_families(transport):
+    for path in ["/mgmt/v1/rbac/roles", "/api/v2/users", "/api/v2/clusters"]:
+        await client.make_api_request(path, cache_ttl=60)
+
+    await client.make_api_request("/api/v2/services/search", method="POST")
+    assert client.get_cache_stats()["entries"] == 3
+
+    await client.make_api_request("/mgmt/v1/rbac/roles", method="POST", data={"name": "viewer"})
+
+    assert client.get_cache_stats()["entries"] == 1
+    requests_before = len(transport.requests)
+    await client.make_api_request("/api/v2/clusters", cache_ttl=60)
+    await client.make_api_request("/api/v2/users", cache_ttl=60)
+    assert len(transport.requests) == requests_before + 1
+
+
+def test_response_cache_expires_and_evicts_least_recently_used():
+    cache = ResponseCache(max_entries=2)
+    cache.set(cache_key("/a"), "a", ttl=60)
+    cache.set(cache_key("/b"), "b", ttl=60)
+    cache.get(cache_key("/a"))
+    cache.set(cache_key("/c"), "c", ttl=60)
+
+    assert cache.get(cache_key("/a")) == "a"
+    assert cache.get(cache_key("/b")) is None
+    assert cache.stats()["evictions"] == 1
+
+    cache.set(cache_key("/d"), "d", ttl=0)
+    assert cache.get(cache_key("/d")) is None
+    assert cache.stats()["expired"] == 1
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_reads_share_one_request(transport):
+    release = asyncio.Event()
+
+    async def slow_handler(request):
+        await release.wait()
+        return httpx.Response(200, json={"data": [request.url.path]})
+
+    transport.responses["/api/v2/services/search"] = slow_handler
+    before = client.get_single_flight_stats()
+
+    body = {"kind": ["Deployment"], "cluster": None}
+    search = [client.make_api_request("/api/v2/services/search", method="POST", data=body) for _ in range(3)]
+    other = client.make_api_request("/api/v2/services/search", method="POST", data={"kind": ["StatefulSet"]})
+    gathered = asyncio.gather(*search, other)
+    await asyncio.sleep(0.01)
+    release.set()
+    results = await gathered
+
+    assert results[0] == results[1] == results[2]
+    assert results[0][1] is results[1][1]
+    stats = client.get_single_flight_stats()
+    assert stats["sent"] - before["sent"] == 2
+    assert stats["coalesced"] - before["coalesced"] == 2
+    assert stats["in_flight"] == 0
+    assert len(transport.requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_request(transport):
+    release = asyncio.Event()
+
+    async def slow_handler(request):
+        await release.wait()
+        return httpx.Response(200, json={"ok": True})
+
+    transport.responses["/api/v2/health/risks"] = slow_handler
+
+    first = asyncio.ensure_future(client.make_api_request("/api/v2/health/risks"))
+    second = asyncio.ensure_future(client.make_api_request("/api/v2/health/risks"))
+    await asyncio.sleep(0.01)
+    first.cancel()
+    release.set()
+
+    assert await second == (True, {"ok": True})
+    assert len(transport.requests) == 1
@@ -0,0 +1,196 @@
+# Copyright CNOE Contributors (https://cnoe.io)
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+
+import pytest
+from a2a.server.request_handlers import DefaultRequestHandler
+from a2a.server.tasks import InMemoryTaskStore
+from a2a.types import (
+  Message,
+  MessageSendParams,
+  Part,
+  Role,
+  Task,
+  TaskIdParams,
+  TaskState,
+  TaskStatus,
+  TaskStatusUpdateEvent,
+  TextPart,
+)
+from a2a.utils.errors import ServerError
+from langchain_core.messages import AIMessage, ToolMessage
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.graph import END, START, MessagesState, StateGraph
+from mcp.server.fastmcp import FastMCP
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from agent_komodor.mcp_pool import call_tool_with_meta
+from agent_komodor.protocol_bindings.a2a_server.admission import AdmissionController
+from agent_komodor.protocol_bindings.a2a_server.agent import KomodorAgent
+from agent_komodor.protocol_bindings.a2a_server.agent_executor import KomodorAgentExecutor
+from mcp_komodor import registry
+from mcp_komodor.cancellation import handle_cancelled_requests
+
+
+class HangingAgent:
+  """Streams one progress update, then waits until cancelled."""
+
+  def __init__(self):
+    self.started = asyncio.Event()
+    self.cancelled = asyncio.Event()
+
+  async def stream(self, query, context_id):
+    yield {"is_task_complete": False, "require_user_input": False, "content": "Looking up..."}
+    self.started.set()
+    try:
+      await asyncio.Event().wait()
+    except asyncio.CancelledError:
+      self.cancelled.set()
+      raise
+
+
+def _executor(admission=None):
+  executor = KomodorAgentExecutor.__new__(KomodorAgentExecutor)
+  executor.agent = HangingAgent()
+  executor.admission = admission or AdmissionController()
+  executor._running, executor._cancel_requested = {}, set()
+  return executor
+
+
+def _send(handler, text, context_id="ctx"):
+  message = Message(role=Role.user, parts=[Part(root=TextPart(text=text))], messageId=text, contextId=context_id)
+  return handler.on_message_send_stream(MessageSendParams(message=message))
+
+
+async def _collect(events, into):
+  async for event in events:
+    into.append(event)
+
+
+async def _first_task_id(events):
+  while not events:
+    await asyncio.sleep(0.01)
+  return events[0].id
+
+
+@pytest.mark.asyncio
+async def test_cancel_stops_the_running_task():
+  executor = _executor()
+  handler = DefaultRequestHandler(agent_executor=executor, task_store=InMemoryTaskStore())
+  events = []
+  streaming = asyncio.create_task(_collect(_send(handler, "list clusters"), events))
+  await asyncio.wait_for(executor.agent.started.wait(), 5)
+
+  task = await handler.on_cancel_task(TaskIdParams(id=await _first_task_id(events)))
+  await asyncio.wait_for(streaming, 5)
+
+  assert executor.agent.cancelled.is_set()
+  assert task.status.state == TaskState.canceled
+  assert events[-1].status.state == TaskState.canceled and events[-1].final
+  assert executor._running == {} and executor._cancel_requested == set()
+  assert executor.admission.running == 0
+
+
+@pytest.mark.asyncio
+async def test_cancel_removes_a_queued_task():
+  executor = _executor(AdmissionController(max_concurrent=1))
+  handler = DefaultRequestHandler(agent_executor=executor, task_store=InMemoryTaskStore())
+  running = asyncio.create_task(_collect(_send(handler, "first", "a"), []))
+  await asyncio.wait_for(executor.agent.started.wait(), 5)
+  queued_events = []
+  queued = asyncio.create_task(_collect(_send(handler, "second", "b"), queued_events))
+  while executor.admission.queued == 0:
+    await asyncio.sleep(0.01)
+
+  task = await handler.on_cancel_task(TaskIdParams(id=await _first_task_id(queued_events)))
+  await asyncio.wait_for(queued, 5)
+
+  assert task.status.state == TaskState.canceled
+  assert (executor.admission.running, executor.admission.queued) == (1, 0)
+  running.cancel()
+
+
+class CancelContext:
+  def __init__(self, state):
+    self.current_task = Task(id="task-1", contextId="ctx", status=TaskStatus(state=state))
+    self.task_id = "task-1"
+
+
+@pytest.mark.asyncio
+async def test_tasks_that_are_not_running_are_marked_canceled_unless_finished():
+  executor, events = _executor(), []
+  queue = type("Queue", (), {"enqueue_event": lambda self, event: events.append(event)})()
+
+  await executor.cancel(CancelContext(TaskState.input_required), queue)
+  with pytest.raises(ServerError):
+    await executor.cancel(CancelContext(TaskState.completed), queue)
+
+  assert [e.status.state for e in events if isinstance(e, TaskStatusUpdateEvent)] == [TaskState.canceled]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_tool_calls_cancel_the_api_request_on_the_server(transport):
+  started, cancelled = asyncio.Event(), asyncio.Event()
+
+  async def hang(request):
+    started.set()
+    try:
+      await asyncio.Event().wait()
+    except asyncio.CancelledError:
+      cancelled.set()
+      raise
+
+  transport.responses["/api/v2/clusters"] = hang
+  mcp = FastMCP("cancellation")
+  registry.register_tools(mcp)
+  handle_cancelled_requests(mcp)
+
+  async with create_connected_server_and_client_session(mcp._mcp_server) as session:
+    call = asyncio.create_task(call_tool_with_meta(session, "get_api_v2_clusters", {}))
+    await asyncio.wait_for(started.wait(), 5)
+    call.cancel()
+    await asyncio.wait_for(cancelled.wait(), 5)
+
+    with pytest.raises(asyncio.CancelledError):
+      await call
+    # The session survives the cancellation and serves the next call
+    del transport.responses["/api/v2/clusters"]
+    result = await asyncio.wait_for(call_tool_with_meta(session, "get_api_v2_clusters", {}), 5)
+
+  assert not result.isError
+
+
+@pytest.mark.asyncio
+async def test_cancelled_runs_leave_no_unanswered_tool_calls():
+  tool_started = asyncio.Event()
+
+  async def agent_node(state):
+    return {"messages": [AIMessage(content="", tool_calls=[{"name": "get_api_v2_clusters", "args": {}, "id": "call-1"}])]}
+
+  async def tools_node(state):
+    tool_started.set()
+    await asyncio.Event().wait()
+
+  builder = StateGraph(MessagesState)
+  builder.add_node("agent", agent_node)
+  builder.add_node("tools", tools_node)
+  builder.add_edge(START, "agent")
+  builder.add_edge("agent", "tools")
+  builder.add_edge("tools", END)
+  agent = KomodorAgent.__new__(KomodorAgent)
+  agent.graph = builder.compile(checkpointer=InMemorySaver())
+
+  async def consume():
+    async for _ in agent.stream("list clusters", "ctx-1"):
+      pass
+
+  run = asyncio.create_task(consume())
+  await asyncio.wait_for(tool_started.wait(), 5)
+  run.cancel()
+  with pytest.raises(asyncio.CancelledError):
+    await run
+
+  messages = (await agent.graph.aget_state({"configurable": {"thread_id": "ctx-1"}})).values["messages"]
+  assert isinstance(messages[-1], ToolMessage)
+  assert (messages[-1].tool_call_id, messages[-1].content) == ("call-1", "Cancelled by the user.")
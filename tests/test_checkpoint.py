@@ -0,0 +1,128 @@
+# Copyright CNOE Contributors (https://cnoe.io)
+# SPDX-License-Identifier: Apache-2.0
+
+import importlib.util
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.graph import END, START, MessagesState, StateGraph
+
+from agent_komodor import checkpoint, metrics
+from agent_komodor.checkpoint import BoundedMemorySaver
+
+TOOL_OUTPUT = "apiVersion: apps/v1\n" * 1000
+
+
+def _graph(saver):
+  """A two-step graph that answers every message with a large tool result and a reply."""
+  builder = StateGraph(MessagesState)
+  builder.add_node("tool", lambda state: {"messages": [ToolMessage(content=TOOL_OUTPUT, tool_call_id="1")]})
+  builder.add_node("reply", lambda state: {"messages": [AIMessage(content="done")]})
+  builder.add_edge(START, "tool")
+  builder.add_edge("tool", "reply")
+  builder.add_edge("reply", END)
+  return builder.compile(checkpointer=saver)
+
+
+def _chat(graph, thread_id, turns=1):
+  config = {"configurable": {"thread_id": thread_id}}
+  for turn in range(turns):
+    graph.invoke({"messages": [HumanMessage(content=f"turn {turn}")]}, config)
+  return config
+
+
+def test_least_recently_used_conversations_are_evicted():
+  saver = BoundedMemorySaver(max_threads=2)
+  graph = _graph(saver)
+
+  first = _chat(graph, "a")
+  _chat(graph, "b")
+  graph.get_state(first)
+  _chat(graph, "c")
+
+  assert set(saver.storage) == {"a", "c"}
+  assert saver.stats()["evicted_threads"] == 1
+  assert not any(key[0] == "b" for key in saver.blobs)
+
+
+def test_idle_conversations_expire(monkeypatch):
+  now = [1000.0]
+  monkeypatch.setattr(checkpoint.time, "monotonic", lambda: now[0])
+  saver = BoundedMemorySaver(thread_ttl=60)
+  graph = _graph(saver)
+
+  _chat(graph, "idle")
+  now[0] += 61
+  _chat(graph, "active")
+
+  assert set(saver.storage) == {"active"}
+
+
+def test_old_checkpoints_are_pruned_without_losing_the_conversation():
+  saver = BoundedMemorySaver(max_checkpoints=3, max_tool_message_chars=0)
+  graph = _graph(saver)
+
+  config = _chat(graph, "t", turns=4)
+
+  assert saver.stats()["checkpoints"] == 3
+  messages = graph.get_state(config).values["messages"]
+  assert [m.content for m in messages if isinstance(m, HumanMessage)] == [f"turn {i}" for i in range(4)]
+  referenced = {
+    ("t", "", channel, version)
+    for saved in saver.storage["t"][""].values()
+    for channel, version in saver.serde.loads_typed(saved[0])["channel_versions"].items()
+  }
+  assert set(saver.blobs) == referenced
+
+
+def test_tool_messages_are_trimmed_only_in_older_checkpoints():
+  bounded, unbounded = BoundedMemorySaver(max_checkpoints=0, max_tool_message_chars=100), InMemorySaver()
+  config = _chat(_graph(bounded), "t", turns=3)
+  _chat(_graph(unbounded), "t", turns=3)
+
+  latest = _graph(bounded).get_state(config).values["messages"]
+  assert all(m.content == TOOL_OUTPUT for m in latest if isinstance(m, ToolMessage))
+
+  history = list(_graph(bounded).get_state_history(config))
+  older_tool_messages = [m for s in history[1:] for m in s.values.get("messages", []) if isinstance(m, ToolMessage)]
+  assert older_tool_messages
+  assert all(m.content.endswith("characters trimmed from memory]") for m in older_tool_messages)
+
+  stats = bounded.stats()
+  assert stats["trimmed_messages"] > 0
+  assert stats["bytes"] < sum(len(blob[1]) for blob in unbounded.blobs.values()) / 2
+
+
+def test_limits_are_read_from_the_environment(monkeypatch):
+  monkeypatch.setenv("KOMODOR_AGENT_MEMORY_MAX_THREADS", "5")
+  monkeypatch.setenv("KOMODOR_AGENT_MEMORY_MAX_TOOL_MESSAGE_CHARS", "0")
+
+  saver = checkpoint.memory_saver_from_env()
+
+  assert (saver.max_threads, saver.max_tool_message_chars, saver.max_checkpoints) == (5, 0, 10)
+
+
+def test_memory_size_is_exported_as_gauges():
+  prometheus_client = pytest.importorskip("prometheus_client")
+  from agent_komodor.protocol_bindings.a2a_server import agent as a2a_agent
+
+  _chat(_graph(a2a_agent.memory), "gauges")
+
+  assert prometheus_client.REGISTRY.get_sample_value("komodor_agent_memory_threads") >= 1
+  assert prometheus_client.REGISTRY.get_sample_value("komodor_agent_memory_bytes") > 0
+
+
+def test_agent_module_can_be_imported_under_both_names():
+  prometheus_client = pytest.importorskip("prometheus_client")
+  from agent_komodor.protocol_bindings.a2a_server import agent as a2a_agent
+
+  # a2a_server/__main__.py imports it as the top-level module "agent"
+  spec = importlib.util.spec_from_file_location("agent", a2a_agent.__file__)
+  top_level = importlib.util.module_from_spec(spec)
+  spec.loader.exec_module(top_level)
+  try:
+    _chat(_graph(top_level.memory), "second import")
+    assert prometheus_client.REGISTRY.get_sample_value("komodor_agent_memory_threads") == 1
+  finally:
+    metrics.register_memory_stats(a2a_agent.memory)
@@ -0,0 +1,55 @@
+# Copyright CNOE Contributors (https://cnoe.io)
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+
+import httpx
+import pytest
+from mcp.server.fastmcp import FastMCP
+
+from mcp_komodor import registry
+from mcp_komodor.api import codec
+from mcp_komodor.api.client import make_api_request
+
+VALUE = {"name": "café", "tags": ["a", "b"], "count": 3, "ok": True, "missing": None, 1: "non-str key"}
+
+
+@pytest.fixture(params=["orjson", "json"])
+def backend(request, monkeypatch):
+  if request.param == "orjson":
+    pytest.importorskip("orjson")
+  monkeypatch.setattr(codec, "CODEC", request.param)
+  return request.param
+
+
+def test_codecs_round_trip_compact_json(backend):
+  encoded = codec.dumps(VALUE)
+
+  assert b" " not in encoded.replace(b"non-str key", b"")
+  assert "café" in encoded.decode()
+  assert codec.loads(encoded) == {str(key): value for key, value in VALUE.items()}
+  with pytest.raises(ValueError):
+    codec.loads(b"not json")
+
+
+@pytest.mark.asyncio
+async def test_request_body_and_response_use_codec(transport, backend):
+  transport.responses["/api/v2/services/search"] = lambda request: httpx.Response(200, json={"echo": json.loads(request.content)})
+
+  success, response = await make_api_request("/api/v2/services/search", method="POST", data={"kind": ["Deployment"]})
+
+  assert success
+  assert response == {"echo": {"kind": ["Deployment"]}}
+  assert transport.requests[0].headers["Content-Type"] == "application/json"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("lazy", [True, False])
+async def test_tool_results_are_compact_json(transport, lazy):
+  transport.responses["/api/v2/clusters"] = lambda request: httpx.Response(200, json={"data": {"clusters": [{"name": "prod"}]}})
+  mcp = FastMCP("codec")
+  registry.register_tools(mcp, lazy=lazy)
+
+  content = await mcp.call_tool("get_api_v2_clusters", {})
+
+  assert content[0].text == '{"data":{"clusters":[{"name":"prod"}]}}'
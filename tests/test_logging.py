@@ -0,0 +1,54 @@
+# Copyright CNOE Contributors (https://cnoe.io)
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import logging
+
+import httpx
+import pytest
+
+from mcp_komodor import log
+from mcp_komodor.api.client import make_api_request
+
+
+def test_payload_is_capped_and_rendered_lazily():
+  payload = log.Payload({"items": ["x" * 100] * 10}, limit=50)
+
+  text = str(payload)
+
+  assert text.startswith('{"items":["xxx')
+  assert text.endswith("more characters)")
+  assert len(text) < 100
+
+
+@pytest.fixture
+def restore_root_logger():
+  root = logging.getLogger()
+  handlers, level = list(root.handlers), root.level
+  yield
+  root.handlers[:] = handlers
+  root.setLevel(level)
+
+
+def test_configure_logging_uses_env_level_and_json_format(monkeypatch, capsys, restore_root_logger):
+  monkeypatch.setattr(log, "LOG_FORMAT", "json")
+  log.configure_logging("warning")
+
+  logging.getLogger("mcp_komodor").info("hidden")
+  logging.getLogger("mcp_komodor").warning("shown %s", 1)
+
+  lines = capsys.readouterr().err.strip().splitlines()
+  assert [json.loads(line)["message"] for line in lines] == ["shown 1"]
+  assert logging.getLogger("httpx").level == logging.WARNING
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("rate, expected", [(1.0, True), (0.0, False)])
+async def test_request_debug_lines_are_sampled(transport, monkeypatch, caplog, rate, expected):
+  monkeypatch.setattr(log, "LOG_SAMPLE_RATE", rate)
+  transport.responses["/api/v2/clusters"] = lambda request: httpx.Response(200, json={})
+
+  with caplog.at_level(logging.DEBUG, logger="mcp_komodor"):
+    await make_api_request("/api/v2/clusters", params={"clusterName": ["prod"]})
+
+  assert any("Request parameters" in r.getMessage() for r in caplog.records) is expected
@@ -0,0 +1,92 @@
+# Copyright CNOE Contributors (https://cnoe.io)
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import os
+import signal
+import sys
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+from mcp.types import Tool as MCPTool
+
+from agent_komodor.mcp_pool import MCPSessionPool
+
+ECHO_SERVER = str(Path(__file__).parent / "fixtures" / "echo_mcp_server.py")
+ECHO_CONNECTION = {"command": sys.executable, "args": [ECHO_SERVER], "transport": "stdio"}
+
+
+@pytest_asyncio.fixture
+async def pool():
+  pool = MCPSessionPool(
+    ECHO_CONNECTION,
+    health_check_interval=0.2,
+    health_check_timeout=1.0,
+    restart_delay=0.1,
+  )
+  yield pool
+  await pool.aclose()
+
+
+async def call_text(pool: MCPSessionPool, name: str, arguments: dict) -> str:
+  result = await pool.call_tool(name, arguments)
+  return result.content[0].text
+
+
+@pytest.mark.asyncio
+async def test_pool_lists_tools_once_and_reuses_session(pool):
+  tools = await pool.get_tools()
+  assert sorted(t.name for t in tools) == ["echo", "server_pid"]
+  assert await pool.get_tools() is tools
+
+  echo = next(t for t in tools if t.name == "echo")
+  assert await echo.ainvoke({"text": "hello"}) == "hello"
+
+  first = await call_text(pool, "server_pid", {})
+  second = await call_text(pool, "server_pid", {})
+  assert first == second
+  assert pool.stats()["sessions"][0]["spawns"] == 1
+
+
+@pytest.mark.asyncio
+async def test_pool_respawns_crashed_server(pool):
+  pid = int(await call_text(pool, "server_pid", {}))
+  os.kill(pid, signal.SIGKILL)
+
+  for _ in range(100):
+    if pool.stats()["sessions"][0]["spawns"] == 2 and pool.stats()["ready"]:
+      break
+    await asyncio.sleep(0.1)
+
+  assert int(await call_text(pool, "server_pid", {})) != pid
+
+
+@pytest.mark.asyncio
+async def test_pool_invalidate_tools_relists(pool):
+  tools = await pool.get_tools()
+  fingerprint = pool.tools_fingerprint
+
+  await pool.invalidate_tools()
+
+  assert await pool.get_tools() is not tools
+  assert pool.tools_fingerprint == fingerprint
+
+
+@pytest.mark.asyncio
+async def test_pool_seeded_tools_are_replaced_by_live_tool_list():
+  seeded = [MCPTool(name="echo", description="Outdated description.", inputSchema={"type": "object"})]
+  pool = MCPSessionPool(ECHO_CONNECTION, tools=seeded, restart_delay=0.1)
+  changed = asyncio.Event()
+  loop = asyncio.get_running_loop()
+  # Listeners run on the pool's event loop thread
+  pool.add_tools_changed_listener(lambda: loop.call_soon_threadsafe(changed.set))
+  try:
+    # Answered from the seed without waiting for the server to start
+    assert [t.name for t in await pool.get_tools()] == ["echo"]
+    assert pool.stats()["ready"] == 0
+
+    await asyncio.wait_for(changed.wait(), timeout=30)
+    assert sorted(t.name for t in await pool.get_tools()) == ["echo", "server_pid"]
+  finally:
+    await pool.aclose()
@@ -0,0 +1,80 @@
+# Copyright CNOE Contributors (https://cnoe.io)
+# SPDX-License-Identifier: Apache-2.0
+
+from uuid import uuid4
+
+import httpx
+import pytest
+from langchain_core.messages import ToolMessage
+from mcp.server.fastmcp import FastMCP
+
+from mcp_komodor import metrics, registry
+
+prometheus_client = pytest.importorskip("prometheus_client")
+
+
+def _sample(name, **labels):
+  return prometheus_client.REGISTRY.get_sample_value(name, labels) or 0
+
+
+@pytest.mark.asyncio
+async def test_tool_call_and_its_api_requests_are_measured(transport):
+  tool = "get_api_v2_clusters"
+  calls = _sample("komodor_mcp_tool_duration_seconds_count", tool=tool, status="success")
+  requests = _sample("komodor_api_request_duration_seconds_count", tool=tool, status="200")
+  tokens = _sample("komodor_mcp_tool_result_tokens_sum", tool=tool, status="success")
+
+  mcp = FastMCP("metrics")
+  registry.register_tools(mcp)
+  await mcp.call_tool(tool, {})
+
+  assert _sample("komodor_mcp_tool_duration_seconds_count", tool=tool, status="success") == calls + 1
+  assert _sample("komodor_api_request_duration_seconds_count", tool=tool, status="200") == requests + 1
+  assert _sample("komodor_api_response_bytes_count", tool=tool, status="200") >= 1
+  assert _sample("komodor_api_response_parse_seconds_count", tool=tool) >= 1
+  assert _sample("komodor_mcp_tool_result_tokens_sum", tool=tool, status="success") > tokens
+
+
+@pytest.mark.asyncio
+async def test_error_results_are_labelled(transport):
+  tool = "get_api_v2_clusters"
+  transport.responses["/api/v2/clusters"] = lambda request: httpx.Response(404, json={"message": "not found"})
+  errors = _sample("komodor_mcp_tool_duration_seconds_count", tool=tool, status="error")
+
+  mcp = FastMCP("metrics")
+  registry.register_tools(mcp)
+  await mcp.call_tool(tool, {})
+
+  assert _sample("komodor_mcp_tool_duration_seconds_count", tool=tool, status="error") == errors + 1
+  assert _sample("komodor_api_request_duration_seconds_count", tool=tool, status="404") >= 1
+
+
+@pytest.mark.asyncio
+async def test_metrics_route_serves_the_registry():
+  mcp = FastMCP("metrics")
+  metrics.register_metrics_route(mcp)
+
+  async with httpx.AsyncClient(transport=httpx.ASGITransport(app=mcp.sse_app()), base_url="http://mcp") as client:
+    response = await client.get("/metrics")
+
+  assert response.status_code == 200
+  assert "komodor_mcp_tool_duration_seconds" in response.text
+
+
+@pytest.mark.asyncio
+async def test_agent_callback_records_tool_calls():
+  from agent_komodor.metrics import ToolMetricsCallback
+
+  callback = ToolMetricsCallback()
+  before = _sample("komodor_agent_tool_duration_seconds_count", tool="search_services", status="success")
+  failed = _sample("komodor_agent_tool_duration_seconds_count", tool="search_services", status="exception")
+
+  ok, boom = uuid4(), uuid4()
+  await callback.on_tool_start({"name": "search_services"}, "{}", run_id=ok)
+  await callback.on_tool_start({"name": "search_services"}, "{}", run_id=boom)
+  await callback.on_tool_end(ToolMessage(content="x" * 400, tool_call_id="1"), run_id=ok)
+  await callback.on_tool_error(RuntimeError("boom"), run_id=boom)
+
+  assert _sample("komodor_agent_tool_duration_seconds_count", tool="search_services", status="success") == before + 1
+  assert _sample("komodor_agent_tool_duration_seconds_count", tool="search_services", status="exception") == failed + 1
+  assert _sample("komodor_agent_tool_result_tokens_sum", tool="search_services", status="success") >= 100
@@ -0,0 +1,237 @@
+# Copyright CNOE Contributors (https://cnoe.io)
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from mcp_komodor.api.pagination import PaginationError, fetch_all_pages, iter_items, iter_pages
+from mcp_komodor.tools.api_v2_health_risks import get_health_risks
+from mcp_komodor.tools.api_v2_services_search import post_api_v2_services_search
+
+ITEMS = [{"name": f"item-{i}"} for i in range(23)]
+
+
+def offset_pages(request: httpx.Request) -> httpx.Response:
+    """Health-risks style endpoint: offset/pageSize query parameters, reports the total."""
+    offset, size = int(request.url.params["offset"]), int(request.url.params["pageSize"])
+    return httpx.Response(200, json={"violations": ITEMS[offset:offset + size], "total": len(ITEMS)})
+
+
+def body_pages(request: httpx.Request) -> httpx.Response:
+    """Search style endpoint: pagination in the body, no total."""
+    pagination = json.loads(request.content)["pagination"]
+    start = (pagination["page"] - 1) * pagination["pageSize"]
+    return httpx.Response(200, json={"data": {"services": ITEMS[start:start + pagination["pageSize"]]}, "meta": {}})
+
+
+@pytest.mark.asyncio
+async def test_offset_pagination_uses_reported_total(transport):
+    transport.responses["/api/v2/health/risks"] = offset_pages
+
+    response = await get_health_risks(param_pageSize=5, param_offset=0, max_items=100)
+
+    assert response["violations"] == ITEMS
+    assert response["autoPagination"] == {"pagesFetched": 5, "items": 23, "total": 23, "truncated": False}
+    assert sorted(int(r.url.params["offset"]) for r in transport.requests) == [0, 5, 10, 15, 20]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("max_items", [13, 100])
+async def test_offset_pagination_counts_the_total_from_the_starting_offset(transport, max_items):
+    transport.responses["/api/v2/health/risks"] = offset_pages
+
+    response = await get_health_risks(param_pageSize=5, param_offset=10, max_items=max_items)
+
+    assert response["violations"] == ITEMS[10:]
+    assert response["autoPagination"] == {"pagesFetched": 3, "items": 13, "total": 23, "truncated": False}
+    assert sorted(int(r.url.params["offset"]) for r in transport.requests) == [10, 15, 20]
+
+
+@pytest.mark.asyncio
+async def test_body_pagination_probes_until_short_page(transport):
+    transport.responses["/api/v2/services/search"] = body_pages
+
+    response = await post_api_v2_services_search(body_kind=["Deployment"], body_pagination_pageSize=10, max_items=100)
+
+    assert response["data"]["services"] == ITEMS
+    assert response["meta"] == {}
+    assert response["autoPagination"]["truncated"] is False
+    bodies = [json.loads(r.content) for r in transport.requests]
+    assert all(body["kind"] == ["Deployment"] for body in bodies)
+    assert sorted(body["pagination"]["page"] for body in bodies)[:3] == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_pagination_stops_at_max_items(transport):
+    transport.responses["/api/v2/services/search"] = body_pages
+
+    success, response = await fetch_all_pages(
+        "/api/v2/services/search",
+        max_items=12,
+        method="POST",
+        page_size=5,
+    )
+
+    assert success
+    assert response["data"]["services"] == ITEMS[:12]
+    assert response["autoPagination"]["truncated"] is True
+    assert len(transport.requests) == 3
+
+
+@pytest.mark.asyncio
+async def test_pages_fetched_counts_only_merged_pages(transport):
+    transport.responses["/api/v2/services/search"] = body_pages
+
+    success, response = await fetch_all_pages("/api/v2/services/search", max_items=100, method="POST", page_size=4)
+
+    # Pages 0-5 hold the items; the rest of the last probing window comes back empty
+    assert success
+    assert response["data"]["services"] == ITEMS
+    assert response["autoPagination"]["pagesFetched"] == 6
+    assert len(transport.requests) == 9
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("max_items", [0, -1])
+async def test_max_items_must_be_positive(transport, max_items):
+    with pytest.raises(ValueError):
+        await fetch_all_pages("/api/v2/services/search", max_items=max_items, method="POST")
+
+    assert transport.requests == []
+
+
+@pytest.mark.asyncio
+async def test_tools_report_a_non_positive_max_items_as_an_error(transport):
+    response = await get_health_risks(param_pageSize=5, param_offset=0, max_items=-1)
+
+    assert response == {"error": "max_items must be positive, got -1"}
+    assert transport.requests == []
+
+
+@pytest.mark.asyncio
+async def test_failed_page_returns_partial_result_with_error(transport):
+    def failing_third_page(request):
+        if request.url.params["offset"] == "10":
+            return httpx.Response(400, json={"message": "bad offset"})
+        return offset_pages(request)
+
+    transport.responses["/api/v2/health/risks"] = failing_third_page
+
+    response = await get_health_risks(param_pageSize=5, param_offset=0, max_items=100)
+
+    assert response["violations"] == ITEMS[:10]
+    assert response["autoPagination"]["errors"] == ["page 2: API request failed: 400 - bad offset"]
+    assert response["autoPagination"]["truncated"] is True
+
+
+def cursor_pages(request: httpx.Request) -> httpx.Response:
+    """Cost-allocation style endpoint: pageToken cursor, next cursor in the response."""
+    start, size = int(request.url.params.get("pageToken", 0)), int(request.url.params["pageSize"])
+    body = {"rows": ITEMS[start:start + size]}
+    if start + size < len(ITEMS):
+        body["nextPageToken"] = str(start + size)
+    return httpx.Response(200, json=body)
+
+
+@pytest.mark.asyncio
+async def test_iter_items_yields_every_record_in_order(transport):
+    transport.responses["/api/v2/health/risks"] = offset_pages
+
+    records = [item async for item in iter_items("/api/v2/health/risks", page_size=5, prefetch=2)]
+
+    assert records == ITEMS
+    assert sorted(int(r.url.params["offset"]) for r in transport.requests) == [0, 5, 10, 15, 20]
+
+
+@pytest.mark.asyncio
+async def test_iter_items_stops_at_the_total_from_the_starting_offset(transport):
+    transport.responses["/api/v2/health/risks"] = offset_pages
+
+    records = [item async for item in iter_items("/api/v2/health/risks", params={"offset": 10}, page_size=5, prefetch=4)]
+
+    assert records == ITEMS[10:]
+    assert sorted(int(r.url.params["offset"]) for r in transport.requests) == [10, 15, 20]
+
+
+@pytest.mark.asyncio
+async def test_iter_pages_prefetches_while_consumer_works(transport):
+    in_flight, overlaps = [0], []
+
+    async def slow_page(request):
+        in_flight[0] += 1
+        await asyncio.sleep(0.01)
+        in_flight[0] -= 1
+        return body_pages(request)
+
+    transport.responses["/api/v2/services/search"] = slow_page
+
+    pages = []
+    async for items in iter_pages("/api/v2/services/search", method="POST", page_size=5, prefetch=2):
+        await asyncio.sleep(0.005)
+        overlaps.append(in_flight[0])
+        pages.append(items)
+
+    assert [item for page in pages for item in page] == ITEMS
+    # Every page but the last was handed over with the next one already in flight
+    assert all(count >= 1 for count in overlaps[:-1])
+
+
+@pytest.mark.asyncio
+async def test_iter_pages_cancels_prefetch_on_early_exit(transport):
+    started, cancelled = [], []
+
+    async def hanging_page(request):
+        page = json.loads(request.content)["pagination"]["page"]
+        started.append(page)
+        if page > 1:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(page)
+                raise
+        return body_pages(request)
+
+    transport.responses["/api/v2/services/search"] = hanging_page
+
+    pages = iter_pages("/api/v2/services/search", method="POST", page_size=5, prefetch=3)
+    first = await pages.__anext__()
+    await asyncio.sleep(0.01)
+    await pages.aclose()
+    await asyncio.sleep(0.01)
+
+    assert first == ITEMS[:5]
+    assert sorted(started) == [1, 2, 3, 4]
+    assert sorted(cancelled) == [2, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_iter_items_follows_cursor(transport):
+    transport.responses["/api/v2/cost/allocation"] = cursor_pages
+
+    records = [item async for item in iter_items("/api/v2/cost/allocation", params={"groupBy": "cluster"}, page_size=10)]
+
+    assert records == ITEMS
+    assert [r.url.params.get("pageToken") for r in transport.requests] == [None, "10", "20"]
+    assert all(r.url.params["groupBy"] == "cluster" for r in transport.requests)
+
+
+@pytest.mark.asyncio
+async def test_iter_pages_raises_on_failed_page(transport):
+    def failing_second_page(request):
+        if request.url.params["offset"] == "5":
+            return httpx.Response(400, json={"message": "bad offset"})
+        return offset_pages(request)
+
+    transport.responses["/api/v2/health/risks"] = failing_second_page
+
+    records = []
+    with pytest.raises(PaginationError) as excinfo:
+        async for item in iter_items("/api/v2/health/risks", page_size=5):
+            records.append(item)
+
+    assert records == ITEMS[:5]
+    assert excinfo.value.page == 1
+    assert excinfo.value.error["error"] == "API request failed: 400 - bad offset"
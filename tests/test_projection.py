@@ -0,0 +1,131 @@
+# Copyright CNOE Contributors (https://cnoe.io)
+# SPDX-License-Identifier: Apache-2.0
+
+import httpx
+import pytest
+
+from mcp_komodor.api.projection import estimate_tokens, project, project_response, summarize, to_table
+from mcp_komodor.tools.api_v2_health_risks import get_health_risks
+from mcp_komodor.tools.api_v2_service_yaml import get_api_v2_service_yaml
+from mcp_komodor.tools.api_v2_services_k8s_events_search import post_api_v2_services_k8s_events_search
+
+EVENTS = {
+  "data": {
+    "events": [
+      {
+        "reason": "BackOff",
+        "message": f"Back-off restarting failed container {i}",
+        "lastTimestamp": f"2024-05-01T10:{i:02d}:00Z",
+        "involvedObject": {"kind": "Pod", "name": f"api-{i}", "resourceVersion": "123", "fieldPath": "spec"},
+        "annotations": {"note": "x" * 80},
+        "source": {"component": "kubelet", "host": "node-1"},
+      }
+      for i in range(40)
+    ]
+  },
+  "meta": {"total": 40},
+}
+
+
+def test_project_response_applies_fields_to_items():
+  projected = project_response(EVENTS, ["reason", "involvedObject.name"])
+
+  assert projected["meta"] == {"total": 40}
+  assert projected["data"]["events"][0] == {"reason": "BackOff", "involvedObject": {"name": "api-0"}}
+
+
+@pytest.mark.parametrize("fields", [["containers.name", "containers.image"], ["containers.image", "containers.name"]])
+def test_project_keeps_list_items_missing_a_later_field(fields):
+  pod = {"containers": [{"name": "a", "image": "i1", "ports": [80]}, {"name": "b"}]}
+
+  assert project(pod, fields) == {"containers": [{"name": "a", "image": "i1"}, {"name": "b"}]}
+
+
+def test_project_keeps_list_items_that_have_none_of_the_fields_as_empty_records():
+  pod = {"containers": [{"name": "a", "image": "i1"}, {"name": "b"}, {"name": "c", "image": "i3"}]}
+
+  assert project(pod, ["containers.image"]) == {"containers": [{"image": "i1"}, {}, {"image": "i3"}]}
+
+
+def test_summarize_keeps_high_signal_fields_and_reports_elisions():
+  summary = summarize(EVENTS, 1200)
+
+  assert estimate_tokens(summary) <= 1200
+  assert summary == summarize(EVENTS, 1200)
+  first = summary["data"]["events"][0]
+  assert first == {
+    "reason": "BackOff",
+    "message": "Back-off restarting failed container 0",
+    "lastTimestamp": "2024-05-01T10:00:00Z",
+    "involvedObject": {"kind": "Pod", "name": "api-0"},
+  }
+  elided = summary["elided"]
+  assert "annotations" in elided["droppedFields"]
+  assert "involvedObject.fieldPath" in elided["droppedFields"]
+  assert elided["droppedItems"] == 40 - len(summary["data"]["events"])
+  assert elided["originalTokens"] == estimate_tokens(EVENTS)
+
+
+def test_summarize_leaves_small_responses_alone():
+  assert summarize({"status": "ok"}, 100) == {"status": "ok"}
+
+
+@pytest.mark.asyncio
+async def test_long_yaml_is_cut_in_the_middle(transport):
+  manifest = "apiVersion: apps/v1\n" + "".join(f"  label{i}: value\n" for i in range(2000)) + "status:\n  readyReplicas: 0\n"
+  transport.responses["/api/v2/service/yaml"] = lambda request: httpx.Response(200, json={"yaml": manifest})
+
+  response = await get_api_v2_service_yaml("prod", "default", "Deployment", "api", max_tokens=500)
+
+  assert estimate_tokens(response) <= 500
+  assert response["yaml"].startswith("apiVersion: apps/v1")
+  assert response["yaml"].endswith("readyReplicas: 0\n")
+  assert "characters elided" in response["yaml"]
+  assert response["elided"]["truncatedStrings"] == ["yaml"]
+
+
+@pytest.mark.asyncio
+async def test_events_search_projects_fields(transport):
+  transport.responses["/api/v2/services/k8s-events/search"] = lambda request: httpx.Response(200, json=EVENTS)
+
+  response = await post_api_v2_services_k8s_events_search("{}", fields=["reason", "lastTimestamp"])
+
+  assert response["data"]["events"][1] == {"reason": "BackOff", "lastTimestamp": "2024-05-01T10:01:00Z"}
+  assert "elided" not in response
+
+
+def test_to_table_flattens_and_escapes():
+  table = to_table([
+    {"name": "api", "replicas": {"ready": 2}, "labels": ["a", "b"]},
+    {"name": "worker\tq", "message": "line 1\nline 2", "replicas": {"ready": None}},
+  ])
+
+  assert table.split("\n") == [
+    "name\treplicas.ready\tlabels\tmessage",
+    'api\t2\t["a","b"]\t',
+    "worker\\tq\t\t\tline 1\\nline 2",
+  ]
+
+
+@pytest.mark.asyncio
+async def test_table_output_keeps_metadata_and_saves_tokens(transport):
+  risks = {"violations": [{"id": f"r-{i}", "severity": "high", "status": "open"} for i in range(50)], "total": 50}
+  transport.responses["/api/v2/health/risks"] = lambda request: httpx.Response(200, json=risks)
+
+  response = await get_health_risks(param_pageSize=50, param_offset=0, output_format="table")
+
+  rows = response["violations"].split("\n")
+  assert rows[0] == "id\tseverity\tstatus"
+  assert rows[1] == "r-0\thigh\topen"
+  assert len(rows) == 51
+  assert response["total"] == 50
+  assert estimate_tokens(response) * 2 < estimate_tokens(risks)
+
+
+@pytest.mark.asyncio
+async def test_unknown_output_format_is_an_error(transport):
+  transport.responses["/api/v2/health/risks"] = lambda request: httpx.Response(200, json={"violations": []})
+
+  response = await get_health_risks(param_pageSize=50, param_offset=0, output_format="xml")
+
+  assert response == {"error": "Unknown output_format 'xml', expected one of json, table"}
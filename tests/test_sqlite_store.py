@@ -0,0 +1,150 @@
+# Copyright CNOE Contributors (https://cnoe.io)
+# SPDX-License-Identifier: Apache-2.0
+
+import pytest
+from a2a.server.tasks import InMemoryTaskStore
+from a2a.types import Artifact, Part, Task, TaskState, TaskStatus, TextPart
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langgraph.graph import END, START, MessagesState, StateGraph
+
+from agent_komodor import checkpoint, sqlite_store
+from agent_komodor.sqlite_store import SqliteSaver, SqliteTaskStore
+
+TOOL_OUTPUT = "kind: Deployment\n" * 1000
+
+
+def _graph(saver, calls=None, fail_reply=None):
+  """A two-step graph that answers every message with a large tool result and a reply."""
+
+  def tool(state):
+    if calls is not None:
+      calls.append("tool")
+    return {"messages": [ToolMessage(content=TOOL_OUTPUT, tool_call_id="1")]}
+
+  def reply(state):
+    if fail_reply:
+      fail_reply.pop()
+      raise RuntimeError("model unavailable")
+    return {"messages": [AIMessage(content="done")]}
+
+  builder = StateGraph(MessagesState)
+  builder.add_node("tool", tool)
+  builder.add_node("reply", reply)
+  builder.add_edge(START, "tool")
+  builder.add_edge("tool", "reply")
+  builder.add_edge("reply", END)
+  return builder.compile(checkpointer=saver)
+
+
+def _contents(graph, config):
+  return [m.content for m in graph.get_state(config).values["messages"] if not isinstance(m, ToolMessage)]
+
+
+def test_replicas_sharing_the_database_continue_the_same_conversation(tmp_path):
+  path = str(tmp_path / "agent.db")
+  config = {"configurable": {"thread_id": "ctx-1"}}
+
+  _graph(SqliteSaver(path)).invoke({"messages": [HumanMessage(content="first")]}, config)
+  other_replica = _graph(SqliteSaver(path))
+  other_replica.invoke({"messages": [HumanMessage(content="second")]}, config)
+
+  assert _contents(other_replica, config) == ["first", "done", "second", "done"]
+  history = list(other_replica.get_state_history(config))
+  assert len(history) == len({s.config["configurable"]["checkpoint_id"] for s in history}) > 4
+  assert SqliteSaver(path).db.query("PRAGMA journal_mode") == [("wal",)]
+
+
+def test_large_values_are_compressed_and_stored_once_per_version(tmp_path):
+  saver = SqliteSaver(str(tmp_path / "agent.db"))
+  config = {"configurable": {"thread_id": "ctx-1"}}
+  graph = _graph(saver)
+  graph.invoke({"messages": [HumanMessage(content="hi")]}, config)
+
+  rows = saver.db.query("SELECT type, LENGTH(blob) FROM checkpoint_blobs WHERE channel = 'messages'")
+  checkpoints = saver.stats()["checkpoints"]
+
+  assert len(rows) < checkpoints
+  compressed = [size for type_, size in rows if type_.endswith("+zlib")]
+  assert compressed and max(compressed) < len(TOOL_OUTPUT) / 10
+
+
+@pytest.mark.asyncio
+async def test_failed_runs_resume_from_pending_writes(tmp_path):
+  path = str(tmp_path / "agent.db")
+  config = {"configurable": {"thread_id": "ctx-1"}}
+  calls = []
+
+  with pytest.raises(RuntimeError):
+    await _graph(SqliteSaver(path), calls, fail_reply=[True]).ainvoke({"messages": [HumanMessage(content="hi")]}, config)
+  resumed = _graph(SqliteSaver(path), calls)
+  await resumed.ainvoke(None, config)
+
+  assert calls == ["tool"]
+  assert _contents(resumed, config) == ["hi", "done"]
+
+
+def test_old_checkpoints_are_pruned_without_losing_the_conversation(tmp_path):
+  saver = SqliteSaver(str(tmp_path / "agent.db"), max_checkpoints=3)
+  graph = _graph(saver)
+  config = {"configurable": {"thread_id": "ctx-1"}}
+
+  for i in range(4):
+    graph.invoke({"messages": [HumanMessage(content=f"turn {i}")]}, config)
+
+  assert saver.stats()["checkpoints"] == 3
+  assert saver.pruned_checkpoints > 0
+  assert [c for c in _contents(graph, config) if c != "done"] == [f"turn {i}" for i in range(4)]
+  kept = {checkpoint_id for checkpoint_id, in saver.db.query("SELECT checkpoint_id FROM checkpoints")}
+  assert {checkpoint_id for checkpoint_id, in saver.db.query("SELECT checkpoint_id FROM checkpoint_writes")} <= kept
+  referenced = {
+    (channel, str(version))
+    for saved in saver.list(config)
+    for channel, version in saved.checkpoint["channel_versions"].items()
+  }
+  assert set(saver.db.query("SELECT channel, version FROM checkpoint_blobs")) == referenced
+
+
+def test_delete_thread_removes_the_conversation(tmp_path):
+  saver = SqliteSaver(str(tmp_path / "agent.db"))
+  graph = _graph(saver)
+  for thread_id in ("keep", "drop"):
+    graph.invoke({"messages": [HumanMessage(content="hi")]}, {"configurable": {"thread_id": thread_id}})
+
+  saver.delete_thread("drop")
+
+  assert saver.get_tuple({"configurable": {"thread_id": "drop"}}) is None
+  assert saver.stats()["threads"] == 1
+  assert saver.db.query("SELECT DISTINCT thread_id FROM checkpoint_blobs") == [("keep",)]
+
+
+@pytest.mark.asyncio
+async def test_task_store_is_shared_through_the_database(tmp_path):
+  path = str(tmp_path / "tasks.db")
+  task = Task(
+    id="task-1",
+    contextId="ctx-1",
+    status=TaskStatus(state=TaskState.completed),
+    artifacts=[Artifact(artifactId="a", parts=[Part(root=TextPart(text=TOOL_OUTPUT))])],
+  )
+
+  await SqliteTaskStore(path).save(task)
+  other_replica = SqliteTaskStore(path)
+
+  assert await other_replica.get("task-1") == task
+  assert other_replica.db.query("SELECT compressed FROM a2a_tasks") == [(1,)]
+  await other_replica.delete("task-1")
+  assert await SqliteTaskStore(path).get("task-1") is None
+
+
+def test_store_is_selected_from_the_environment(tmp_path, monkeypatch):
+  assert isinstance(sqlite_store.task_store_from_env(), InMemoryTaskStore)
+
+  monkeypatch.setattr(sqlite_store, "AGENT_STORE", "sqlite")
+  monkeypatch.setattr(sqlite_store, "SQLITE_PATH", str(tmp_path / "data" / "agent.db"))
+
+  monkeypatch.setenv("KOMODOR_AGENT_MEMORY_MAX_CHECKPOINTS", "5")
+
+  saver = checkpoint.checkpointer_from_env()
+  assert isinstance(saver, SqliteSaver) and saver.max_checkpoints == 5
+  assert isinstance(sqlite_store.task_store_from_env(), SqliteTaskStore)
+  assert (tmp_path / "data" / "agent.db").exists()
@@ -0,0 +1,148 @@
+# Copyright CNOE Contributors (https://cnoe.io)
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+from typing import List
+
+import pytest
+from a2a.server.request_handlers import DefaultRequestHandler
+from a2a.server.tasks import InMemoryTaskStore
+from a2a.types import Message, MessageSendParams, Part, Role, TaskArtifactUpdateEvent, TaskState, TaskStatusUpdateEvent, TextPart
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.tools import tool
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.prebuilt import create_react_agent
+
+from agent_komodor.protocol_bindings.a2a_server import agent as a2a_agent
+from agent_komodor.protocol_bindings.a2a_server.admission import AdmissionController
+from agent_komodor.protocol_bindings.a2a_server.agent import KomodorAgent, ResponseFormat
+from agent_komodor.protocol_bindings.a2a_server.agent_executor import KomodorAgentExecutor
+
+ANSWER = "You have two clusters: prod and staging."
+
+
+class ScriptedModel(BaseChatModel):
+  """Replies with the given messages in turn, streaming their content word by word."""
+
+  replies: List[AIMessage]
+
+  @property
+  def _llm_type(self) -> str:
+    return "scripted"
+
+  def bind_tools(self, tools, **kwargs):
+    return self
+
+  def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+    return ChatResult(generations=[ChatGeneration(message=self.replies.pop(0))])
+
+  def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+    reply = self.replies.pop(0)
+    for i, word in enumerate(reply.content.split()):
+      chunk = ChatGenerationChunk(message=AIMessageChunk(content=word if i == 0 else f" {word}"))
+      if run_manager:
+        run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+      yield chunk
+    if reply.tool_calls:
+      tool_call_chunks = [
+        {"name": c["name"], "args": json.dumps(c["args"]), "id": c["id"], "index": i} for i, c in enumerate(reply.tool_calls)
+      ]
+      yield ChatGenerationChunk(message=AIMessageChunk(content="", tool_call_chunks=tool_call_chunks))
+
+
+@tool
+def get_api_v2_clusters() -> str:
+  """List clusters."""
+  return "prod, staging"
+
+
+def _agent():
+  model = ScriptedModel(
+    replies=[
+      AIMessage(content="Let me check", tool_calls=[{"name": "get_api_v2_clusters", "args": {}, "id": "call-1"}]),
+      AIMessage(content=ANSWER),
+      AIMessage(
+        content="",
+        tool_calls=[{"name": "ResponseFormat", "args": {"status": "completed", "message": ANSWER}, "id": "call-2"}],
+      ),
+    ]
+  )
+  agent = KomodorAgent.__new__(KomodorAgent)
+  agent.graph = create_react_agent(
+    model, [get_api_v2_clusters], checkpointer=InMemorySaver(), response_format=("Respond", ResponseFormat)
+  )
+  return agent
+
+
+async def _events(agent):
+  return [event async for event in agent.stream("list clusters", "ctx-1")]
+
+
+def _answer_text(events):
+  """Rebuild the answer the way an A2A client applies the chunks."""
+  text = ""
+  for event in events:
+    if event.get("is_answer_chunk"):
+      text = text + event["content"] if event["append"] else event["content"]
+  return text
+
+
+@pytest.mark.asyncio
+async def test_answer_tokens_are_streamed_as_they_are_generated(monkeypatch):
+  monkeypatch.setattr(a2a_agent, "STREAM_FLUSH_INTERVAL", 0)
+
+  events = await _events(_agent())
+
+  chunks = [e for e in events if e.get("is_answer_chunk")]
+  assert [c["append"] for c in chunks] == [False, True, True, False] + [True] * 6
+  assert _answer_text(events) == ANSWER
+  assert [e["content"] for e in events if not e.get("is_answer_chunk")][:-1] == [
+    "Calling get_api_v2_clusters...",
+    "Processing results from get_api_v2_clusters...",
+  ]
+  assert events[-1] == {"is_task_complete": True, "require_user_input": False, "content": ANSWER}
+
+
+@pytest.mark.asyncio
+async def test_tokens_are_collected_between_flushes(monkeypatch):
+  monkeypatch.setattr(a2a_agent, "STREAM_FLUSH_INTERVAL", 60)
+
+  events = await _events(_agent())
+
+  # The first token goes out at once and the rest when the model call ends
+  assert [e["content"] for e in events if e.get("is_answer_chunk")] == ["Let", " me check", "You", ANSWER[3:]]
+  assert _answer_text(events) == ANSWER
+
+
+@pytest.mark.asyncio
+async def test_token_streaming_can_be_turned_off(monkeypatch):
+  monkeypatch.setattr(a2a_agent, "STREAM_TOKENS", False)
+
+  events = await _events(_agent())
+
+  assert not any(e.get("is_answer_chunk") for e in events)
+  assert events[-1]["content"] == ANSWER
+
+
+@pytest.mark.asyncio
+async def test_executor_streams_the_answer_into_one_artifact():
+  executor = KomodorAgentExecutor.__new__(KomodorAgentExecutor)
+  executor.agent = _agent()
+  executor.admission = AdmissionController()
+  executor._running, executor._cancel_requested = {}, set()
+  handler = DefaultRequestHandler(agent_executor=executor, task_store=InMemoryTaskStore())
+  message = Message(role=Role.user, parts=[Part(root=TextPart(text="list clusters"))], messageId="m-1", contextId="ctx-1")
+
+  events = [e async for e in handler.on_message_send_stream(MessageSendParams(message=message))]
+
+  artifacts = [e for e in events if isinstance(e, TaskArtifactUpdateEvent)]
+  assert len({e.artifact.artifactId for e in artifacts}) == 1
+  assert artifacts[0].append is False and any(e.append for e in artifacts)
+  assert [e.lastChunk for e in artifacts].count(True) == 1 and artifacts[-1].lastChunk
+  statuses = [e.status.state for e in events if isinstance(e, TaskStatusUpdateEvent)]
+  assert statuses[-1] == TaskState.completed
+
+  task = await handler.task_store.get(events[0].id)
+  assert [[p.root.text for p in a.parts] for a in task.artifacts] == [[ANSWER]]
@@ -0,0 +1,60 @@
+# Copyright CNOE Contributors (https://cnoe.io)
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import sys
+
+import pytest
+from mcp.server.fastmcp import FastMCP
+from mcp.types import ListToolsRequest
+
+from mcp_komodor import registry
+
+
+def test_manifest_is_up_to_date():
+  assert registry.load_manifest() == registry.build_manifest(), "run `python -m mcp_komodor.registry`"
+
+
+def test_stale_manifest_is_rebuilt_and_cached(tmp_path):
+  path = tmp_path / "tool_manifest.json"
+  path.write_text(json.dumps({"version": registry.MANIFEST_VERSION, "source_hash": "stale", "tools": []}))
+
+  assert registry.load_manifest(path) is None
+  manifest = registry.load_or_build_manifest(path)
+
+  assert len(manifest["tools"]) == len(registry.TOOLS)
+  assert registry.load_manifest(path) == manifest
+
+
+async def _list_tools(mcp: FastMCP):
+  """Answer tools/list through the server's request handler, as a client would see it."""
+  result = await mcp._mcp_server.request_handlers[ListToolsRequest](ListToolsRequest(method="tools/list"))
+  return [t.model_dump() for t in result.root.tools]
+
+
+@pytest.mark.asyncio
+async def test_lazy_registration_lists_the_same_tools_as_eager():
+  lazy, eager = FastMCP("lazy"), FastMCP("eager")
+  registry.register_tools(lazy)
+  registry.register_tools(eager, lazy=False)
+
+  lazy_tools = await _list_tools(lazy)
+  eager_tools = await _list_tools(eager)
+
+  assert len(lazy_tools) == len(registry.TOOLS)
+  assert lazy_tools == eager_tools
+
+
+@pytest.mark.asyncio
+async def test_tool_module_is_imported_on_first_call(transport, monkeypatch):
+  module = f"{registry.TOOLS_PACKAGE}.api_v2_clusters"
+  monkeypatch.delitem(sys.modules, module, raising=False)
+
+  mcp = FastMCP("lazy")
+  registry.register_tools(mcp)
+  assert module not in sys.modules
+
+  await mcp.call_tool("get_api_v2_clusters", {})
+
+  assert module in sys.modules
+  assert [r.url.path for r in transport.requests] == ["/api/v2/clusters"]
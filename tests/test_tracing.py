@@ -0,0 +1,72 @@
+# Copyright CNOE Contributors (https://cnoe.io)
+# SPDX-License-Identifier: Apache-2.0
+
+import httpx
+import pytest
+from mcp.server.fastmcp import FastMCP
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from agent_komodor import tracing as agent_tracing
+from agent_komodor.mcp_pool import call_tool_with_meta
+from mcp_komodor import registry
+
+pytest.importorskip("opentelemetry.sdk")
+
+from opentelemetry import trace  # noqa: E402
+from opentelemetry.sdk.trace import TracerProvider  # noqa: E402
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor  # noqa: E402
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter  # noqa: E402
+from opentelemetry.trace import SpanKind  # noqa: E402
+
+_exporter = InMemorySpanExporter()
+
+
+@pytest.fixture
+def spans():
+  """Collect finished spans in memory; the global tracer provider can only be set once per process."""
+  if not isinstance(trace.get_tracer_provider(), TracerProvider):
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(_exporter))
+    trace.set_tracer_provider(provider)
+  _exporter.clear()
+  yield _exporter
+  _exporter.clear()
+
+
+@pytest.mark.asyncio
+async def test_trace_continues_from_agent_through_mcp_to_the_api(transport, spans):
+  mcp = FastMCP("tracing")
+  registry.register_tools(mcp)
+
+  async with create_connected_server_and_client_session(mcp._mcp_server) as session:
+    with agent_tracing.start_span("agent.stream"):
+      with agent_tracing.tool_call_span("get_api_v2_clusters") as meta:
+        assert "traceparent" in meta
+        result = await call_tool_with_meta(session, "get_api_v2_clusters", {}, meta)
+
+  assert not result.isError
+  by_kind_and_name = {(s.kind, s.name): s for s in spans.get_finished_spans()}
+  root = by_kind_and_name[SpanKind.INTERNAL, "agent.stream"]
+  client = by_kind_and_name[SpanKind.CLIENT, "tools/call get_api_v2_clusters"]
+  server = by_kind_and_name[SpanKind.SERVER, "tools/call get_api_v2_clusters"]
+  api = by_kind_and_name[SpanKind.CLIENT, "GET /api/v2/clusters"]
+
+  assert {s.context.trace_id for s in (root, client, server, api)} == {root.context.trace_id}
+  assert client.parent.span_id == root.context.span_id
+  assert server.parent.span_id == client.context.span_id
+  assert api.parent.span_id == server.context.span_id
+  assert api.attributes["http.response.status_code"] == 200
+  assert transport.requests[0].headers["traceparent"].split("-")[1] == format(root.context.trace_id, "032x")
+
+
+@pytest.mark.asyncio
+async def test_error_results_mark_the_spans_failed(transport, spans):
+  transport.responses["/api/v2/clusters"] = lambda request: httpx.Response(404, json={"message": "not found"})
+  mcp = FastMCP("tracing")
+  registry.register_tools(mcp)
+
+  await mcp.call_tool("get_api_v2_clusters", {})
+
+  finished = spans.get_finished_spans()
+  assert [s.name for s in finished] == ["GET /api/v2/clusters", "tools/call get_api_v2_clusters"]
+  assert all(s.status.status_code == trace.StatusCode.ERROR for s in finished)